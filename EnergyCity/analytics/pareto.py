@@ -0,0 +1,130 @@
+# analytics/pareto.py
+
+import numpy as np
+
+
+# Цілі: мінімізувати енергію, максимізувати бюджет.
+# Усі функції працюють сортуванням – O(n log n) замість O(n²).
+
+
+def pareto_frontier(energies, budgets):
+    """
+    Indices of the non-dominated points, ordered by increasing energy.
+    A point is dominated if another one has energy <= and budget >=
+    with at least one strict inequality; identical points are kept
+    together.
+    """
+    energies = np.asarray(energies, dtype=float)
+    budgets = np.asarray(budgets, dtype=float)
+
+    if energies.size == 0:
+        return np.empty(0, dtype=int)
+
+    # Енергія за зростанням, за рівної енергії – бюджет за спаданням
+    order = np.lexsort((-budgets, energies))
+
+    e = energies[order]
+    b = budgets[order]
+
+    # Найбільший бюджет серед усіх попередніх точок
+    prev_max = np.empty_like(b)
+    prev_max[0] = -np.inf
+    np.maximum.accumulate(b[:-1], out=prev_max[1:])
+
+    keep = b > prev_max
+
+    # Однакові точки поділяють рішення першої з групи
+    new_group = np.ones(e.size, dtype=bool)
+    new_group[1:] = (e[1:] != e[:-1]) | (b[1:] != b[:-1])
+
+    first = np.flatnonzero(new_group)
+    group = np.cumsum(new_group) - 1
+
+    keep = keep[first][group]
+
+    return order[keep]
+
+
+def dominance_fraction(energies_a, budgets_a, energies_b, budgets_b):
+    """
+    Fraction of points in A for which some point in B has
+    energy <= and budget >= (the dashboard's dominance check).
+    Sorts B by energy and uses a prefix max of its budgets.
+    """
+    energies_a = np.asarray(energies_a, dtype=float)
+    budgets_a = np.asarray(budgets_a, dtype=float)
+
+    if energies_a.size == 0:
+        return 0.0
+
+    return float(np.mean(
+        dominated_mask(energies_a, budgets_a, energies_b, budgets_b)
+    ))
+
+
+def dominated_mask(energies_a, budgets_a, energies_b, budgets_b):
+    """
+    Boolean mask over A: True where some point of B weakly dominates it.
+    """
+    energies_a = np.asarray(energies_a, dtype=float)
+    budgets_a = np.asarray(budgets_a, dtype=float)
+    energies_b = np.asarray(energies_b, dtype=float)
+    budgets_b = np.asarray(budgets_b, dtype=float)
+
+    if energies_b.size == 0:
+        return np.zeros(energies_a.size, dtype=bool)
+
+    order = np.argsort(energies_b, kind="stable")
+
+    sorted_energy = energies_b[order]
+    best_budget = np.maximum.accumulate(budgets_b[order])
+
+    # Кількість точок B з енергією <= енергії точки A
+    count = np.searchsorted(sorted_energy, energies_a, side="right")
+
+    mask = np.zeros(energies_a.size, dtype=bool)
+    has = count > 0
+
+    mask[has] = best_budget[count[has] - 1] >= budgets_a[has]
+
+    return mask
+
+
+def strategy_frontiers(results):
+    """
+    results – {name: (energies, budgets)}.
+
+    Returns (per_strategy, combined): per_strategy maps each name to the
+    (energies, budgets) of its own frontier; combined is
+    (energies, budgets, names) of the joint frontier, labelled with the
+    strategy each point came from.
+    """
+    per_strategy = {}
+
+    names = []
+    all_energies = []
+    all_budgets = []
+
+    for name, (energies, budgets) in results.items():
+
+        energies = np.asarray(energies, dtype=float)
+        budgets = np.asarray(budgets, dtype=float)
+
+        idx = pareto_frontier(energies, budgets)
+        per_strategy[name] = (energies[idx], budgets[idx])
+
+        # Точка загального фронту завжди лежить на фронті своєї стратегії
+        all_energies.append(energies[idx])
+        all_budgets.append(budgets[idx])
+        names.extend([name] * len(idx))
+
+    if not names:
+        return per_strategy, (np.empty(0), np.empty(0), np.empty(0, dtype=object))
+
+    all_energies = np.concatenate(all_energies)
+    all_budgets = np.concatenate(all_budgets)
+    names = np.array(names, dtype=object)
+
+    idx = pareto_frontier(all_energies, all_budgets)
+
+    return per_strategy, (all_energies[idx], all_budgets[idx], names[idx])
\ No newline at end of file
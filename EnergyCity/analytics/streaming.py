@@ -0,0 +1,277 @@
+# analytics/streaming.py
+
+import numpy as np
+
+
+# Потокові акумулятори: оновлюються батчами, займають сталу пам'ять
+# і зливаються (merge) між паралельними шардами.
+
+
+class RunningStats:
+    """
+    Welford / Chan mean and variance with min and max.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def update(self, values):
+
+        values = np.asarray(values, dtype=float).ravel()
+
+        if values.size == 0:
+            return self
+
+        batch = RunningStats()
+        batch.count = values.size
+        batch.mean = float(np.mean(values))
+        batch.m2 = float(np.sum((values - batch.mean) ** 2))
+        batch.min = float(np.min(values))
+        batch.max = float(np.max(values))
+
+        return self.merge(batch)
+
+    def merge(self, other):
+
+        if other.count == 0:
+            return self
+
+        n = self.count + other.count
+        delta = other.mean - self.mean
+
+        self.mean += delta * other.count / n
+        self.m2 += other.m2 + delta ** 2 * self.count * other.count / n
+        self.count = n
+
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+        return self
+
+    def variance(self, ddof=0):
+        if self.count - ddof <= 0:
+            return np.nan
+        return self.m2 / (self.count - ddof)
+
+    def std(self, ddof=0):
+        return np.sqrt(self.variance(ddof))
+
+    def sem(self):
+        return self.std(ddof=1) / np.sqrt(self.count)
+
+
+class FixedHistogram:
+    """
+    Histogram with fixed equal-width bins on [lo, hi). Values outside
+    the range go to the underflow / overflow counters. Histograms with
+    the same bins can be merged.
+    """
+
+    def __init__(self, lo, hi, bins=600):
+        self.lo = float(lo)
+        self.hi = float(hi)
+        self.bins = bins
+        self.counts = np.zeros(bins, dtype=np.int64)
+        self.underflow = 0
+        self.overflow = 0
+
+    @property
+    def edges(self):
+        return np.linspace(self.lo, self.hi, self.bins + 1)
+
+    def update(self, values):
+
+        values = np.asarray(values, dtype=float).ravel()
+
+        idx = np.floor(
+            (values - self.lo) / (self.hi - self.lo) * self.bins
+        )
+
+        self.underflow += int(np.sum(idx < 0))
+        self.overflow += int(np.sum(idx >= self.bins))
+
+        inside = idx[(idx >= 0) & (idx < self.bins)].astype(np.int64)
+        self.counts += np.bincount(inside, minlength=self.bins)
+
+        return self
+
+    def merge(self, other):
+
+        if (other.lo, other.hi, other.bins) != (self.lo, self.hi, self.bins):
+            raise ValueError("Histograms have different bins")
+
+        self.counts += other.counts
+        self.underflow += other.underflow
+        self.overflow += other.overflow
+
+        return self
+
+    def nonempty(self):
+        """
+        Returns (first, last + 1) bin indices of the occupied range.
+        """
+        occupied = np.flatnonzero(self.counts)
+
+        if occupied.size == 0:
+            return 0, 0
+
+        return int(occupied[0]), int(occupied[-1]) + 1
+
+
+class QuantileSketch:
+    """
+    KLL-style compactor sketch for approximate quantiles. Level i
+    holds at most k items of weight 2**i; a full level is sorted and
+    every other item is promoted to the next level. Memory is about
+    k * log2(n / k) items. Sketches with the same k can be merged.
+    """
+
+    def __init__(self, k=512):
+        self.k = k
+        self.count = 0
+        self.levels = [np.empty(0)]
+        self._offsets = [0]
+
+    def update(self, values):
+
+        values = np.asarray(values, dtype=float).ravel()
+
+        self.count += values.size
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+
+        return self
+
+    def merge(self, other):
+
+        if other.k != self.k:
+            raise ValueError("Sketches have different k")
+
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+            self._offsets.append(0)
+
+        for i, items in enumerate(other.levels):
+            self.levels[i] = np.concatenate([self.levels[i], items])
+
+        self.count += other.count
+        self._compress()
+
+        return self
+
+    def _compress(self):
+
+        level = 0
+
+        while level < len(self.levels):
+
+            items = self.levels[level]
+
+            if items.size > self.k:
+
+                items = np.sort(items)
+
+                # Непарний елемент лишається на рівні – вага зберігається
+                keep = items[:items.size % 2]
+                pairs = items[items.size % 2:]
+
+                # Чергуємо зсув, щоб похибка не накопичувалась в один бік
+                promoted = pairs[self._offsets[level]::2]
+                self._offsets[level] ^= 1
+
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                    self._offsets.append(0)
+
+                self.levels[level] = keep
+                self.levels[level + 1] = np.concatenate(
+                    [self.levels[level + 1], promoted]
+                )
+
+            level += 1
+
+    def quantile(self, q):
+
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([
+            np.full(level.size, 2.0 ** i)
+            for i, level in enumerate(self.levels)
+        ])
+
+        if items.size == 0:
+            return np.nan
+
+        order = np.argsort(items)
+        cumulative = np.cumsum(weights[order])
+
+        target = np.asarray(q, dtype=float) * cumulative[-1]
+        idx = np.searchsorted(cumulative, target, side="left")
+
+        return items[order][np.minimum(idx, items.size - 1)]
+
+
+class StreamingSummary:
+    """
+    RunningStats + QuantileSketch and, if a range is given,
+    a FixedHistogram, all fed by the same batches.
+    """
+
+    def __init__(self, hist_range=None, bins=600, k=512):
+        self.stats = RunningStats()
+        self.sketch = QuantileSketch(k)
+        self.histogram = None
+
+        if hist_range is not None:
+            self.histogram = FixedHistogram(hist_range[0], hist_range[1], bins)
+
+    def update(self, values):
+
+        self.stats.update(values)
+        self.sketch.update(values)
+
+        if self.histogram is not None:
+            self.histogram.update(values)
+
+        return self
+
+    def merge(self, other):
+        """
+        Histograms are merged only if both sides have one. A one-sided
+        histogram survives only when the other side is empty, otherwise
+        it would not cover the merged values and ValueError is raised.
+        """
+
+        if (self.histogram is None) != (other.histogram is None):
+
+            if other.histogram is None and other.stats.count > 0:
+                raise ValueError("Merged summary has no histogram")
+
+            if self.histogram is None and self.stats.count > 0:
+                raise ValueError("Summary has no histogram to merge into")
+
+        self.stats.merge(other.stats)
+        self.sketch.merge(other.sketch)
+
+        if self.histogram is not None and other.histogram is not None:
+            self.histogram.merge(other.histogram)
+
+        elif other.histogram is not None:
+            # Порожнє зведення переймає копію гістограми іншого
+            self.histogram = FixedHistogram(
+                other.histogram.lo, other.histogram.hi, other.histogram.bins
+            ).merge(other.histogram)
+
+        return self
+
+    def summarize(self):
+        # Той самий формат, що й analytics.metrics.summarize
+        return {
+            "mean": self.stats.mean,
+            "std": self.stats.std(),
+            "min": self.stats.min,
+            "max": self.stats.max
+        }
\ No newline at end of file
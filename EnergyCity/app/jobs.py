@@ -0,0 +1,250 @@
+# app/jobs.py
+
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+
+# Фонове виконання важких прогонів дашборду. Один JobExecutor на
+# процес сервера (st.cache_resource), тож вкладки різних користувачів
+# ставлять завдання в спільну чергу, а скрипт Streamlit лише читає стан
+# завдань і не блокується. Завдання – потік; паралельність прогону
+# (workers, пул досліджень) лишається всередині нього. Заміри часу
+# (exclusive) виконуються поодинці – інші завдання не ділять з ними CPU.
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+FINISHED = (DONE, FAILED, CANCELLED)
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class Job:
+    """
+    One submitted run. The worker thread reports progress through
+    report(); the page reads status, progress, partial and result.
+    """
+
+    def __init__(self, owner, kind, label):
+        self.id = uuid.uuid4().hex[:12]
+        self.owner = owner
+        self.kind = kind
+        self.label = label
+
+        self.status = QUEUED
+        self.done = 0
+        self.total = 0
+        self.partial = None
+        self.result = None
+        self.error = None
+
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+
+        self._cancel = threading.Event()
+
+    @property
+    def progress(self):
+        return self.done / self.total if self.total else 0.0
+
+    @property
+    def elapsed(self):
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.time()) - self.started
+
+    def cancel(self):
+        self._cancel.set()
+
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def finish(self, status, when=None):
+        # finished – раніше за status: _evict сортує завершені за finished
+        self.finished = time.time() if when is None else when
+        self.status = status
+
+    def report(self, done, total, partial=None):
+        """
+        Progress callback for batch loops: records the progress and
+        raises JobCancelled once cancel() was called, which stops the
+        loop at the batch boundary. The last batch is never cancelled –
+        the work is already done.
+        """
+        self.done = done
+        self.total = total
+
+        if partial is not None:
+            self.partial = partial
+
+        if self._cancel.is_set() and done < total:
+            raise JobCancelled(self.id)
+
+
+class JobExecutor:
+    """
+    Thread pool with a shared queue of Jobs. Finished jobs are kept
+    (at most keep of them, oldest dropped first) so their results
+    survive reruns of the page. An exclusive job waits (still queued)
+    until no other job runs, and no job starts while it runs or waits.
+    """
+
+    def __init__(self, max_workers=2, keep=100):
+        self.keep = keep
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="job"
+        )
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+        # Стан допуску: скільки завдань виконується, чи серед них
+        # exclusive і скільки exclusive чекають своєї черги
+        self._slots = threading.Condition()
+        self._running = 0
+        self._exclusive = False
+        self._exclusive_waiting = 0
+
+    def submit(self, owner, kind, label, fn, *args, exclusive=False,
+               **kwargs):
+        """
+        Queues fn(job, *args, **kwargs); its return value becomes
+        job.result. exclusive=True runs it alone (timings, profiles).
+        """
+        job = Job(owner, kind, label)
+
+        with self._lock:
+            self._jobs[job.id] = job
+            self._evict()
+
+        self._pool.submit(self._run, job, fn, args, kwargs, exclusive)
+
+        return job
+
+    def _run(self, job, fn, args, kwargs, exclusive=False):
+
+        # Скасоване ще в черзі – не стартуємо
+        if not self._acquire(job, exclusive):
+            job.finish(CANCELLED)
+            return
+
+        job.started = time.time()
+        job.status = RUNNING
+
+        status = FAILED
+
+        try:
+            job.result = fn(job, *args, **kwargs)
+            status = DONE
+        except JobCancelled:
+            status = CANCELLED
+        except Exception:
+            job.error = traceback.format_exc()
+        finally:
+            job.finish(status)
+            self._release()
+
+    def _acquire(self, job, exclusive):
+        """
+        Waits for the job's turn; False if it was cancelled meanwhile.
+        """
+        with self._slots:
+
+            if exclusive:
+                self._exclusive_waiting += 1
+
+            try:
+                while not job.cancelled():
+
+                    if exclusive:
+                        free = self._running == 0
+                    else:
+                        free = not (self._exclusive or
+                                    self._exclusive_waiting)
+
+                    if free:
+                        self._running += 1
+                        self._exclusive = exclusive
+                        return True
+
+                    # Скасування не будить умову – перевіряємо періодично
+                    self._slots.wait(timeout=0.5)
+
+                return False
+
+            finally:
+                if exclusive:
+                    self._exclusive_waiting -= 1
+
+    def _release(self):
+        with self._slots:
+            self._running -= 1
+            self._exclusive = False
+            self._slots.notify_all()
+
+    def _evict(self):
+
+        finished = sorted(
+            (j for j in self._jobs.values() if j.status in FINISHED),
+            key=lambda j: j.finished or j.created
+        )
+
+        for job in finished[:max(0, len(finished) - self.keep)]:
+            del self._jobs[job.id]
+
+    # ---------- QUERIES ----------
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def jobs(self, owner=None):
+        """
+        Jobs of owner (all when None), newest first.
+        """
+        with self._lock:
+            jobs = [j for j in self._jobs.values()
+                    if owner is None or j.owner == owner]
+
+        return sorted(jobs, key=lambda j: j.created, reverse=True)
+
+    def latest(self, owner, kind, status=None):
+        """
+        Newest job of owner of the given kind (and status), or None.
+        """
+        for job in self.jobs(owner):
+            if job.kind == kind and (status is None or job.status in status):
+                return job
+        return None
+
+    def queued_ahead(self, job):
+        """
+        Number of jobs of all users waiting in front of job.
+        """
+        with self._lock:
+            return sum(
+                1 for j in self._jobs.values()
+                if j.status == QUEUED and j.created < job.created
+            )
+
+    def shutdown(self):
+
+        for job in self.jobs():
+            job.cancel()
+
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+        # Завдання, чиї future скасовано, вже не стартують – інакше
+        # вони назавжди лишились би QUEUED
+        now = time.time()
+
+        for job in self.jobs():
+            if job.status == QUEUED:
+                job.finish(CANCELLED, now)
\ No newline at end of file
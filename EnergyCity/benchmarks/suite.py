@@ -0,0 +1,392 @@
+# benchmarks/suite.py
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from statistics import median
+
+import numpy as np
+
+from config.city_config import CityConfig, random_district
+from core.city import CompactCity
+from core.measures import default_measure_table
+from core.price_model import MultiPriceModel
+from simulation.batch_engine import run_batch_simulation, run_parameter_batch
+from simulation.engine import YEARS, run_single_simulation
+from simulation.monte_carlo import run_monte_carlo
+from strategies.adaptive import AdaptiveStrategy
+from strategies.adp import ADPStrategy
+import train_adp
+
+
+# Набір бенчмарків поза Streamlit. Кожен випадок – функція без
+# аргументів, яку заміряємо repeats разів після розігріву; усі seed
+# фіксовані, тож прогони різних версій коду роблять ту саму роботу.
+# Результат – JSON-базова лінія; compare шукає уповільнення.
+
+SEED = 0
+
+# Фіксовані ваги ADP: збережені ваги можуть бути NaN або змінюватись
+# після навчання, а бенчмарк має міряти ту саму роботу
+ADP_WEIGHTS = np.array([-1.0, -2.0, -0.5, 0.3])
+
+CITY_SIZES = {
+    "small": dict(apartments=20000, houses=2500, public=150),
+    "medium": dict(apartments=40000, houses=5000, public=300),
+    "large": dict(apartments=100000, houses=20000, public=1000)
+}
+
+DISTRICT_GROUPS = [100, 1000]
+HORIZONS = [5, 10, 20]
+PATH_COUNTS = [100, 1000]
+
+# Розгортки досліджень: рівні волатильності і сітка 6×6 міст
+SWEEPS = {
+    "volatility4": [CityConfig(volatility=v) for v in (0.5, 1.0, 2.0, 3.0)],
+    "grid36": [
+        CityConfig(apartments=int(a), houses=int(h), public=300)
+        for h in np.linspace(2000, 12000, 6)
+        for a in np.linspace(20000, 80000, 6)
+    ]
+}
+SWEEP_PATHS = 300
+
+QUICK_PATH_COUNTS = [100]
+
+
+def _adp():
+    adp = ADPStrategy()
+    adp.weights = ADP_WEIGHTS.copy()
+    return adp
+
+
+def _strategies():
+    return {"adaptive": AdaptiveStrategy, "adp": _adp}
+
+
+def _configs(quick=False):
+
+    configs = {
+        name: CityConfig(**size) for name, size in CITY_SIZES.items()
+    }
+
+    for n_groups in DISTRICT_GROUPS[:1] if quick else DISTRICT_GROUPS:
+        configs[f"district{n_groups}"] = random_district(n_groups, seed=SEED)
+
+    return configs
+
+
+# ---------- CASES ----------
+def cases(quick=False):
+    """
+    Yields (name, params, fn, number): fn() is timed number times per
+    repetition and the time per call is recorded.
+    """
+    configs = _configs(quick)
+    measures = default_measure_table()
+
+    # ===== run_single_simulation: розмір міста × горизонт =====
+    for city_name, config in configs.items():
+        for strategy_name, make in _strategies().items():
+            for years in HORIZONS[1:2] if quick else HORIZONS:
+                yield (
+                    f"single/{strategy_name}/{city_name}/years{years}",
+                    {"city": city_name, "strategy": strategy_name,
+                     "years": years},
+                    lambda make=make, config=config, years=years:
+                        run_single_simulation(
+                            make(), config, seed=SEED, years=years
+                        ),
+                    20
+                )
+
+    # ===== run_monte_carlo: кількість шляхів =====
+    for strategy_name, make in _strategies().items():
+        for n in QUICK_PATH_COUNTS if quick else PATH_COUNTS:
+            yield (
+                f"monte_carlo/{strategy_name}/paths{n}",
+                {"strategy": strategy_name, "paths": n},
+                lambda make=make, n=n: run_monte_carlo(
+                    make(), configs["medium"], simulations=n, seed=SEED
+                ),
+                1
+            )
+
+    # ===== Розгортка configs: окремі пакети проти одного параметричного =====
+    for strategy_name, make in _strategies().items():
+        for sweep_name, sweep in SWEEPS.items():
+            yield (
+                f"sweep/{strategy_name}/{sweep_name}/separate",
+                {"strategy": strategy_name, "configs": len(sweep),
+                 "paths": SWEEP_PATHS},
+                lambda make=make, sweep=sweep: [
+                    run_batch_simulation(make(), config, SWEEP_PATHS,
+                                         seed=SEED)
+                    for config in sweep
+                ],
+                1
+            )
+            yield (
+                f"sweep/{strategy_name}/{sweep_name}/batched",
+                {"strategy": strategy_name, "configs": len(sweep),
+                 "paths": SWEEP_PATHS},
+                lambda make=make, sweep=sweep: run_parameter_batch(
+                    make(), sweep, SWEEP_PATHS, seed=SEED
+                ),
+                1
+            )
+
+    # ===== choose_action / train_step на одному стані =====
+    prices = {"apartments": 1.2, "houses": 1.1, "public": 1.3}
+
+    for city_name, config in configs.items():
+
+        def city(config=config):
+            return CompactCity(
+                config.group_energy, 1000, measures, config.group_types
+            )
+
+        adaptive = AdaptiveStrategy(epsilon=0.0)
+        adp = ADPStrategy(epsilon=0.0)
+        adp.weights = ADP_WEIGHTS.copy()
+
+        state = city()
+
+        yield (
+            f"choose_action/adaptive/{city_name}",
+            {"city": city_name, "strategy": "adaptive"},
+            lambda s=adaptive, c=state: s.choose_action(c, measures, prices),
+            200
+        )
+        yield (
+            f"choose_action/adp/{city_name}",
+            {"city": city_name, "strategy": "adp"},
+            lambda s=adp, c=state: s.choose_action(c, measures, prices),
+            200
+        )
+
+        # train_step змінює місто – кожен виклик на свіжому місті;
+        # city/... міряє саму побудову, щоб її можна було відняти
+        trainee = ADPStrategy(alpha=0.0, epsilon=0.0)
+        trainee.weights = ADP_WEIGHTS.copy()
+
+        yield (
+            f"city/compact/{city_name}",
+            {"city": city_name},
+            city,
+            100
+        )
+        yield (
+            f"train_step/adp/{city_name}",
+            {"city": city_name, "strategy": "adp"},
+            lambda s=trainee, make_city=city:
+                s.train_step(make_city(), measures, prices),
+            100
+        )
+
+    # ===== Модель цін =====
+    yield (
+        f"price/next_price{YEARS}",
+        {"years": YEARS},
+        _next_prices,
+        100
+    )
+
+    for n in QUICK_PATH_COUNTS if quick else PATH_COUNTS:
+        yield (
+            f"price/sample_paths{n}",
+            {"paths": n},
+            lambda n=n: MultiPriceModel().sample_paths(
+                n, 10, np.random.default_rng(SEED)
+            ),
+            10
+        )
+
+    # ===== Коротке навчання =====
+    for envs in (1, 50):
+        yield (
+            f"train/td/envs{envs}",
+            {"episodes": 200, "envs": envs},
+            lambda envs=envs: _train(episodes=200, envs=envs),
+            1
+        )
+
+
+def _next_prices(years=YEARS):
+
+    # Свіжа модель і seed на кожен виклик: інакше ціни дрейфують між
+    # розігрівом і повторами, і кожен повтор міряв би інший стан
+    model = MultiPriceModel()
+    np.random.seed(SEED)
+
+    for _ in range(years):
+        prices = model.next_price()
+
+    return prices
+
+
+def _train(episodes, envs):
+
+    # Лише навчання: без друку, збереження ваг і графіка
+    train_adp.train(
+        episodes=episodes, envs=envs, weights_path=None, verbose=False
+    )
+
+
+# ---------- RUN ----------
+def run(repeats=5, quick=False, only=None, verbose=True):
+
+    results = {}
+
+    for name, params, fn, number in cases(quick):
+
+        if only and not any(pattern in name for pattern in only):
+            continue
+
+        # Розігрів: кеші стратегій, ліниві імпорти
+        fn()
+
+        times = []
+
+        for _ in range(repeats):
+            start = time.perf_counter()
+            for _ in range(number):
+                fn()
+            times.append((time.perf_counter() - start) / number)
+
+        results[name] = {
+            "params": params,
+            "number": number,
+            "repeats": repeats,
+            "min": min(times),
+            "median": median(times),
+            "mean": float(np.mean(times)),
+            "std": float(np.std(times)),
+            "times": times
+        }
+
+        if verbose:
+            print(f"{name:<45} {_format(median(times)):>10}  "
+                  f"(min {_format(min(times))})")
+
+    return {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "processor": platform.processor(),
+            "cpus": os.cpu_count(),
+            "quick": quick,
+            "repeats": repeats
+        },
+        "results": results
+    }
+
+
+def _format(seconds):
+
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.1f} us"
+    if seconds < 1:
+        return f"{seconds * 1e3:.2f} ms"
+    return f"{seconds:.3f} s"
+
+
+# ---------- COMPARE ----------
+def compare(baseline, current, threshold=0.10, stat="median"):
+    """
+    Returns rows (name, baseline, current, ratio, status) for the
+    benchmarks present in both reports; status is "slower" when
+    current / baseline > 1 + threshold, "faster" when it is
+    < 1 / (1 + threshold), otherwise "ok".
+    """
+    rows = []
+
+    for name, base in baseline["results"].items():
+
+        if name not in current["results"]:
+            continue
+
+        before = base[stat]
+        after = current["results"][name][stat]
+        ratio = after / before if before else np.inf
+
+        if ratio > 1 + threshold:
+            status = "slower"
+        elif ratio < 1 / (1 + threshold):
+            status = "faster"
+        else:
+            status = "ok"
+
+        rows.append((name, before, after, ratio, status))
+
+    return rows
+
+
+def _load(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="EnergyCity benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    bench = sub.add_parser("run", help="run the suite and write a JSON report")
+    bench.add_argument("--output", default="benchmark.json")
+    bench.add_argument("--repeats", type=int, default=5)
+    bench.add_argument("--quick", action="store_true",
+                       help="fewer sizes, horizons and path counts")
+    bench.add_argument("--only", nargs="+", default=None,
+                       help="run only benchmarks whose name contains "
+                            "one of these substrings")
+    bench.add_argument("--baseline", default=None,
+                       help="compare against this report afterwards")
+    bench.add_argument("--threshold", type=float, default=0.10)
+
+    cmp = sub.add_parser("compare", help="compare two JSON reports")
+    cmp.add_argument("baseline")
+    cmp.add_argument("current")
+    cmp.add_argument("--threshold", type=float, default=0.10,
+                     help="relative slowdown that counts as a regression")
+    cmp.add_argument("--stat", choices=["min", "median", "mean"],
+                     default="median")
+
+    args = parser.parse_args()
+
+    if args.command == "run":
+
+        report = run(args.repeats, args.quick, args.only)
+
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+        print(f"Wrote {len(report['results'])} results to {args.output}")
+
+        if args.baseline is None:
+            sys.exit(0)
+
+        baseline, current, stat = _load(args.baseline), report, "median"
+    else:
+        baseline, current, stat = \
+            _load(args.baseline), _load(args.current), args.stat
+
+    rows = compare(baseline, current, args.threshold, stat)
+
+    for name, before, after, ratio, status in rows:
+        print(f"{name:<45} {_format(before):>10} -> {_format(after):>10}  "
+              f"x{ratio:5.2f}  {status}")
+
+    slower = [row for row in rows if row[4] == "slower"]
+
+    print(f"{len(rows)} compared, {len(slower)} slower, "
+          f"{sum(row[4] == 'faster' for row in rows)} faster "
+          f"(threshold {args.threshold:.0%}, {stat})")
+
+    # Ненульовий код виходу – для CI перед деплоєм
+    sys.exit(1 if slower else 0)
\ No newline at end of file
@@ -1,3 +1,6 @@
+import numpy as np
+
+
 class CityConfig:
 
     def __init__(
@@ -5,13 +8,10 @@ class CityConfig:
         apartments=40000,
         houses=5000,
         public=300,
-        volatility=1.0
+        volatility=1.0,
+        groups=None
     ):
 
-        self.apartments = apartments
-        self.houses = houses
-        self.public = public
-
         self.volatility = volatility
 
         # Базове споживання (місячне)
@@ -27,10 +27,73 @@ class CityConfig:
             "public": public
         }
 
+        # groups – групи будівель (назва, тип, базове споживання, кількість);
+        # без groups кожен тип – одна група
+        if groups is None:
+            groups = [(k, k, base[k], counts[k]) for k in base]
+        else:
+            # group_energy – словник за назвою: дублікат зсунув би його
+            # відносно group_types
+            names = [name for name, _, _, _ in groups]
+            duplicates = sorted({n for n in names if names.count(n) > 1})
+            if duplicates:
+                raise ValueError(f"Duplicate building group names: "
+                                 f"{duplicates}")
+
+            counts = {
+                k: sum(c for _, t, _, c in groups if t == k)
+                for k in base
+            }
+
+        self.apartments = counts["apartments"]
+        self.houses = counts["houses"]
+        self.public = counts["public"]
+
+        self.group_energy = {
+            name: b * c for name, _, b, c in groups
+        }
+        self.group_types = [t for _, t, _, _ in groups]
+
         # 🔥 ОЦЕ КЛЮЧОВЕ
         self.energy = {
-            k: base[k] * counts[k]
+            k: sum(
+                self.group_energy[name]
+                for name, t, _, _ in groups if t == k
+            )
             for k in base
         }
 
-        self.initial_budget = 100
\ No newline at end of file
+        self.initial_budget = 100
+
+
+def random_district(n_groups, apartments=40000, houses=5000, public=300,
+                    volatility=1.0, seed=None):
+    """
+    CityConfig with n_groups building groups (at least 3): the types
+    alternate, each type's buildings are split at random among its
+    groups and every group's base consumption varies ±30%.
+    """
+    rng = np.random.default_rng(seed)
+
+    base = {"apartments": 250, "houses": 400, "public": 3000}
+    counts = {"apartments": apartments, "houses": houses, "public": public}
+
+    types = list(base)
+    group_types = [types[g % len(types)] for g in range(max(n_groups, 3))]
+
+    groups = []
+
+    for k in types:
+
+        members = [g for g, t in enumerate(group_types) if t == k]
+        split = rng.multinomial(counts[k], np.full(len(members), 1 / len(members)))
+
+        for g, c in zip(members, split):
+            groups.append((
+                f"{k}-{g}",
+                k,
+                float(base[k] * rng.uniform(0.7, 1.3)),
+                int(c)
+            ))
+
+    return CityConfig(volatility=volatility, groups=groups)
\ No newline at end of file
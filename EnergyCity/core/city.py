@@ -1,3 +1,22 @@
+from collections.abc import Mapping
+
+import numpy as np
+
+from core.measures import MeasureTable, default_measure_table
+
+
+# Типи будівель: порядок цін у MultiPriceModel і ознак ADP
+BUILDING_TYPES = ("apartments", "houses", "public")
+
+# До стількох клітинок group × measure допустимі дії – одна маска по
+# всій таблиці (без сортування), більше – bisect-префікс open_by_cost
+SCAN_CELLS = 4096
+
+# type_index класичного міста (кожен тип – своя група), спільний
+_CLASSIC_TYPE_INDEX = np.arange(len(BUILDING_TYPES))
+_CLASSIC_TYPE_INDEX.flags.writeable = False
+
+
 class City:
 
     def __init__(self, energy_dict, budget):
@@ -25,4 +44,224 @@ class City:
         return True
 
     def total_energy(self):
-        return sum(self.energy.values())
\ No newline at end of file
+        return sum(self.energy.values())
+
+
+# ---------- COMPACT CITY ----------
+class _ArrayView(Mapping):
+    """
+    Read-only dict view of a 1-D array row: keys → positions.
+    """
+
+    __slots__ = ("_keys", "_index", "_values")
+
+    def __init__(self, keys, index, values):
+        self._keys = keys
+        self._index = index
+        self._values = values
+
+    def __getitem__(self, key):
+        return float(self._values[self._index[key]])
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def copy(self):
+        return dict(self)
+
+
+class _AdoptionView(Mapping):
+
+    __slots__ = ("_city",)
+
+    def __init__(self, city):
+        self._city = city
+
+    def __getitem__(self, building_type):
+        city = self._city
+        return _ArrayView(
+            city.measures.names,
+            city.measures.index,
+            city.adoption_values[city.building_index[building_type]]
+        )
+
+    def __iter__(self):
+        return iter(self._city.buildings)
+
+    def __len__(self):
+        return len(self._city.buildings)
+
+
+class CompactCity:
+    """
+    City with array state over building groups: energy_values (groups)
+    and adoption_values (groups × measures), both in fixed index
+    order. city.energy and city.adoption[b] are read-only dict views,
+    so code written for City keeps working.
+
+    Each group has a building type (BUILDING_TYPES) that selects its
+    price and ADP feature. By default every key of energy_dict is its
+    own type, i.e. the classic three-type city.
+
+    open_by_cost[i, r] says whether the r-th cheapest measure is still
+    unsaturated in group i. The affordable measures are a bisect
+    prefix of the columns, so the feasible set is one mask slice.
+    Cities of at most SCAN_CELLS cells just mask the whole table and
+    keep open_by_cost = None.
+
+    group_prices keeps the vector of the last prices dict it saw: a
+    prices dict is a value for one year and must not be changed after
+    it was passed in.
+
+    changes logs every applied (group, measure) pair, so incremental
+    selectors can update only what an action touched.
+    """
+
+    __slots__ = ("buildings", "building_index", "type_index", "measures",
+                 "budget", "energy_values", "adoption_values",
+                 "open_by_cost", "changes", "_energy_view", "_adoption_view",
+                 "_prices", "_price_vector")
+
+    def __init__(self, energy_dict, budget, measures=None, types=None):
+
+        if measures is None:
+            measures = default_measure_table()
+        elif not isinstance(measures, MeasureTable):
+            measures = MeasureTable(measures)
+
+        self.buildings = list(energy_dict)
+        self.building_index = {b: i for i, b in enumerate(self.buildings)}
+        self.measures = measures
+        self.budget = budget
+
+        if types is None:
+            types = self.buildings
+
+        if tuple(types) == BUILDING_TYPES:
+            self.type_index = _CLASSIC_TYPE_INDEX
+        else:
+            self.type_index = np.array(
+                [BUILDING_TYPES.index(t) for t in types], dtype=np.int64
+            )
+
+        self.energy_values = np.array(
+            list(energy_dict.values()), dtype=float
+        )
+        shape = (len(self.buildings), len(measures))
+        self.adoption_values = np.zeros(shape)
+
+        # Малим містам індекс за вартістю не потрібен; великим –
+        # статичний рядок з каталогу без np.tile
+        if self.adoption_values.size <= SCAN_CELLS:
+            self.open_by_cost = None
+        else:
+            self.open_by_cost = np.empty(shape, dtype=bool)
+            self.open_by_cost[:] = measures.open_by_cost
+
+        self.changes = []
+
+        # Подання-словники потрібні рідко – створюються при першому доступі
+        self._energy_view = None
+        self._adoption_view = None
+
+        self._prices = None
+        self._price_vector = None
+
+    @property
+    def energy(self):
+        if self._energy_view is None:
+            self._energy_view = _ArrayView(
+                self.buildings, self.building_index, self.energy_values
+            )
+        return self._energy_view
+
+    @property
+    def adoption(self):
+        if self._adoption_view is None:
+            self._adoption_view = _AdoptionView(self)
+        return self._adoption_view
+
+    def type_energy(self):
+        """
+        Energy summed per building type, in BUILDING_TYPES order.
+        """
+        return np.bincount(
+            self.type_index,
+            weights=self.energy_values,
+            minlength=len(BUILDING_TYPES)
+        )
+
+    def building_type(self, building):
+        return BUILDING_TYPES[self.type_index[self.building_index[building]]]
+
+    def group_prices(self, prices):
+        """
+        Per-group price array from a {building type: price} dict.
+        Strategies and the engine ask for the same dict several times
+        a year, so the last vector is reused.
+        """
+        if prices is not self._prices:
+            self._price_vector = np.array(
+                [prices[t] for t in BUILDING_TYPES]
+            )[self.type_index]
+            self._prices = prices
+
+        return self._price_vector
+
+    def apply(self, i, j):
+        """
+        apply_measure by index: building group i, measure column j.
+        """
+        measures = self.measures
+        current = self.adoption_values[i, j]
+        max_adoption = measures.max_adoption[j]
+
+        if current >= max_adoption:
+            return False
+
+        effective_effect = measures.effect[j] * (1 - current)
+
+        self.energy_values[i] *= (1 - effective_effect)
+        self.budget -= float(measures.cost[j])
+
+        adoption = min(max_adoption, current + 0.1)
+        self.adoption_values[i, j] = adoption
+
+        if adoption >= max_adoption and self.open_by_cost is not None:
+            self.open_by_cost[i, measures.rank[j]] = False
+
+        self.changes.append((i, j))
+
+        return True
+
+    def feasible_flat(self):
+        """
+        All feasible actions as a sorted array of flat indices
+        i * measures + j (group → measure order).
+        """
+        measures = self.measures
+
+        if self.open_by_cost is None:
+            # flatnonzero уже дає порядок group → measure
+            return np.flatnonzero(
+                (self.adoption_values < measures.max_adoption) &
+                (measures.cost <= self.budget)
+            )
+
+        k = measures.n_affordable(self.budget)
+
+        rows, ranks = np.nonzero(self.open_by_cost[:, :k])
+
+        return np.sort(rows * len(measures) + measures.by_cost[ranks])
+
+    def apply_measure(self, measure, building_type):
+        return self.apply(
+            self.building_index[building_type],
+            self.measures.index[measure.name]
+        )
+
+    def total_energy(self):
+        return float(self.energy_values.sum())
\ No newline at end of file
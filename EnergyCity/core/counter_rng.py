@@ -0,0 +1,233 @@
+# core/counter_rng.py
+
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+# Лічильниковий генератор: кожне випадкове число – чиста функція
+# (ключ, лічильник), тож будь-який шлях Монте-Карло відтворюється
+# окремо, без прогону всього батчу.
+
+# Philox4x32-10 (Salmon et al., Random123)
+PHILOX_M0 = np.uint64(0xD2511F53)
+PHILOX_M1 = np.uint64(0xCD9E8D57)
+PHILOX_W0 = 0x9E3779B9
+PHILOX_W1 = 0xBB67AE85
+
+MASK32 = 0xFFFFFFFF
+
+# Половини 64-бітного добутку, якщо дивитись на нього як на два uint32
+_LO, _HI = (0, 1) if sys.byteorder == "little" else (1, 0)
+
+# Блоки лічильника на (шлях, рік): кожен дає дві рівномірні величини
+PRICE_BLOCKS = (0, 1)
+EXPLORE_BLOCK = 2
+
+# Обсяг пам'яті під останні набори шоків і exploration: вони залежать
+# лише від (ключ, шляхи, роки), а не від міста, тож повторні прогони
+# з тим самим seed (розгортки, дашборд) їх не перераховують
+DRAW_CACHE_BYTES = 64 * 1024 * 1024
+DRAW_CACHE_ENTRIES = 64
+
+_draw_cache = OrderedDict()
+_draw_bytes = 0
+_draw_lock = threading.Lock()
+
+
+def philox4x32(counter, key, rounds=10):
+    """
+    Vectorized Philox4x32: counter is a (..., 4) array of 32-bit words,
+    key a pair of 32-bit words. Returns (..., 4) uint32 words.
+    """
+    c = np.asarray(counter, dtype=np.uint32)
+
+    words = _philox_words(
+        c[..., 0], c[..., 1], c[..., 2], c[..., 3], key, rounds
+    )
+
+    return np.stack(np.broadcast_arrays(*words), axis=-1)
+
+
+def _philox_words(c0, c1, c2, c3, key, rounds=10):
+    """
+    Philox on four broadcastable uint32 word arrays. The 64-bit
+    products are read as pairs of uint32 views, so a round costs two
+    multiplications and four XORs, without shifts or masks.
+    """
+    k0, k1 = int(key[0]), int(key[1])
+
+    for r in range(rounds):
+
+        if r:
+            k0 = (k0 + PHILOX_W0) & MASK32
+            k1 = (k1 + PHILOX_W1) & MASK32
+
+        p0 = _halves(np.multiply(c0, PHILOX_M0, dtype=np.uint64))
+        p1 = _halves(np.multiply(c2, PHILOX_M1, dtype=np.uint64))
+
+        n0 = p1[..., _HI] ^ c1
+        n0 ^= np.uint32(k0)
+        n2 = p0[..., _HI] ^ c3
+        n2 ^= np.uint32(k1)
+
+        c0, c1, c2, c3 = n0, p1[..., _LO], n2, p0[..., _LO]
+
+    return c0, c1, c2, c3
+
+
+def _halves(product):
+    return product.reshape(-1).view(np.uint32).reshape(product.shape + (2,))
+
+
+class CounterRNG:
+    """
+    Random streams keyed by (root seed, path index, year).
+
+    seed may be an int, None (fresh entropy), a SeedSequence or another
+    CounterRNG. Draws for path p in year t depend only on the key and
+    (block, t, p), so batches can be split across workers in any way
+    and a single path can be regenerated alone.
+
+    price_shocks and explore_draws of a contiguous range of paths are
+    kept in a per-process LRU (DRAW_CACHE_ENTRIES entries, at most
+    DRAW_CACHE_BYTES) and returned read-only.
+    """
+
+    def __init__(self, seed=None):
+
+        if isinstance(seed, CounterRNG):
+            self.key = seed.key
+            return
+
+        if not isinstance(seed, np.random.SeedSequence):
+            seed = np.random.SeedSequence(seed)
+
+        self.key = tuple(int(w) for w in seed.generate_state(2, np.uint32))
+
+    def uniforms(self, paths, years, blocks):
+        """
+        (len(paths), years, 2) uniforms on [0, 1) from one counter
+        block, or (len(paths), years, len(blocks), 2) from several in
+        one Philox pass.
+        """
+        return np.stack(self._uniform_pair(paths, years, blocks), axis=-1)
+
+    def _uniform_pair(self, paths, years, blocks):
+
+        paths = np.asarray(paths, dtype=np.uint64).reshape(-1)
+        block = np.asarray(blocks, dtype=np.uint32)
+
+        # Слова лічильника (блок, рік, шлях: молодші, старші 32 біти)
+        # транслюються до (paths, years, blocks) у першому раунді
+        shape = (len(paths), 1) + (1,) * block.ndim
+
+        words = _philox_words(
+            block,
+            np.arange(years, dtype=np.uint32).reshape((years,) +
+                                                      (1,) * block.ndim),
+            (paths & np.uint64(MASK32)).astype(np.uint32).reshape(shape),
+            (paths >> np.uint64(32)).astype(np.uint32).reshape(shape),
+            self.key
+        )
+
+        # 53 біти з двох 32-бітних слів, як у numpy; множення на степені
+        # двійки і сума < 2**53 точні, тож це те саме, що ціле зі зсувами
+        u0 = (words[0] >> 5) * 2.0 ** -27
+        u0 += (words[1] >> 6) * 2.0 ** -53
+        u1 = (words[2] >> 5) * 2.0 ** -27
+        u1 += (words[3] >> 6) * 2.0 ** -53
+
+        return u0, u1
+
+    def price_shocks(self, paths, years):
+        """
+        (len(paths), years, 4) standard normal shocks (Box–Muller).
+        """
+        return self._cached("shocks", paths, years, self._price_shocks)
+
+    def _price_shocks(self, paths, years):
+
+        u0, u1 = self._uniform_pair(paths, years, PRICE_BLOCKS)
+
+        radius = np.sqrt(-2 * np.log1p(-u0))
+        angle = 2 * np.pi * u1
+
+        # [блок 0: cos, sin, блок 1: cos, sin]
+        shocks = np.empty(radius.shape + (2,))
+        np.multiply(radius, np.cos(angle), out=shocks[..., 0])
+        np.multiply(radius, np.sin(angle), out=shocks[..., 1])
+
+        return shocks.reshape(len(shocks), years, 2 * len(PRICE_BLOCKS))
+
+    def explore_draws(self, paths, years):
+        """
+        (len(paths), years, 2): [..., 0] decides exploration,
+        [..., 1] picks the random action.
+        """
+        return self._cached(
+            "explore", paths, years,
+            lambda paths, years: self.uniforms(paths, years, EXPLORE_BLOCK)
+        )
+
+    def _cached(self, kind, paths, years, draw):
+
+        global _draw_bytes
+
+        paths = np.asarray(paths).reshape(-1)
+        n = len(paths)
+
+        # Кешуємо лише суцільні діапазони: ключ – (перший шлях, кількість)
+        if n == 0 or not np.array_equal(paths, paths[0] + np.arange(n)):
+            return draw(paths, years)
+
+        key = (kind, self.key, int(paths[0]), n, years)
+
+        with _draw_lock:
+            if key in _draw_cache:
+                _draw_cache.move_to_end(key)
+                return _draw_cache[key]
+
+        value = draw(paths, years)
+        value.flags.writeable = False
+
+        if value.nbytes > DRAW_CACHE_BYTES:
+            return value
+
+        with _draw_lock:
+
+            if key not in _draw_cache:
+                _draw_cache[key] = value
+                _draw_bytes += value.nbytes
+
+            while (_draw_bytes > DRAW_CACHE_BYTES or
+                   len(_draw_cache) > DRAW_CACHE_ENTRIES):
+                _, dropped = _draw_cache.popitem(last=False)
+                _draw_bytes -= dropped.nbytes
+
+        return value
+
+    def path_random(self, path, years):
+        return PathRandom(self.explore_draws([path], years)[0])
+
+
+class PathRandom:
+    """
+    random.Random stand-in for the exploration of one path. The engine
+    sets .year; random() returns that year's exploration draw and
+    choice(seq) picks with the second draw, exactly like the batch
+    engine. One decision per year.
+    """
+
+    def __init__(self, draws):
+        self.draws = np.asarray(draws).tolist()
+        self.year = 0
+
+    def random(self):
+        return self.draws[self.year][0]
+
+    def choice(self, seq):
+        n = len(seq)
+        return seq[min(int(self.draws[self.year][1] * n), n - 1)]
\ No newline at end of file
@@ -1,5 +1,11 @@
+from bisect import bisect_right
+import csv
+import json
+import os
 from dataclasses import dataclass
 
+import numpy as np
+
 @dataclass
 class Measure:
     name: str
@@ -14,4 +20,102 @@ def default_measures():
         Measure("Solar", 30, 0.20, 0.7),
         Measure("SmartMeter", 10, 0.05, 1.0),
         Measure("SmartHome", 6, 0.03, 0.8),
-    ]
\ No newline at end of file
+    ]
+
+
+# ---------- CATALOG FILES ----------
+def load_measures(path):
+    """
+    Reads a measure catalog: .json (list of objects) or .csv with the
+    columns name, cost, effect, max_adoption.
+    """
+    if os.path.splitext(path)[1].lower() == ".json":
+        with open(path, encoding="utf-8") as f:
+            rows = json.load(f)
+    else:
+        with open(path, newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+
+    return [
+        Measure(
+            str(row["name"]),
+            float(row["cost"]),
+            float(row["effect"]),
+            float(row["max_adoption"])
+        )
+        for row in rows
+    ]
+
+
+def load_measure_table(path):
+    return MeasureTable(load_measures(path))
+
+
+# ---------- MEASURE TABLE ----------
+class MeasureTable:
+    """
+    Measures as parallel arrays (cost, effect, max_adoption) with a
+    name → column index. Iterates and indexes like the list of
+    Measure objects it was built from.
+
+    by_cost lists the columns in ascending cost (stable), so the
+    affordable measures for a budget are a prefix found by bisect;
+    rank is the inverse permutation (column → position in by_cost).
+    """
+
+    __slots__ = ("measures", "names", "index", "cost", "effect",
+                 "max_adoption", "by_cost", "rank", "sorted_cost",
+                 "open_by_cost")
+
+    def __init__(self, measures):
+        self.measures = list(measures)
+        self.names = [m.name for m in self.measures]
+        self.index = {name: j for j, name in enumerate(self.names)}
+
+        self.cost = np.array([m.cost for m in self.measures], dtype=float)
+        self.effect = np.array([m.effect for m in self.measures], dtype=float)
+        self.max_adoption = np.array(
+            [m.max_adoption for m in self.measures], dtype=float
+        )
+
+        self.by_cost = np.argsort(self.cost, kind="stable")
+        self.rank = np.empty_like(self.by_cost)
+        self.rank[self.by_cost] = np.arange(len(self.measures))
+        self.sorted_cost = self.cost[self.by_cost].tolist()
+
+        # Початковий рядок CompactCity.open_by_cost: заходи з
+        # max_adoption <= 0 насичені від початку
+        self.open_by_cost = self.max_adoption[self.by_cost] > 0
+
+    def __len__(self):
+        return len(self.measures)
+
+    def __iter__(self):
+        return iter(self.measures)
+
+    def __getitem__(self, j):
+        return self.measures[j]
+
+    def n_affordable(self, budget):
+        return bisect_right(self.sorted_cost, budget)
+
+    def affordable(self, budget):
+        """
+        Columns with cost <= budget, cheapest first.
+        """
+        return self.by_cost[:self.n_affordable(budget)]
+
+
+# Спільна таблиця за замовчуванням: будується один раз, а не на
+# кожну симуляцію (argsort, rank); її не змінюють
+_DEFAULT_TABLE = None
+
+
+def default_measure_table():
+
+    global _DEFAULT_TABLE
+
+    if _DEFAULT_TABLE is None:
+        _DEFAULT_TABLE = MeasureTable(default_measures())
+
+    return _DEFAULT_TABLE
\ No newline at end of file
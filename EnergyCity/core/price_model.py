@@ -1,5 +1,7 @@
 import numpy as np
 
+from core.counter_rng import CounterRNG
+
 
 class MultiPriceModel:
 
@@ -37,4 +39,79 @@ class MultiPriceModel:
                 0.3 * self.vol[k] * local_shock
             )
 
-        return self.prices.copy()
\ No newline at end of file
+        return self.prices.copy()
+
+    def sample_paths(self, n_paths, years, rng=None, antithetic=False,
+                     first_path=0):
+        """
+        Bulk version of next_price: returns a price tensor of shape
+        (n_paths, years, 3) starting from the current prices, with the
+        last axis in self.prices order. All shocks come from one draw
+        of shape (n_paths, years, 4): [..., 0] is the common shock and
+        [..., 1:] are the local ones. The model state is not changed.
+
+        antithetic=True draws the first half of the shocks and uses
+        their negation for the second half: path i + ceil(n/2) mirrors
+        path i.
+
+        rng may be a CounterRNG: path k then uses the shocks of stream
+        first_path + k, so any sub-range of paths can be regenerated.
+        """
+        if rng is None:
+            rng = np.random
+
+        keys = list(self.prices)
+
+        def draw(n):
+            if isinstance(rng, CounterRNG):
+                return rng.price_shocks(first_path + np.arange(n), years)
+            return rng.standard_normal((n, years, 1 + len(keys)))
+
+        if antithetic:
+            half = draw((n_paths + 1) // 2)
+            shocks = np.concatenate([half, -half])[:n_paths]
+        else:
+            shocks = draw(n_paths)
+
+        return self.paths_from_shocks(shocks)
+
+    def paths_from_shocks(self, shocks, volatility_scale=None):
+        """
+        Price tensor (n_paths, years, 3) from shocks of shape
+        (n_paths, years, 4), as in sample_paths. volatility_scale – an
+        optional per-path array multiplying this model's volatilities,
+        so paths of different volatility levels can share one tensor.
+        """
+        keys = list(self.prices)
+
+        growth = np.array([self.growth[k] for k in keys])
+        vol = np.array([self.vol[k] for k in keys])
+        start = np.array([self.prices[k] for k in keys])
+
+        if volatility_scale is not None:
+            vol = (vol * np.asarray(volatility_scale)[:, None])[:, None, :]
+
+        # Той самий порядок операцій, що й у next_price, але на місці
+        steps = 0.7 * vol * shocks[:, :, :1]
+        steps += growth
+        steps += 0.3 * vol * shocks[:, :, 1:]
+        np.exp(steps, out=steps)
+        steps[:, 0] *= start
+
+        return np.cumprod(steps, axis=1, out=steps)
+
+    def expected_paths(self, years):
+        """
+        Exact E[price] for each of the next `years` steps, shape
+        (years, 3). Log-price increments are normal with variance
+        (0.7² + 0.3²) * vol² per year.
+        """
+        keys = list(self.prices)
+
+        growth = np.array([self.growth[k] for k in keys])
+        vol = np.array([self.vol[k] for k in keys])
+        start = np.array([self.prices[k] for k in keys])
+
+        t = np.arange(1, years + 1)[:, None]
+
+        return start * np.exp(t * (growth + 0.5 * 0.58 * vol ** 2))
\ No newline at end of file
@@ -0,0 +1,116 @@
+# core/profiling.py
+
+import json
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+
+
+# Профайлер фаз симуляції. active() – профайлер поточного контексту
+# (потоку): паралельні завдання дашборду не бачать і не псують чужий.
+# None означає, що інструментування вимкнене, і гарячий код робить
+# лише одну перевірку на None:
+#
+#     prof = profiling.active()
+#     if prof is not None:
+#         t = perf_counter()
+#     ...
+#     if prof is not None:
+#         prof.add("scoring", t)
+
+_ACTIVE = ContextVar("active_profiler", default=None)
+
+PHASES = (
+    "price_sampling",
+    "candidates",
+    "scoring",
+    "apply_measure",
+    "budget_update",
+    "td_update"
+)
+
+
+def active():
+    """
+    PhaseProfiler enabled in the current thread, or None.
+    """
+    return _ACTIVE.get()
+
+
+class PhaseProfiler:
+    """
+    Cumulative wall time and call counts per simulation phase.
+    Profilers from worker processes can be merged.
+    """
+
+    def __init__(self):
+        self.time = dict.fromkeys(PHASES, 0.0)
+        self.calls = dict.fromkeys(PHASES, 0)
+
+    def add(self, phase, start):
+        """
+        Books perf_counter() - start to phase and returns the current
+        perf_counter(), so consecutive phases can be chained.
+        """
+        now = perf_counter()
+
+        self.time[phase] = self.time.get(phase, 0.0) + now - start
+        self.calls[phase] = self.calls.get(phase, 0) + 1
+
+        return now
+
+    def merge(self, other):
+
+        for phase, seconds in other.time.items():
+            self.time[phase] = self.time.get(phase, 0.0) + seconds
+            self.calls[phase] = self.calls.get(phase, 0) + other.calls[phase]
+
+        return self
+
+    def report(self, **info):
+        """
+        JSON-ready dict: per phase the call count, total seconds,
+        mean microseconds per call and share of the profiled time.
+        info – extra fields (config, strategy, ...).
+        """
+        total = sum(self.time.values())
+
+        phases = {
+            phase: {
+                "calls": self.calls[phase],
+                "seconds": self.time[phase],
+                "mean_us": (
+                    1e6 * self.time[phase] / self.calls[phase]
+                    if self.calls[phase] else 0.0
+                ),
+                "share": self.time[phase] / total if total else 0.0
+            }
+            for phase in self.time
+        }
+
+        return {**info, "total_seconds": total, "phases": phases}
+
+    def save(self, path, **info):
+
+        with open(path, "w") as f:
+            json.dump(self.report(**info), f, indent=2)
+
+
+@contextmanager
+def profiling(profiler=None):
+    """
+    Enables instrumentation for the block:
+
+        with profiling() as prof:
+            run_monte_carlo(...)
+        prof.save("profile.json")
+    """
+    if profiler is None:
+        profiler = PhaseProfiler()
+
+    token = _ACTIVE.set(profiler)
+
+    try:
+        yield profiler
+    finally:
+        _ACTIVE.reset(token)
\ No newline at end of file
@@ -0,0 +1,16 @@
+# core/serialization.py
+
+import numpy as np
+
+
+def json_default(value):
+    """
+    json.dump fallback shared by cache keys, study results and store
+    metadata: numpy arrays become lists, numpy scalars Python numbers,
+    anything else its str().
+    """
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
\ No newline at end of file
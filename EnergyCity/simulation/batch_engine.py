@@ -0,0 +1,390 @@
+# simulation/batch_engine.py
+
+from time import perf_counter
+
+import numpy as np
+
+from core import profiling
+from core.city import BUILDING_TYPES
+from core.counter_rng import CounterRNG
+from core.measures import MeasureTable, default_measure_table
+from core.price_model import MultiPriceModel
+from simulation.engine import BASE_BUDGET, YEARS
+from strategies.adaptive import AdaptiveStrategy
+from strategies.adp import FEATURE_SCALE
+
+
+# Векторизований рушій: усі N сценаріїв крокують разом рік за роком.
+# Стан міста зберігається масивами:
+#   energy   – (N, groups)
+#   budget   – (N,)
+#   adoption – (N, groups, measures)
+# Група будівель бере ціну свого типу (config.group_types).
+
+
+def run_batch_simulation(strategy, config, n_paths, seed=None,
+                         price_paths=None, training=False, measures=None,
+                         first_path=0, store=None, bank=None):
+    """
+    training=True – N середовищ крокують синхронно, а ваги ADP
+    оновлюються раз на рік сумою TD-кроків alpha · δ · φ усіх переходів
+    року (ваги в межах року спільні), тож кожен перехід важить стільки ж,
+    скільки в послідовному навчанні.
+
+    seed – кореневий seed (int, SeedSequence або CounterRNG; None – свіжа
+    ентропія ОС, глобальний np.random не використовується); шлях k
+    бере ціни та exploration з потоку (seed, first_path + k, рік),
+    тож run_single_simulation(..., seed=seed, path=first_path + k)
+    відтворює його окремо.
+
+    store – TrajectoryStore: річні стани шляхів first_path + k
+    записуються в його рядки.
+    bank – ScenarioBank: ціни шляхів first_path + k беруться з банку.
+    """
+
+    rng = CounterRNG(seed)
+    paths = first_path + np.arange(n_paths)
+
+    price_model = MultiPriceModel(
+        volatility_scale=config.volatility
+    )
+
+    energy = np.tile(_group_energy(config), (n_paths, 1))
+
+    prof = profiling.active()
+    if prof is not None:
+        t = perf_counter()
+
+    # price_paths – заздалегідь згенеровані шляхи цін (N, YEARS, 3)
+    if price_paths is None and bank is not None:
+        price_paths = bank.price_paths(
+            config, first_path, first_path + n_paths
+        )
+    elif price_paths is None:
+        price_paths = price_model.sample_paths(
+            n_paths, YEARS, rng, first_path=first_path
+        )
+
+    if prof is not None:
+        prof.add("price_sampling", t)
+
+    # [:, :, 0] – рішення про exploration, [:, :, 1] – вибір випадкової дії
+    draws = rng.explore_draws(paths, YEARS)
+
+    return _simulate(
+        strategy, config.group_types, energy, price_paths, draws,
+        measures, training, store, paths
+    )
+
+
+def run_parameter_batch(strategy, configs, n_paths, seed=None,
+                        price_paths=None, measures=None, first_path=0,
+                        banks=None):
+    """
+    Runs n_paths paths of every config in configs as one vectorized
+    batch of len(configs) * n_paths rows: initial energy and price
+    volatility are per-row parameters. Returns [(energies, budgets)]
+    in configs order.
+
+    All configs need the same building groups (config.group_types);
+    counts, base consumption and volatility may differ. Path k of every
+    config uses the counter stream (seed, first_path + k), so each
+    result equals run_batch_simulation(strategy, config, n_paths,
+    seed=seed, first_path=first_path) – the sweep sees common random
+    numbers across configs.
+
+    price_paths – (len(configs) * n_paths, YEARS, 3), config-major.
+    banks – ScenarioBank (or None for fresh prices) per config.
+    """
+    configs = list(configs)
+
+    if not configs:
+        return []
+
+    group_types = configs[0].group_types
+
+    if any(c.group_types != group_types for c in configs):
+        raise ValueError("All configs of a parameter batch need the same "
+                         "building groups")
+
+    rng = CounterRNG(seed)
+    paths = first_path + np.arange(n_paths)
+
+    # Таблиця параметрів: рядок – (config, шлях)
+    energy = np.repeat(
+        np.array([_group_energy(c) for c in configs]), n_paths, axis=0
+    )
+
+    prof = profiling.active()
+    if prof is not None:
+        t = perf_counter()
+
+    if price_paths is None:
+
+        # Шоки шляху однакові для всіх configs – рахуємо їх один раз
+        shocks = np.tile(rng.price_shocks(paths, YEARS), (len(configs), 1, 1))
+        volatility = np.repeat([c.volatility for c in configs], n_paths)
+
+        price_paths = MultiPriceModel().paths_from_shocks(shocks, volatility)
+
+        if banks is not None:
+            for k, (config, bank) in enumerate(zip(configs, banks)):
+                if bank is not None:
+                    price_paths[k * n_paths:(k + 1) * n_paths] = \
+                        bank.price_paths(config, first_path,
+                                         first_path + n_paths)
+
+    if prof is not None:
+        prof.add("price_sampling", t)
+
+    draws = np.tile(rng.explore_draws(paths, YEARS), (len(configs), 1, 1))
+
+    energies, budgets = _simulate(
+        strategy, group_types, energy, price_paths, draws, measures
+    )
+
+    return [
+        (energies[k * n_paths:(k + 1) * n_paths],
+         budgets[k * n_paths:(k + 1) * n_paths])
+        for k in range(len(configs))
+    ]
+
+
+def _group_energy(config):
+    return np.array(list(config.group_energy.values()), dtype=float)
+
+
+# ---------- YEAR LOOP ----------
+def _simulate(strategy, group_types, energy, price_paths, draws,
+              measures=None, training=False, store=None, paths=None):
+    """
+    Steps the rows of energy (N, groups) through YEARS years with the
+    given prices (N, YEARS, 3) and exploration draws (N, YEARS, 2).
+    Returns (final energies, final budgets).
+    """
+
+    n_paths = energy.shape[0]
+
+    if measures is None:
+        measures = default_measure_table()
+    elif not isinstance(measures, MeasureTable):
+        measures = MeasureTable(measures)
+
+    type_index = np.array(
+        [BUILDING_TYPES.index(t) for t in group_types]
+    )
+    # (groups, types): energy @ type_onehot – енергія за типами для ADP
+    type_onehot = (
+        type_index[:, None] == np.arange(len(BUILDING_TYPES))
+    ).astype(float)
+
+    cost = measures.cost
+    effect = measures.effect
+    max_adoption = measures.max_adoption
+
+    budget = np.full(n_paths, float(BASE_BUDGET))
+    adoption = np.zeros((n_paths, len(type_index), len(measures)))
+
+    # Похідні від adoption, що оновлюються лише в змінених клітинках:
+    # open – ще не насичені, remaining – effect · (1 − adoption)
+    open_cells = np.broadcast_to(
+        max_adoption > 0, adoption.shape
+    ).copy()
+    remaining = np.broadcast_to(effect, adoption.shape).copy()
+
+    prof = profiling.active()
+
+    rows = np.arange(n_paths)
+
+    for year in range(YEARS):
+
+        if prof is not None:
+            t = perf_counter()
+
+        prices = price_paths[:, year][:, type_index]
+
+        feasible = open_cells & (budget[:, None] >= cost)[:, None, :]
+
+        if prof is not None:
+            t = prof.add("candidates", t)
+
+        if training:
+            state_features = _adp_features(energy @ type_onehot, budget)
+            state_value = state_features @ strategy.weights
+
+        if isinstance(strategy, AdaptiveStrategy):
+            act, flat = _adaptive_actions(
+                strategy, energy, remaining, feasible, cost, prices,
+                draws[:, year]
+            )
+        else:
+            act, flat = _adp_actions(
+                strategy, energy, energy @ type_onehot, budget, remaining,
+                feasible, prices, draws[:, year]
+            )
+
+        if prof is not None:
+            t = prof.add("scoring", t)
+
+        b_idx, m_idx = np.divmod(flat, len(measures))
+
+        r = rows[act]
+        b = b_idx[act]
+        m = m_idx[act]
+
+        # Пласкі індекси: один масив індексів замість трьох
+        group = r * energy.shape[1] + b
+        cell = r * adoption[0].size + flat[act]
+
+        effective_effect = remaining.reshape(-1)[cell]
+
+        energy_before = energy.reshape(-1)[group]
+        energy_after = energy_before * (1 - effective_effect)
+        energy.reshape(-1)[group] = energy_after
+        budget[r] -= cost[m]
+
+        current = np.minimum(max_adoption[m],
+                             adoption.reshape(-1)[cell] + 0.1)
+        adoption.reshape(-1)[cell] = current
+        open_cells.reshape(-1)[cell] = current < max_adoption[m]
+        remaining.reshape(-1)[cell] = effect[m] * (1 - current)
+
+        if prof is not None:
+            t = prof.add("apply_measure", t)
+
+        reward = (energy_before - energy_after) * prices.reshape(-1)[group]
+
+        if training and len(r) > 0:
+            next_value = _adp_features(
+                energy[r] @ type_onehot, budget[r]
+            ) @ strategy.weights
+
+            td_error = reward + strategy.gamma * next_value - state_value[r]
+
+            # Сума, а не середнє: кожен перехід дає той самий крок alpha,
+            # що й у run_single_simulation, лише з вагами початку року
+            strategy.weights += strategy.alpha * np.sum(
+                td_error[:, None] * state_features[r],
+                axis=0
+            )
+
+            if prof is not None:
+                t = prof.add("td_update", t)
+
+        savings = np.zeros(n_paths)
+        savings[r] = reward
+
+        budget = BASE_BUDGET + budget + savings
+
+        if prof is not None:
+            prof.add("budget_update", t)
+
+        if store is not None:
+            group = np.full(n_paths, -1)
+            measure = np.full(n_paths, -1)
+            group[r] = b
+            measure[r] = m
+
+            store.record_batch(
+                paths, year, energy @ type_onehot, budget,
+                price_paths[:, year], group, measure
+            )
+
+    if store is not None:
+        store.flush()
+
+    return energy.sum(axis=1), budget
+
+
+# ---------- EXPLORATION ----------
+def _explore(feasible_flat, draws, epsilon, flat):
+    """
+    Replaces the greedy action of exploring paths with a uniformly
+    random feasible one (building → measure order, as in the scalar
+    strategies). Returns the mask of exploring paths.
+    """
+    exploring = draws[:, 0] < epsilon
+
+    # Допустимі дії рахуємо лише для рядків, що досліджують
+    rows = np.flatnonzero(exploring)
+    feasible = feasible_flat[rows]
+    n_feasible = np.count_nonzero(feasible, axis=1)
+
+    exploring[rows[n_feasible == 0]] = False
+
+    rows = rows[n_feasible > 0]
+    feasible = feasible[n_feasible > 0]
+    n_feasible = n_feasible[n_feasible > 0]
+
+    if rows.size:
+        pick = np.minimum(
+            (draws[rows, 1] * n_feasible).astype(int),
+            n_feasible - 1
+        )
+        flat[rows] = np.argmax(
+            np.cumsum(feasible, axis=1) > pick[:, None],
+            axis=1
+        )
+
+    return exploring
+
+
+# ---------- ADAPTIVE (GREEDY ROI) ----------
+def _adaptive_actions(strategy, energy, remaining, feasible, cost, prices,
+                      draws):
+
+    n_paths = energy.shape[0]
+    feasible_flat = feasible.reshape(n_paths, -1)
+
+    delta_energy = energy[:, :, None] * remaining
+    delta_money = delta_energy * prices[:, :, None]
+
+    # Недопустимі клітинки лишаються -inf: ділимо лише допустимі
+    roi = np.full(delta_money.shape, -np.inf)
+    np.divide(delta_money, cost, out=roi, where=feasible)
+    roi = roi.reshape(n_paths, -1)
+
+    # Стабільне сортування за спаданням ROI = перший максимум
+    flat = np.argmax(roi, axis=1)
+
+    # ROI допустимих дій скінченний: -inf у максимумі – дій немає
+    act = np.take_along_axis(roi, flat[:, None], axis=1)[:, 0] > -np.inf
+
+    _explore(feasible_flat, draws, strategy.epsilon, flat)
+
+    return act, flat
+
+
+# ---------- ADP (VALUE APPROXIMATION) ----------
+def _adp_features(energy, budget):
+
+    # Ті самі ознаки, що й ADPStrategy.features, для кожного шляху;
+    # energy – (N, 3), вже підсумована за типами будівель
+    return np.column_stack([energy, budget]) / FEATURE_SCALE
+
+
+def _adp_actions(strategy, energy, type_energy, budget, remaining, feasible,
+                 prices, draws):
+
+    n_paths = energy.shape[0]
+    feasible_flat = feasible.reshape(n_paths, -1)
+
+    value = _adp_features(type_energy, budget) @ strategy.weights
+
+    energy_before = energy[:, :, None]
+    energy_after = energy_before * (1 - remaining)
+    reward = (energy_before - energy_after) * prices[:, :, None]
+
+    score = reward.reshape(n_paths, -1) + strategy.gamma * value[:, None]
+
+    # Скалярна версія приймає лише score > -1e9 (NaN відкидається)
+    valid = feasible_flat & (score > -1e9)
+    np.copyto(score, -np.inf, where=~valid)
+    flat = np.argmax(score, axis=1)
+
+    # -inf у максимумі – жодної прийнятної жадібної дії
+    greedy = np.take_along_axis(score, flat[:, None], axis=1)[:, 0] > -np.inf
+
+    exploring = _explore(feasible_flat, draws, strategy.epsilon, flat)
+
+    return exploring | greedy, flat
\ No newline at end of file
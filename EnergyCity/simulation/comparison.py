@@ -0,0 +1,301 @@
+# simulation/comparison.py
+
+from statistics import NormalDist
+
+import numpy as np
+
+from analytics.streaming import StreamingSummary
+from core.price_model import MultiPriceModel
+from simulation.batch_engine import run_batch_simulation, run_parameter_batch
+from simulation.engine import YEARS
+from simulation.monte_carlo import run_monte_carlo
+
+
+# Послідовне оцінювання: симулюємо батчами і зупиняємось, щойно
+# довірчий інтервал достатньо вузький (або вичерпано бюджет шляхів).
+
+
+def _run_batch(strategy, config, n, seed, workers, vectorized,
+               price_paths=None, bank=None, first_path=0):
+
+    if vectorized:
+        return run_batch_simulation(
+            strategy, config, n, seed=seed, price_paths=price_paths,
+            first_path=first_path, bank=bank
+        )
+
+    return run_monte_carlo(
+        strategy, config, n, price_paths=price_paths,
+        workers=workers, seed=seed, first_path=first_path, bank=bank
+    )
+
+
+def _z(confidence):
+    return NormalDist().inv_cdf(0.5 + confidence / 2)
+
+
+def run_monte_carlo_until(strategy, config, target_halfwidth,
+                          max_simulations=2000, batch_size=100,
+                          confidence=0.95, workers=1, seed=None,
+                          vectorized=False, bank=None):
+    """
+    Runs batches of batch_size paths until the CI half-width of the mean
+    final energy is <= target_halfwidth or max_simulations is reached.
+    Returns (energies, budgets, report); report holds the number of
+    paths used, the half-width reached and whether the target was met.
+    bank – ScenarioBank; batches take consecutive bank paths.
+    """
+    root = np.random.SeedSequence(seed)
+    z = _z(confidence)
+
+    summary = StreamingSummary()
+    energies = []
+    budgets = []
+
+    halfwidth = np.inf
+
+    while summary.stats.count < max_simulations:
+
+        n = min(batch_size, max_simulations - summary.stats.count)
+
+        e, b = _run_batch(
+            strategy, config, n, root.spawn(1)[0], workers, vectorized,
+            bank=bank, first_path=summary.stats.count
+        )
+
+        summary.update(e)
+        energies.append(e)
+        budgets.append(b)
+
+        halfwidth = z * summary.stats.sem()
+
+        if halfwidth <= target_halfwidth:
+            break
+
+    report = {
+        "simulations": summary.stats.count,
+        "halfwidth": halfwidth,
+        "converged": bool(halfwidth <= target_halfwidth)
+    }
+
+    return np.concatenate(energies), np.concatenate(budgets), report
+
+
+def compare_strategies(strategy_a, strategy_b, config, target_halfwidth,
+                       max_simulations=2000, batch_size=100,
+                       confidence=0.95, workers=1, seed=None,
+                       vectorized=False, bank=None, on_batch=None):
+    """
+    Runs both strategies in batches until the Welch CI half-width of
+    mean_energy(a) - mean_energy(b) is <= target_halfwidth or each
+    strategy has max_simulations paths. Returns
+    ((energy_a, budget_a), (energy_b, budget_b), report), where the
+    summaries are analytics.streaming.StreamingSummary objects.
+    bank – ScenarioBank; both strategies see the same bank paths.
+    on_batch(done, max_simulations, halfwidth) is called after each
+    batch; an exception raised from it stops the run.
+    """
+    root = np.random.SeedSequence(seed)
+    z = _z(confidence)
+
+    hist_range = (0, sum(config.energy.values()))
+
+    summaries = []
+    for _ in range(2):
+        summaries.append((StreamingSummary(hist_range), StreamingSummary()))
+
+    halfwidth = np.inf
+
+    while summaries[0][0].stats.count < max_simulations:
+
+        done = summaries[0][0].stats.count
+        n = min(batch_size, max_simulations - done)
+
+        for strategy, (energy, budget) in zip(
+            (strategy_a, strategy_b), summaries
+        ):
+            e, b = _run_batch(
+                strategy, config, n, root.spawn(1)[0], workers, vectorized,
+                bank=bank, first_path=done
+            )
+            energy.update(e)
+            budget.update(b)
+
+        stats_a = summaries[0][0].stats
+        stats_b = summaries[1][0].stats
+
+        halfwidth = z * np.sqrt(
+            stats_a.variance(ddof=1) / stats_a.count +
+            stats_b.variance(ddof=1) / stats_b.count
+        )
+
+        if on_batch is not None:
+            on_batch(stats_a.count, max_simulations, halfwidth)
+
+        if halfwidth <= target_halfwidth:
+            break
+
+    report = {
+        "simulations": summaries[0][0].stats.count,
+        "mean_diff": summaries[0][0].stats.mean - summaries[1][0].stats.mean,
+        "halfwidth": halfwidth,
+        "converged": bool(halfwidth <= target_halfwidth)
+    }
+
+    return summaries[0], summaries[1], report
+
+
+# ---------- PAIRED COMPARISON (VARIANCE REDUCTION) ----------
+def compare_paired(strategy_a, strategy_b, config, simulations=500,
+                   antithetic=False, control_variate=False,
+                   confidence=0.95, workers=1, seed=None, vectorized=True,
+                   bank=None):
+    """
+    Compares two strategies on identical price paths (common random
+    numbers). Options:
+      antithetic      – path i + ceil(n/2) uses the negated shocks of
+                        path i; the estimate uses the pair means (for
+                        odd n the unpaired middle path is its own unit)
+      control_variate – corrects the differences by the path's mean
+                        realized price, whose expectation is known
+    Returns ((energies_a, budgets_a), (energies_b, budgets_b), report).
+    report["variance_reduction"] is the variance of two independent
+    runs of the same size divided by the variance achieved here.
+
+    Both strategies also share the exploration draws (the same counter
+    stream per path and year), in either engine.
+
+    bank – ScenarioBank: the first `simulations` bank paths are used
+    instead of fresh ones (not combinable with antithetic).
+    """
+    root = np.random.SeedSequence(seed)
+    seed_prices, seed_explore = root.spawn(2)
+
+    price_model = MultiPriceModel(volatility_scale=config.volatility)
+
+    if bank is not None:
+        if antithetic:
+            raise ValueError("A scenario bank has no antithetic paths")
+        price_paths = bank.price_paths(config, 0, simulations)
+    else:
+        price_paths = price_model.sample_paths(
+            simulations, YEARS, np.random.default_rng(seed_prices),
+            antithetic=antithetic
+        )
+
+    # Спільний seed – обидві стратегії отримують і ті самі ціни,
+    # і ті самі випадкові числа для exploration
+    energies_a, budgets_a = _run_batch(
+        strategy_a, config, simulations, seed_explore, workers, vectorized,
+        price_paths
+    )
+    energies_b, budgets_b = _run_batch(
+        strategy_b, config, simulations, seed_explore, workers, vectorized,
+        price_paths
+    )
+
+    report = _paired_report(
+        energies_a, energies_b, price_paths, price_model, antithetic,
+        control_variate, confidence
+    )
+
+    return (energies_a, budgets_a), (energies_b, budgets_b), report
+
+
+def compare_paired_sweep(strategy_a, strategy_b, configs, simulations=500,
+                         antithetic=False, control_variate=False,
+                         confidence=0.95, seed=None, banks=None):
+    """
+    compare_paired for every config in configs, with each strategy run
+    as one parameter batch (run_parameter_batch) over all of them.
+    Entry k of the returned list equals compare_paired(..., configs[k],
+    ...) with the same seed and the vectorized engine.
+
+    banks – ScenarioBank (or None for fresh paths) per config.
+    """
+    configs = list(configs)
+
+    if banks is None:
+        banks = [None] * len(configs)
+
+    if antithetic and any(bank is not None for bank in banks):
+        raise ValueError("A scenario bank has no antithetic paths")
+
+    root = np.random.SeedSequence(seed)
+    seed_prices, seed_explore = root.spawn(2)
+
+    models = [MultiPriceModel(volatility_scale=c.volatility) for c in configs]
+
+    # Ціни кожного config – з того самого seed, як у compare_paired
+    price_paths = [
+        bank.price_paths(config, 0, simulations) if bank is not None
+        else model.sample_paths(
+            simulations, YEARS, np.random.default_rng(seed_prices),
+            antithetic=antithetic
+        )
+        for config, bank, model in zip(configs, banks, models)
+    ]
+
+    results_a, results_b = (
+        run_parameter_batch(
+            strategy, configs, simulations, seed=seed_explore,
+            price_paths=np.concatenate(price_paths)
+        )
+        for strategy in (strategy_a, strategy_b)
+    )
+
+    return [
+        (a, b, _paired_report(a[0], b[0], paths, model, antithetic,
+                              control_variate, confidence))
+        for a, b, paths, model in zip(
+            results_a, results_b, price_paths, models
+        )
+    ]
+
+
+def _paired_report(energies_a, energies_b, price_paths, price_model,
+                   antithetic, control_variate, confidence):
+
+    simulations = len(energies_a)
+
+    diff = energies_a - energies_b
+    mean_price = price_paths.mean(axis=(1, 2))
+    expected_price = price_model.expected_paths(YEARS).mean()
+
+    if antithetic:
+        # Незалежні одиниці – пари (шлях i, дзеркальний шлях i + half);
+        # при непарному n середній шлях half - 1 без пари – окрема одиниця
+        half = (simulations + 1) // 2
+        pairs = simulations - half
+
+        units = np.concatenate([
+            0.5 * (diff[:pairs] + diff[half:]), diff[pairs:half]
+        ])
+        control = np.concatenate([
+            0.5 * (mean_price[:pairs] + mean_price[half:]),
+            mean_price[pairs:half]
+        ])
+    else:
+        units = diff
+        control = mean_price
+
+    beta = 0.0
+
+    if control_variate and np.var(control) > 0:
+        beta = np.cov(units, control)[0, 1] / np.var(control, ddof=1)
+        units = units - beta * (control - expected_price)
+
+    estimator_var = np.var(units, ddof=1) / len(units)
+    independent_var = (
+        np.var(energies_a, ddof=1) + np.var(energies_b, ddof=1)
+    ) / simulations
+
+    report = {
+        "simulations": simulations,
+        "mean_diff": float(np.mean(units)),
+        "halfwidth": _z(confidence) * np.sqrt(estimator_var),
+        "variance_reduction": independent_var / estimator_var,
+        "control_beta": beta
+    }
+
+    return report
\ No newline at end of file
@@ -1,22 +1,106 @@
-from core.city import City
-from core.measures import default_measures
+from time import perf_counter
+
+from core import profiling
+from core.city import BUILDING_TYPES, CompactCity
+from core.counter_rng import CounterRNG, PathRandom
+from core.measures import MeasureTable, default_measure_table
 from core.price_model import MultiPriceModel
 
 BASE_BUDGET = 100
 YEARS = 10
 
 
-def run_single_simulation(strategy, config, training=False):
+def run_single_simulation(strategy, config, training=False, price_path=None,
+                          measures=None, seed=None, path=0, history=None,
+                          store=None, bank=None, years=YEARS):
+    """
+    seed / path – шлях `path` кореневого seed (int, SeedSequence або
+    CounterRNG): ціни й exploration беруться з лічильникового потоку
+    (seed, path, рік), тож результат збігається з тим самим шляхом
+    у run_monte_carlo і run_batch_simulation.
+    history – список, у який після кожного року додається стан міста.
+    store – TrajectoryStore: траєкторія шляху `path` записується
+    в його рядок одним записом наприкінці.
+    bank – ScenarioBank: ціни беруться з його рядка `path`.
+    years – горизонт планування (price_path має покривати його).
+    """
+
+    if bank is not None and price_path is None:
+        price_path = bank.price_paths(config, path, path + 1)[0]
+
+    if seed is not None:
+
+        counter = CounterRNG(seed)
+
+        if price_path is None:
+
+            prof = profiling.active()
+            if prof is not None:
+                t = perf_counter()
+
+            price_path = MultiPriceModel(
+                volatility_scale=config.volatility
+            ).sample_paths(1, years, counter, first_path=path)[0]
+
+            if prof is not None:
+                prof.add("price_sampling", t)
+
+        previous_rng = strategy.rng
+        strategy.rng = counter.path_random(path, years)
 
-    city = City(config.energy.copy(), 100)
-    measures = default_measures()
+        try:
+            return run_single_simulation(
+                strategy, config, training, price_path, measures,
+                path=path, history=history, store=store, years=years
+            )
+        finally:
+            strategy.rng = previous_rng
+
+    # Exploration за лічильником: PathRandom треба знати поточний рік
+    explore = getattr(strategy, "rng", None)
+    if not isinstance(explore, PathRandom):
+        explore = None
+
+    # measures – каталог заходів (MeasureTable або список Measure)
+    if measures is None:
+        measures = default_measure_table()
+    elif not isinstance(measures, MeasureTable):
+        measures = MeasureTable(measures)
+
+    city = CompactCity(
+        config.group_energy, 100, measures, config.group_types
+    )
     price_model = MultiPriceModel(
         volatility_scale=config.volatility
     )
-    for _ in range(YEARS):
+    buildings = list(price_model.prices)
+
+    if store is not None:
+        trajectory = []
 
-        prices = price_model.next_price()
-        energy_before = city.energy.copy()
+    # Профайлер фаз (core.profiling); None – без інструментування
+    prof = profiling.active()
+
+    for year in range(years):
+
+        if explore is not None:
+            explore.year = year
+
+        if prof is not None:
+            t = perf_counter()
+
+        # price_path – заздалегідь згенерований шлях цін (years, 3)
+        if price_path is None:
+            prices = price_model.next_price()
+        else:
+            prices = dict(zip(buildings, price_path[year]))
+        energy_before = city.energy_values.copy()
+        applied = len(city.changes)
+
+        if prof is not None:
+            prof.add("price_sampling", t)
+
+        action = None
 
         if training:
             strategy.train_step(city, measures, prices)
@@ -24,13 +108,58 @@ def run_single_simulation(strategy, config, training=False):
             action = strategy.choose_action(city, measures, prices)
             if action:
                 b, m = action
+
+                if prof is not None:
+                    t = perf_counter()
+
                 city.apply_measure(m, b)
 
-        savings = 0
-        for b in city.energy:
-            diff = energy_before[b] - city.energy[b]
-            savings += diff * prices[b]
+                if prof is not None:
+                    prof.add("apply_measure", t)
+
+        if prof is not None:
+            t = perf_counter()
+
+        # За рік змінюється щонайбільше одна група – решта доданків
+        # нульові, тож рахуємо лише групи із журналу changes
+        savings = 0.0
+
+        if len(city.changes) > applied:
+
+            price = city.group_prices(prices)
+
+            for i in {i for i, _ in city.changes[applied:]}:
+                savings += float(
+                    (energy_before[i] - city.energy_values[i]) * price[i]
+                )
 
         city.budget = BASE_BUDGET + city.budget + savings
 
+        if prof is not None:
+            prof.add("budget_update", t)
+
+        if history is not None:
+            history.append({
+                "year": year + 1,
+                "energy": city.total_energy(),
+                "budget": city.budget,
+                "prices": prices,
+                "action": None if not action else (action[0], action[1].name)
+            })
+
+        if store is not None:
+
+            group, measure = -1, -1
+            if action:
+                group = city.building_index[action[0]]
+                measure = measures.index[action[1].name]
+
+            trajectory.append((
+                city.type_energy(), city.budget,
+                [prices[t] for t in BUILDING_TYPES], group, measure
+            ))
+
+    if store is not None:
+        store.record(path, *zip(*trajectory))
+
     return city.total_energy(), city.budget
\ No newline at end of file
@@ -1,28 +1,196 @@
 # simulation/monte_carlo.py
 
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter
+
 import numpy as np
-from simulation.engine import run_single_simulation
+from analytics.streaming import StreamingSummary
+from core import profiling
+from core.counter_rng import CounterRNG, PathRandom
+from core.price_model import MultiPriceModel
+from simulation.batch_engine import run_batch_simulation
+from simulation.engine import run_single_simulation, YEARS
 from strategies.adaptive import AdaptiveStrategy
 from strategies.adp import ADPStrategy
 
 
-def run_monte_carlo(strategy, config, simulations=500):
+def run_monte_carlo(strategy, config, simulations=500, price_paths=None,
+                    workers=1, seed=None, first_path=0, store=None,
+                    bank=None):
+    """
+    workers    – кількість процесів (шардів); > 1 вмикає паралельний режим
+    seed       – кореневий seed (int, SeedSequence або CounterRNG; None –
+                 свіжа ентропія ОС). Глобальний стан np.random / random
+                 не використовується: np.random.seed() прогін не фіксує,
+                 відтворюваність дає лише явний seed
+    first_path – номер першого шляху
+    store      – TrajectoryStore (необов'язково): кожен шард пише
+                 річні стани своїх шляхів у спільні memmap-файли
+    bank       – ScenarioBank (необов'язково): шлях k бере ціни з рядка
+                 first_path + k; шард читає свій діапазон без копіювання
+
+    Симуляція k бере ціни та exploration з лічильникового потоку
+    (seed, first_path + k, рік), тож результат не залежить від workers,
+    а будь-який шлях відтворюється окремо через
+    run_single_simulation(..., seed=seed, path=first_path + k).
+    """
+    counter = CounterRNG(seed)
+
+    paths = np.arange(first_path, first_path + simulations)
+    shards = [idx for idx in np.array_split(paths, workers) if len(idx)]
+
+    tasks = [
+        (
+            strategy,
+            config,
+            idx,
+            counter,
+            None if price_paths is None else price_paths[idx - first_path],
+            store,
+            bank
+        )
+        for idx in shards
+    ]
+
+    if len(tasks) <= 1:
+        results = [_run_shard(*task) for task in tasks]
+    elif profiling.active() is not None:
+        # Профайлер не переходить у дочірні процеси: кожен шард
+        # повертає власний, і вони зливаються в поточний
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            profiled = list(pool.map(_run_shard_profiled, *zip(*tasks)))
+
+        for _, prof in profiled:
+            profiling.active().merge(prof)
+
+        results = [result for result, _ in profiled]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_run_shard, *zip(*tasks)))
+
+    if not results:
+        return np.empty(0), np.empty(0)
+
+    energies = np.concatenate([e for e, _ in results])
+    budgets = np.concatenate([b for _, b in results])
+
+    return energies, budgets
+
+
+# ---------- STREAMING MODE ----------
+def run_monte_carlo_streaming(strategy, config, simulations=500,
+                              batch_size=10000, workers=1, seed=None,
+                              vectorized=False, bins=600, store=None,
+                              bank=None, on_batch=None):
+    """
+    Симулює батчами по batch_size і одразу згортає результати в
+    потокові акумулятори – пам'ять не залежить від simulations.
+    Гістограма енергії покриває [0, початкова енергія міста).
+    store – TrajectoryStore на всі simulations шляхів (необов'язково).
+    bank  – ScenarioBank: батч бере ціни з рядків свого діапазону шляхів.
+    on_batch(done, simulations, (energy_summary, budget_summary)) –
+    після кожного батчу; виняток з нього зупиняє прогін.
+    Повертає (energy_summary, budget_summary).
+    """
+    energy_summary = StreamingSummary(
+        hist_range=(0, sum(config.energy.values())),
+        bins=bins
+    )
+    budget_summary = StreamingSummary()
+
+    # Батч – це діапазон номерів шляхів одного кореневого потоку,
+    # тож результат не залежить від batch_size, workers і vectorized
+    counter = CounterRNG(seed)
+
+    done = 0
+
+    while done < simulations:
+
+        n = min(batch_size, simulations - done)
 
-    energies = []
-    budgets = []
+        if vectorized:
+            energies, budgets = run_batch_simulation(
+                strategy, config, n, seed=counter, first_path=done,
+                store=store, bank=bank
+            )
+        else:
+            energies, budgets = run_monte_carlo(
+                strategy, config, n, workers=workers, seed=counter,
+                first_path=done, store=store, bank=bank
+            )
+
+        energy_summary.update(energies)
+        budget_summary.update(budgets)
+
+        done += n
+
+        if on_batch is not None:
+            on_batch(done, simulations, (energy_summary, budget_summary))
+
+    return energy_summary, budget_summary
+
+
+# ---------- PARALLEL MODE ----------
+def _run_shard(strategy, config, paths, counter, price_paths, store=None,
+               bank=None):
+
+    prof = profiling.active()
+    if prof is not None:
+        t = perf_counter()
 
-    for _ in range(simulations):
+    # Ціни й exploration усього шарда – одним векторним викликом
+    if price_paths is None and bank is not None:
+        price_paths = bank.price_paths(config, paths[0], paths[-1] + 1)
+    elif price_paths is None:
+        price_paths = MultiPriceModel(
+            volatility_scale=config.volatility
+        ).sample_paths(len(paths), YEARS, counter, first_path=paths[0])
 
-        # 🔥 Створюємо нову стратегію кожного разу
+    if prof is not None:
+        prof.add("price_sampling", t)
+
+    draws = counter.explore_draws(paths, YEARS)
+
+    energies = np.empty(len(paths))
+    budgets = np.empty(len(paths))
+
+    for i in range(len(paths)):
+
+        # 🔥 Створюємо нову стратегію кожного разу – з налаштуваннями
+        # переданої (epsilon, gamma), інакше рушії розходяться
         if isinstance(strategy, AdaptiveStrategy):
-            strat = AdaptiveStrategy()
+            strat = AdaptiveStrategy(
+                epsilon=strategy.epsilon,
+                rng=PathRandom(draws[i]),
+                incremental=strategy.incremental
+            )
         else:
-            strat = ADPStrategy()
+            strat = ADPStrategy(
+                alpha=strategy.alpha,
+                gamma=strategy.gamma,
+                epsilon=strategy.epsilon,
+                rng=PathRandom(draws[i])
+            )
             strat.weights = strategy.weights.copy()
 
-        e, b = run_single_simulation(strat, config, training=False)
+        energies[i], budgets[i] = run_single_simulation(
+            strat,
+            config,
+            training=False,
+            price_path=price_paths[i],
+            path=int(paths[i]),
+            store=store
+        )
+
+    if store is not None:
+        store.flush()
+
+    return energies, budgets
+
+
+def _run_shard_profiled(*task):
 
-        energies.append(e)
-        budgets.append(b)
+    with profiling.profiling() as prof:
+        result = _run_shard(*task)
 
-    return np.array(energies), np.array(budgets)
\ No newline at end of file
+    return result, prof
\ No newline at end of file
@@ -0,0 +1,564 @@
+# simulation/result_cache.py
+
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, TimeoutError
+
+import numpy as np
+
+from config.city_config import CityConfig
+from core.serialization import json_default
+from simulation.monte_carlo import run_monte_carlo, run_monte_carlo_streaming
+from strategies.adaptive import AdaptiveStrategy
+from strategies.adp import ADPStrategy, load_weights
+
+
+CACHE_DIR = ".mc_cache"
+MAX_BYTES = 512 * 1024 * 1024
+# Витіснення спрацьовує над max_bytes і чистить до цієї частки – пачкою,
+# а не по файлу на кожен put
+LOW_WATER = 0.8
+MEMORY_ENTRIES = 32
+
+# Як часто очікувач спільного обчислення віддає прогрес і перевіряє
+# власне скасування (секунди)
+WAIT_POLL = 0.25
+
+# Змінити, якщо змінюється семантика симуляції – старі записи стануть
+# недосяжними
+CACHE_VERSION = 3
+
+
+def weights_digest(weights):
+    data = np.ascontiguousarray(weights, dtype=np.float64).tobytes()
+    return hashlib.sha256(data).hexdigest()[:16]
+
+
+class ResultCache:
+    """
+    On-disk cache of Monte Carlo results. One pickle file per entry,
+    named <strategy>-<weights digest>-<key hash>.pkl; LRU order is the
+    file mtime, which every hit refreshes.
+
+    The directory is scanned once; afterwards puts keep a running size
+    and entry count, and only crossing max_bytes triggers an eviction
+    (down to LOW_WATER * max_bytes) with a fresh scan.
+    """
+
+    def __init__(self, directory=CACHE_DIR, max_bytes=MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+        # Поточний обсяг і кількість записів; None – ще не скановано
+        self._size = None
+        self._count = None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        with self._lock:
+            if self._count is None:
+                self._scan()
+            return self._count
+
+    # ---------- KEYS ----------
+    def key(self, kind, strategy, config, simulations, seed=None, bank=None,
+            **options):
+        """
+        options – further settings the value depends on (e.g. the
+        variance reduction of a paired comparison); part of the key.
+        """
+        if isinstance(strategy, ADPStrategy):
+            digest = weights_digest(strategy.weights)
+        else:
+            digest = "none"
+
+        fields = {
+            "version": CACHE_VERSION,
+            "kind": kind,
+            "config": vars(config),
+            "strategy": type(strategy).__name__,
+            "weights": digest,
+            # Результат залежить і від параметрів рішення стратегії
+            "epsilon": strategy.epsilon,
+            "gamma": getattr(strategy, "gamma", None),
+            "simulations": simulations,
+            # Лічильникові потоки: результат не залежить від workers
+            "seed": seed,
+            "bank": None if bank is None else bank.digest
+        }
+
+        # Без options ключ той самий, що й до їх появи
+        if options:
+            fields["options"] = options
+
+        payload = json.dumps(fields, sort_keys=True, default=json_default)
+
+        content = hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+        return f"{type(strategy).__name__}-{digest}-{content}"
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".pkl")
+
+    # ---------- ACCESS ----------
+    def get(self, key):
+
+        path = self._path(key)
+
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+
+        # Оновлюємо позицію в LRU
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        return value
+
+    def put(self, key, value):
+
+        path = self._path(key)
+
+        # Атомарний запис: тимчасовий файл + rename
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            size = f.tell()
+
+        try:
+            replaced = os.stat(path).st_size
+        except OSError:
+            replaced = None
+
+        os.replace(tmp, path)
+
+        with self._lock:
+
+            if self._size is None:
+                # Перше сканування вже бачить щойно записаний файл
+                self._scan()
+            elif replaced is None:
+                self._size += size
+                self._count += 1
+            else:
+                self._size += size - replaced
+
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def fetch(self, key, compute):
+
+        value = self.get(key)
+
+        if value is None:
+            value = compute()
+            self.put(key, value)
+
+        return value
+
+    # ---------- MAINTENANCE ----------
+    def _entries(self):
+
+        entries = []
+
+        for name in os.listdir(self.directory):
+
+            if not name.endswith(".pkl"):
+                continue
+
+            path = os.path.join(self.directory, name)
+
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+
+            entries.append((st.st_mtime, st.st_size, path, name))
+
+        return entries
+
+    def _scan(self):
+        entries = self._entries()
+        self._size = sum(size for _, size, _, _ in entries)
+        self._count = len(entries)
+
+    def evict(self):
+        """
+        Drops least recently used entries until the cache is back under
+        LOW_WATER * max_bytes, if it is over max_bytes.
+        """
+        with self._lock:
+            self._evict()
+
+    def _evict(self):
+
+        # Свіже сканування: інші процеси могли писати в ту саму теку
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _, _ in entries)
+        count = len(entries)
+
+        if total > self.max_bytes:
+
+            target = self.max_bytes * LOW_WATER
+
+            for _, size, path, _ in entries:
+
+                if total <= target:
+                    break
+
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+                total -= size
+                count -= 1
+
+        self._size = total
+        self._count = count
+
+    def invalidate(self, current_weights):
+        """
+        Removes ADP entries computed with weights other than
+        current_weights. Adaptive entries are kept.
+        """
+        digest = weights_digest(current_weights)
+        prefix = ADPStrategy.__name__ + "-"
+
+        removed = 0
+
+        for _, _, path, name in self._entries():
+
+            if name.startswith(prefix) and not name.startswith(prefix + digest):
+                try:
+                    os.remove(path)
+                    removed += 1
+                except OSError:
+                    pass
+
+        # Лічильники перерахуються з наступним put
+        with self._lock:
+            self._size = None
+            self._count = None
+
+        return removed
+
+
+# ---------- IN-PROCESS SERVICE ----------
+class EvaluationService:
+    """
+    In-process front of ResultCache. Concurrent requests for the same
+    key share one computation (single flight), and the last
+    max_entries results are kept in memory (LRU). Returned values are
+    shared between callers and must not be modified.
+
+    Waiters poll the shared computation every WAIT_POLL seconds and
+    pass the leader's latest progress to their own on_progress, so an
+    exception raised there (a cancelled job) stops only that waiter.
+    """
+
+    def __init__(self, max_entries=MEMORY_ENTRIES):
+        self.max_entries = max_entries
+
+        self._memory = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.coalesced = 0
+        self.computed = 0
+
+    def fetch(self, key, compute, on_progress=None, initial=()):
+        """
+        Value of key: from memory, from the computation another caller
+        already runs, or compute(report). The leader's compute calls
+        report(*progress) to publish its progress; on_progress(*progress)
+        gets the same arguments, from the leader's reports or, while
+        waiting, on every poll (initial until the leader has reported).
+        """
+        while True:
+
+            with self._lock:
+
+                if key in self._memory:
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    return self._memory[key]
+
+                flight = self._inflight.get(key)
+                leader = flight is None
+
+                if leader:
+                    flight = self._inflight[key] = _Flight()
+                else:
+                    self.coalesced += 1
+
+            if leader:
+                break
+
+            found, value = self._wait(flight, on_progress, initial)
+
+            # Помилка чи скасування лідера не належить очікувачам –
+            # наступна ітерація рахує сама
+            if found:
+                return value
+
+        future = flight.future
+
+        def report(*progress):
+            flight.progress = progress
+            if on_progress is not None:
+                on_progress(*progress)
+
+        try:
+            value = compute(report)
+        except BaseException as e:
+            with self._lock:
+                del self._inflight[key]
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+
+            self._memory[key] = value
+            self._memory.move_to_end(key)
+
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+            del self._inflight[key]
+            self.computed += 1
+
+        future.set_result(value)
+
+        return value
+
+    def _wait(self, flight, on_progress, initial):
+
+        while True:
+
+            try:
+                return True, flight.future.result(timeout=WAIT_POLL)
+            except TimeoutError:
+                pass
+            except BaseException:
+                return False, None
+
+            # Виняток звідси (скасоване завдання) зупиняє лише очікувача
+            if on_progress is not None:
+                progress = flight.progress
+                on_progress(*(initial if progress is None else progress))
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._memory),
+                "inflight": len(self._inflight),
+                "hits": self.hits,
+                "coalesced": self.coalesced,
+                "computed": self.computed
+            }
+
+
+class _Flight:
+
+    # Обчислення, що виконується: результат і останній прогрес лідера
+    __slots__ = ("future", "progress")
+
+    def __init__(self):
+        self.future = Future()
+        self.progress = None
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def evaluation_service():
+    """
+    Process-wide EvaluationService used by cached_call.
+    """
+    global _service
+
+    with _service_lock:
+        if _service is None:
+            _service = EvaluationService()
+        return _service
+
+
+def _reset_service():
+    global _service, _service_lock
+
+    # Дочірній процес пулу міг успадкувати захоплений замок і чужі
+    # незавершені обчислення
+    _service = None
+    _service_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_service)
+
+
+def cached_call(fn, strategy, config, simulations=500, workers=1,
+                seed=None, cache=None, bank=None, service=None, **options):
+    """
+    Calls run_monte_carlo / run_monte_carlo_streaming through the cache.
+    seed=None draws fresh entropy, so such a run is not reproducible and
+    is computed without the cache – pass the root seed to cache it.
+    bank – ScenarioBank to take the price paths from.
+    service – EvaluationService in front of the disk cache (the
+    process-wide one by default).
+    options go to fn on a miss and are not part of the key, so they must
+    not change the result (batch_size, on_batch).
+
+    on_batch(done, simulations, summaries) also gets the progress of an
+    identical run another caller already computes; until its first batch
+    it is called with (0, simulations, None) on every poll, so raising
+    from it cancels the wait as it would cancel the run.
+    """
+    if seed is None:
+        return fn(strategy, config, simulations=simulations,
+                  workers=workers, seed=seed, bank=bank, **options)
+
+    if cache is None:
+        cache = ResultCache()
+
+    if service is None:
+        service = evaluation_service()
+
+    on_batch = options.pop("on_batch", None)
+
+    key = cache.key(fn.__name__, strategy, config, simulations, seed, bank)
+
+    def compute(report):
+
+        # Прогрес лідера – і його власному on_batch, і очікувачам
+        if on_batch is not None:
+            options["on_batch"] = report
+
+        return cache.fetch(
+            key,
+            lambda: fn(
+                strategy,
+                config,
+                simulations=simulations,
+                workers=workers,
+                seed=seed,
+                bank=bank,
+                **options
+            )
+        )
+
+    # Різні теки кешу – різні записи й у пам'яті
+    return service.fetch(
+        (os.path.abspath(cache.directory), key),
+        compute,
+        on_progress=on_batch,
+        initial=(0, simulations, None)
+    )
+
+
+# ---------- PREWARM CLI ----------
+def _slider_range(lo, hi, step):
+    return list(range(lo, hi + 1, step))
+
+
+def prewarm(simulations, apartments, houses, public, workers=1, seed=0,
+            weights_path="adp_weights.npy", cache=None, streaming=True):
+
+    if cache is None:
+        cache = ResultCache()
+
+    adp = ADPStrategy()
+
+    try:
+        adp.weights = load_weights(weights_path)
+        cache.invalidate(adp.weights)
+    except OSError:
+        print("ADP weights not found. Using untrained ADP.")
+
+    fn = run_monte_carlo_streaming if streaming else run_monte_carlo
+
+    total = len(simulations) * len(apartments) * len(houses) * len(public)
+    done = 0
+
+    for n in simulations:
+        for a in apartments:
+            for h in houses:
+                for p in public:
+
+                    config = CityConfig(apartments=a, houses=h, public=p)
+
+                    for strategy in (AdaptiveStrategy(epsilon=0.1), adp):
+                        cached_call(fn, strategy, config, n, workers, seed, cache)
+
+                    done += 1
+
+                    if done % 100 == 0:
+                        print(f"{done}/{total} configurations")
+
+    print(f"Prewarmed {done} configurations.")
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Monte Carlo result cache")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    warm = sub.add_parser("prewarm", help="fill the cache over the slider grid")
+    warm.add_argument("--simulations", type=int, nargs="+", default=[500])
+    warm.add_argument("--apartments", type=int, nargs="+",
+                      default=_slider_range(10000, 100000, 5000))
+    warm.add_argument("--houses", type=int, nargs="+",
+                      default=_slider_range(1000, 20000, 1000))
+    warm.add_argument("--public", type=int, nargs="+",
+                      default=_slider_range(50, 1000, 50))
+    warm.add_argument("--workers", type=int, default=1)
+    # Той самий seed за замовчуванням, що й у бічній панелі дашборду
+    warm.add_argument("--seed", type=int, default=0)
+    warm.add_argument("--arrays", action="store_true",
+                      help="cache run_monte_carlo arrays instead of the "
+                           "streaming summaries used by 'Run Simulation'")
+    warm.add_argument("--weights", default="adp_weights.npy")
+
+    prune = sub.add_parser("prune", help="drop ADP entries for old weights")
+    prune.add_argument("--weights", default="adp_weights.npy")
+
+    for p in (warm, prune):
+        p.add_argument("--dir", default=CACHE_DIR)
+        p.add_argument("--max-mb", type=int, default=MAX_BYTES // (1024 * 1024))
+
+    args = parser.parse_args()
+
+    cache = ResultCache(args.dir, args.max_mb * 1024 * 1024)
+
+    if args.command == "prewarm":
+        prewarm(
+            args.simulations,
+            args.apartments,
+            args.houses,
+            args.public,
+            workers=args.workers,
+            seed=args.seed,
+            weights_path=args.weights,
+            cache=cache,
+            streaming=not args.arrays
+        )
+    else:
+        removed = cache.invalidate(load_weights(args.weights))
+        print(f"Removed {removed} stale ADP entries.")
\ No newline at end of file
@@ -0,0 +1,161 @@
+# simulation/scenario_bank.py
+
+import argparse
+import hashlib
+import json
+import os
+import time
+
+import numpy as np
+
+from core.counter_rng import CounterRNG
+from core.price_model import MultiPriceModel
+from simulation.engine import YEARS
+
+
+# Банк сценаріїв: шляхи цін (paths, years, 3) одного рівня волатильності
+# у .npy, який відкривається як memmap лише для читання – паралельні
+# процеси читають ті самі сторінки без копіювання.
+# Рядок k збігається з шляхом k лічильникового потоку seed банку,
+# тож банк – це збережений, а не новий набір майбутніх сценаріїв.
+
+BANK_DIR = "scenario_bank"
+PRICES_FILE = "prices.npy"
+META_FILE = "meta.json"
+
+
+def bank_dir(root, volatility):
+    return os.path.join(root, f"vol-{float(volatility):g}")
+
+
+class ScenarioBank:
+    """
+    Read-only memmapped bank of price paths for one volatility level.
+    Engines take paths by index range (first_path, first_path + n);
+    the bank pickles as its directory, so workers reopen the mapping.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+
+        with open(os.path.join(directory, META_FILE)) as f:
+            self.meta = json.load(f)
+
+        self.volatility = self.meta["volatility"]
+        self.prices = np.load(
+            os.path.join(directory, PRICES_FILE), mmap_mode="r"
+        )
+
+    def __len__(self):
+        return self.prices.shape[0]
+
+    def __getstate__(self):
+        return {"directory": self.directory}
+
+    def __setstate__(self, state):
+        self.__init__(state["directory"])
+
+    @property
+    def digest(self):
+        payload = json.dumps(self.meta, sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+    def price_paths(self, config, start, stop):
+        """
+        Paths start..stop - 1 as a zero-copy (n, years, 3) view.
+        """
+        if not np.isclose(config.volatility, self.volatility):
+            raise ValueError(
+                f"Bank has volatility {self.volatility}, "
+                f"config has {config.volatility}"
+            )
+
+        if start < 0 or stop > len(self):
+            raise ValueError(
+                f"Paths {start}..{stop - 1} are outside the bank "
+                f"of {len(self)} paths"
+            )
+
+        return self.prices[start:stop]
+
+
+def open_bank(root, volatility):
+    """
+    ScenarioBank for the volatility level, or None if it is not built.
+    """
+    directory = bank_dir(root, volatility)
+
+    if not os.path.exists(os.path.join(directory, META_FILE)):
+        return None
+
+    return ScenarioBank(directory)
+
+
+def build_bank(root, volatility, n_paths, years=YEARS, seed=0,
+               chunk=100000):
+    """
+    Generates n_paths price paths in chunks straight into the memmap;
+    memory use is bounded by chunk.
+    """
+    directory = bank_dir(root, volatility)
+    os.makedirs(directory, exist_ok=True)
+
+    # Банк без meta.json вважається недобудованим
+    meta_path = os.path.join(directory, META_FILE)
+    if os.path.exists(meta_path):
+        os.remove(meta_path)
+
+    price_model = MultiPriceModel(volatility_scale=volatility)
+    counter = CounterRNG(seed)
+
+    prices = np.lib.format.open_memmap(
+        os.path.join(directory, PRICES_FILE),
+        mode="w+", dtype=np.float64,
+        shape=(n_paths, years, len(price_model.prices))
+    )
+
+    for start in range(0, n_paths, chunk):
+
+        n = min(chunk, n_paths - start)
+
+        prices[start:start + n] = price_model.sample_paths(
+            n, years, counter, first_path=start
+        )
+
+    prices.flush()
+    del prices
+
+    meta = {
+        "volatility": float(volatility),
+        "n_paths": int(n_paths),
+        "years": int(years),
+        "seed": seed,
+        "types": list(price_model.prices)
+    }
+
+    with open(meta_path, "w") as f:
+        json.dump(meta, f, indent=2)
+
+    return ScenarioBank(directory)
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Price scenario bank")
+    parser.add_argument("--dir", default=BANK_DIR)
+    parser.add_argument("--paths", type=int, default=1000000)
+    parser.add_argument("--volatility", type=float, nargs="+",
+                        default=[0.5, 1.0, 2.0, 3.0])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunk", type=int, default=100000)
+
+    args = parser.parse_args()
+
+    for v in args.volatility:
+
+        start = time.time()
+        bank = build_bank(args.dir, v, args.paths, seed=args.seed,
+                          chunk=args.chunk)
+
+        print(f"volatility {v:g}: {len(bank)} paths in "
+              f"{time.time() - start:.1f}s -> {bank.directory}")
\ No newline at end of file
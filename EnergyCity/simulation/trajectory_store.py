@@ -0,0 +1,203 @@
+# simulation/trajectory_store.py
+
+import json
+import os
+
+import numpy as np
+
+from core.city import BUILDING_TYPES
+from core.serialization import json_default
+from core.measures import MeasureTable, default_measure_table
+
+
+# Колонкове сховище траєкторій: кожна колонка – окремий .npy,
+# відкритий як memmap, рядок – шлях, другий вимір – рік.
+#   energy         – (N, years, types)  енергія за типами після року
+#   budget         – (N, years)         бюджет після року
+#   prices         – (N, years, types)  ціни року
+#   action_group   – (N, years)         індекс групи або -1
+#   action_measure – (N, years)         індекс заходу або -1
+# meta.json – індекс: розміри, перший шлях, назви груп і заходів.
+
+META_FILE = "meta.json"
+
+COLUMNS = {
+    "energy": (np.float64, True),
+    "budget": (np.float64, False),
+    "prices": (np.float64, True),
+    "action_group": (np.int32, False),
+    "action_measure": (np.int32, False)
+}
+
+
+class TrajectoryStore:
+    """
+    Per-year trajectories of a Monte Carlo run in preallocated .npy
+    memmaps. Row k holds path first_path + k. Created with create(),
+    reopened read-only (zero-copy, shareable between processes) with
+    open(). The store pickles as its directory, so worker processes
+    reopen the same files and write their own rows.
+    """
+
+    def __init__(self, directory, mode="r"):
+        self.directory = directory
+        self.mode = mode
+
+        with open(os.path.join(directory, META_FILE)) as f:
+            self.meta = json.load(f)
+
+        self.n_paths = self.meta["n_paths"]
+        self.years = self.meta["years"]
+        self.first_path = self.meta["first_path"]
+
+        self.columns = {
+            name: np.load(self._file(name), mmap_mode=mode)
+            for name in COLUMNS
+        }
+
+    @classmethod
+    def create(cls, directory, n_paths, years, groups=(), measures=(),
+               first_path=0, **info):
+        """
+        Preallocates the columns for n_paths × years. Unwritten
+        actions are -1, unwritten values NaN. info – extra JSON-able
+        fields for the index (seed, strategy, config, ...).
+        """
+        os.makedirs(directory, exist_ok=True)
+
+        for name, (dtype, per_type) in COLUMNS.items():
+
+            shape = (n_paths, years, len(BUILDING_TYPES)) if per_type \
+                else (n_paths, years)
+
+            column = np.lib.format.open_memmap(
+                os.path.join(directory, name + ".npy"),
+                mode="w+", dtype=dtype, shape=shape
+            )
+            column[...] = -1 if np.issubdtype(dtype, np.integer) else np.nan
+            column.flush()
+            del column
+
+        meta = {
+            "n_paths": int(n_paths),
+            "years": int(years),
+            "first_path": int(first_path),
+            "types": list(BUILDING_TYPES),
+            "groups": list(groups),
+            "measures": list(measures),
+            **info
+        }
+
+        with open(os.path.join(directory, META_FILE), "w") as f:
+            json.dump(meta, f, indent=2, default=json_default)
+
+        return cls(directory, mode="r+")
+
+    @classmethod
+    def open(cls, directory, mode="r"):
+        return cls(directory, mode)
+
+    def _file(self, name):
+        return os.path.join(self.directory, name + ".npy")
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def __len__(self):
+        return self.n_paths
+
+    def __getstate__(self):
+        return {"directory": self.directory, "mode": self.mode}
+
+    def __setstate__(self, state):
+        self.__init__(state["directory"], state["mode"])
+
+    # ---------- WRITING ----------
+    def record(self, path, energy, budget, prices, group, measure):
+        """
+        Whole trajectory of one path (scalar engine): per-year sequences.
+        """
+        row = path - self.first_path
+
+        self.columns["energy"][row] = energy
+        self.columns["budget"][row] = budget
+        self.columns["prices"][row] = prices
+        self.columns["action_group"][row] = group
+        self.columns["action_measure"][row] = measure
+
+    def record_batch(self, paths, year, energy, budget, prices, group, measure):
+        """
+        Many paths, one year (vectorized engine); paths – absolute numbers.
+        """
+        rows = np.asarray(paths) - self.first_path
+
+        self.columns["energy"][rows, year] = energy
+        self.columns["budget"][rows, year] = budget
+        self.columns["prices"][rows, year] = prices
+        self.columns["action_group"][rows, year] = group
+        self.columns["action_measure"][rows, year] = measure
+
+    def flush(self):
+        for column in self.columns.values():
+            if isinstance(column, np.memmap) and self.mode != "r":
+                column.flush()
+
+    # ---------- READING ----------
+    def path(self, path):
+        """
+        Trajectory of one path as a list of per-year dicts, in the
+        format of run_single_simulation(..., history=...).
+        """
+        row = path - self.first_path
+
+        groups = self.meta["groups"]
+        measures = self.meta["measures"]
+
+        history = []
+
+        for year in range(self.years):
+
+            group = int(self.columns["action_group"][row, year])
+            measure = int(self.columns["action_measure"][row, year])
+
+            history.append({
+                "year": year + 1,
+                "energy": float(self.columns["energy"][row, year].sum()),
+                "budget": float(self.columns["budget"][row, year]),
+                "prices": dict(zip(
+                    self.meta["types"],
+                    self.columns["prices"][row, year].tolist()
+                )),
+                "action": None if group < 0
+                else (groups[group], measures[measure])
+            })
+
+        return history
+
+
+def create_store(directory, strategy, config, n_paths, years, seed=None,
+                 first_path=0, measures=None):
+    """
+    Store sized and labelled for one run of strategy on config.
+    """
+    if measures is None:
+        measures = default_measure_table()
+    elif not isinstance(measures, MeasureTable):
+        measures = MeasureTable(measures)
+
+    return TrajectoryStore.create(
+        directory,
+        n_paths,
+        years,
+        groups=list(config.group_energy),
+        measures=measures.names,
+        first_path=first_path,
+        strategy=type(strategy).__name__,
+        config={
+            "apartments": config.apartments,
+            "houses": config.houses,
+            "public": config.public,
+            "volatility": config.volatility
+        },
+        seed=seed
+    )
\ No newline at end of file
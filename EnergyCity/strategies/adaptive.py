@@ -1,13 +1,36 @@
 import random
+from time import perf_counter
+
+import numpy as np
+
+from core import profiling
+from core.city import CompactCity
+from strategies.incremental import ROISelector
+
+
+# Вище цієї кількості кандидатів ROI рахується масивами numpy
+LOOP_LIMIT = 64
+
+# incremental="auto": інкрементальний вибір для міст, більших за це
+# число клітинок group × measure
+INCREMENTAL_CELLS = 512
 
 
 class AdaptiveStrategy:
 
-    def __init__(self, epsilon=0.1):
+    def __init__(self, epsilon=0.1, rng=None, incremental="auto"):
         self.epsilon = epsilon
+        # rng – окремий random.Random (None = глобальний модуль random)
+        self.rng = rng
+        # incremental – True / False / "auto" (ROISelector для великих міст)
+        self.incremental = incremental
+        self._selector = None
 
     def choose_action(self, city, measures, prices):
 
+        if isinstance(city, CompactCity) and city.measures is measures:
+            return self._choose_compact(city, measures, prices)
+
         possible_actions = []
 
         for b in city.energy:
@@ -33,8 +56,10 @@ class AdaptiveStrategy:
         if not possible_actions:
             return None
 
-        if random.random() < self.epsilon:
-            _, b, m = random.choice(possible_actions)
+        rng = self.rng or random
+
+        if rng.random() < self.epsilon:
+            _, b, m = rng.choice(possible_actions)
             return (b, m)
 
         # Сортуємо тільки по ROI
@@ -42,4 +67,173 @@ class AdaptiveStrategy:
 
         _, b, m = possible_actions[0]
 
-        return (b, m)
\ No newline at end of file
+        return (b, m)
+
+    # ---------- ARRAY PATH ----------
+    def _choose_compact(self, city, measures, prices):
+        """
+        Same choice as the loop above, read from the CompactCity
+        arrays by index instead of by measure name. Only the
+        affordable, unsaturated (group, measure) cells are visited:
+        with a few of them a plain loop over Python floats beats
+        numpy, with many the ROI is computed on arrays.
+        """
+        if self._use_selector(city, measures):
+            return self._choose_incremental(city, measures, prices)
+
+        # Мале місто: один прохід по всіх клітинках без numpy
+        if len(city.buildings) * len(measures) <= LOOP_LIMIT:
+            return self._choose_small(city, measures, prices)
+
+        prof = profiling.active()
+        if prof is not None:
+            t = perf_counter()
+
+        flat = city.feasible_flat()
+
+        if prof is not None:
+            t = prof.add("candidates", t)
+
+        if flat.size == 0:
+            return None
+
+        rng = self.rng or random
+
+        if rng.random() < self.epsilon:
+            i = rng.choice(flat.tolist())
+
+        elif flat.size <= LOOP_LIMIT:
+            i = self._best_loop(city, measures, prices, flat.tolist())
+
+        else:
+            rows, cols = np.divmod(flat, len(measures))
+
+            price = city.group_prices(prices)
+
+            effective_effect = (
+                measures.effect[cols] * (1 - city.adoption_values[rows, cols])
+            )
+            delta_energy = city.energy_values[rows] * effective_effect
+            delta_money = delta_energy * price[rows]
+            roi = delta_money / measures.cost[cols]
+
+            i = int(flat[np.argmax(roi)])
+
+        if prof is not None:
+            prof.add("scoring", t)
+
+        b, j = divmod(i, len(measures))
+
+        return (city.buildings[b], measures[j])
+
+    def _choose_small(self, city, measures, prices):
+        """
+        Whole-table scan over Python floats for cities of at most
+        LOOP_LIMIT cells: the feasible cells come out in flat order
+        and the ROI is computed on the way, so the choice and the
+        exploration draw are those of the array path.
+        """
+        prof = profiling.active()
+        if prof is not None:
+            t = perf_counter()
+
+        adoption = city.adoption_values.tolist()
+        energy = city.energy_values.tolist()
+        price = city.group_prices(prices).tolist()
+        budget = city.budget
+
+        n = len(measures)
+
+        flat = []
+        best = None
+        best_roi = 0.0
+
+        for b, row in enumerate(adoption):
+
+            for j, m in enumerate(measures.measures):
+
+                current = row[j]
+
+                if current >= m.max_adoption or budget < m.cost:
+                    continue
+
+                i = b * n + j
+                flat.append(i)
+
+                roi = energy[b] * (m.effect * (1 - current)) * price[b] / m.cost
+
+                # Перший максимум = перший у порядку flat
+                if best is None or roi > best_roi:
+                    best = i
+                    best_roi = roi
+
+        if prof is not None:
+            prof.add("scoring", t)
+
+        if not flat:
+            return None
+
+        rng = self.rng or random
+
+        if rng.random() < self.epsilon:
+            best = rng.choice(flat)
+
+        b, j = divmod(best, n)
+
+        return (city.buildings[b], measures[j])
+
+    # ---------- INCREMENTAL PATH ----------
+    def _use_selector(self, city, measures):
+
+        if self.incremental == "auto":
+            return len(city.buildings) * len(measures) > INCREMENTAL_CELLS
+
+        return bool(self.incremental)
+
+    def _choose_incremental(self, city, measures, prices):
+
+        if self._selector is None or self._selector.city is not city:
+            self._selector = ROISelector(city)
+
+        # Жадібний вибір потрібен і як перевірка, що дії взагалі є
+        best = self._selector.best(prices)
+
+        if best is None:
+            return None
+
+        rng = self.rng or random
+
+        if rng.random() < self.epsilon:
+            best = rng.choice(city.feasible_flat().tolist())
+
+        b, j = divmod(best, len(measures))
+
+        return (city.buildings[b], measures[j])
+
+    def _best_loop(self, city, measures, prices, flat):
+
+        adoption = city.adoption_values.tolist()
+        energy = city.energy_values.tolist()
+        price = city.group_prices(prices).tolist()
+
+        rows = measures.measures
+        n = len(rows)
+
+        best = None
+        best_roi = 0.0
+
+        for i in flat:
+
+            b, j = divmod(i, n)
+            m = rows[j]
+
+            effective_effect = m.effect * (1 - adoption[b][j])
+
+            roi = energy[b] * effective_effect * price[b] / m.cost
+
+            # Перший максимум = перший після стабільного сортування
+            if best is None or roi > best_roi:
+                best = i
+                best_roi = roi
+
+        return best
\ No newline at end of file
@@ -2,82 +2,153 @@
 
 import numpy as np
 import random
+from time import perf_counter
+
+from core import profiling
+from core.city import CompactCity
+from core.measures import MeasureTable
+
+
+# Масштаби ознак (енергія квартир, будинків, громадських будівель,
+# бюджет) – порядку початкового міста 40000/5000/300, тож ознаки ~1.
+# З ознаками ~10⁴ крок TD alpha·|φ|² перевищував 2 і ваги розбігались.
+FEATURE_SCALE = np.array([1e7, 2e6, 1e6, 1e7])
+
+# Масштаби ознак до FEATURE_SCALE: файли ваг без збереженого масштабу
+# (масив (4,)) навчено з ними
+LEGACY_FEATURE_SCALE = np.array([1e5, 2e4, 5e3, 1e3])
 
 
 class ADPStrategy:
 
-    def __init__(self, alpha=0.00005, gamma=0.95, epsilon=0.1):
+    def __init__(self, alpha=0.00005, gamma=0.95, epsilon=0.1, rng=None):
         """
         alpha   – learning rate
         gamma   – discount factor
         epsilon – exploration probability
+        rng     – random.Random for exploration (None = global random)
         """
         self.alpha = alpha
         self.gamma = gamma
         self.epsilon = epsilon
+        self.rng = rng
 
         # 3 енергії + бюджет
         self.weights = np.zeros(4)
 
+        # Масиви параметрів заходів для останнього списку measures
+        self._measures_cache = None
+
     # ---------- STATE FEATURES ----------
     def features(self, city):
-        return np.array([
-            city.energy["apartments"] / 100000,
-            city.energy["houses"] / 20000,
-            city.energy["public"] / 5000,
-            city.budget / 1000
-        ])
+
+        if isinstance(city, CompactCity):
+            # Групи будівель підсумовуються за типом
+            apartments, houses, public = city.type_energy()
+        else:
+            apartments = city.energy["apartments"]
+            houses = city.energy["houses"]
+            public = city.energy["public"]
+
+        return np.array([apartments, houses, public, city.budget]) / FEATURE_SCALE
 
     # ---------- VALUE FUNCTION ----------
     def value(self, city):
         return np.dot(self.weights, self.features(city))
 
+    # ---------- MEASURE ARRAYS ----------
+    def _measure_arrays(self, measures):
+
+        if isinstance(measures, MeasureTable):
+            return (measures.names, measures.cost, measures.effect,
+                    measures.max_adoption)
+
+        cached = self._measures_cache
+
+        if cached is None or cached[0] is not measures:
+            cached = (
+                measures,
+                [m.name for m in measures],
+                np.array([m.cost for m in measures], dtype=float),
+                np.array([m.effect for m in measures], dtype=float),
+                np.array([m.max_adoption for m in measures], dtype=float)
+            )
+            self._measures_cache = cached
+
+        return cached[1:]
+
     # ---------- ACTION SELECTION ----------
     def choose_action(self, city, measures, prices):
 
-        possible_actions = []
+        names, cost, effect, max_adoption = self._measure_arrays(measures)
 
-        for b in city.energy:
-            for m in measures:
+        prof = profiling.active()
+        if prof is not None:
+            t = perf_counter()
 
-                current = city.adoption[b].get(m.name, 0)
+        if isinstance(city, CompactCity) and city.measures is measures:
+            buildings = city.buildings
+            adoption = city.adoption_values
+            energy = city.energy_values
+            price = city.group_prices(prices)
 
-                if current >= m.max_adoption:
-                    continue
+            # Кандидати з індексу каталогу – без повного скану
+            flat = city.feasible_flat()
+        else:
+            buildings = list(city.energy)
 
-                if city.budget < m.cost:
-                    continue
+            # Матриці (building × measure)
+            adoption = np.array([
+                city.adoption[b].get(n, 0.0)
+                for b in buildings
+                for n in names
+            ], dtype=float).reshape(len(buildings), len(names))
 
-                possible_actions.append((b, m))
+            energy = np.array([city.energy[b] for b in buildings])
+            price = np.array([prices[b] for b in buildings])
 
-        if not possible_actions:
+            feasible = (adoption < max_adoption) & (city.budget >= cost)
+            flat = np.flatnonzero(feasible)
+
+        if prof is not None:
+            t = prof.add("candidates", t)
+
+        if flat.size == 0:
             return None
 
         # 🔥 Exploration
-        if random.random() < self.epsilon:
-            return random.choice(possible_actions)
+        rng = self.rng or random
+
+        if rng.random() < self.epsilon:
+            i = rng.choice(flat.tolist())
+            return (buildings[i // len(measures)], measures[i % len(measures)])
 
         # 🔥 Greedy selection via value approximation
-        best_score = -1e9
-        best_choice = None
+        # (лише допустимі клітинки building × measure, у порядку flat)
+        rows, cols = np.divmod(flat, len(measures))
 
-        for (b, m) in possible_actions:
+        energy_before = energy[rows]
 
-            current = city.adoption[b].get(m.name, 0)
-            effective_effect = m.effect * (1 - current)
+        effective_effect = effect[cols] * (1 - adoption[rows, cols])
+        energy_after = energy_before * (1 - effective_effect)
 
-            energy_before = city.energy[b]
-            energy_after = energy_before * (1 - effective_effect)
+        reward = (energy_before - energy_after) * price[rows]
 
-            reward = (energy_before - energy_after) * prices[b]
+        # Цінність стану не залежить від кандидата – рахуємо один раз
+        score = reward + self.gamma * self.value(city)
 
-            score = reward + self.gamma * self.value(city)
+        # Перший максимум серед score > -1e9 (як у послідовному переборі)
+        valid = score > -1e9
 
-            if score > best_score:
-                best_score = score
-                best_choice = (b, m)
+        if prof is not None:
+            prof.add("scoring", t)
 
-        return best_choice
+        if not valid.any():
+            return None
+
+        i = int(flat[np.argmax(np.where(valid, score, -np.inf))])
+
+        return (buildings[i // len(measures)], measures[i % len(measures)])
 
     # ---------- TD TRAINING STEP ----------
     def train_step(self, city, measures, prices):
@@ -92,14 +163,121 @@ class ADPStrategy:
 
         b, m = action
 
+        prof = profiling.active()
+        if prof is not None:
+            t = perf_counter()
+
         energy_before = city.energy[b]
         city.apply_measure(m, b)
         energy_after = city.energy[b]
 
-        reward = (energy_before - energy_after) * prices[b]
+        if prof is not None:
+            t = prof.add("apply_measure", t)
+
+        reward = (energy_before - energy_after) * _price(city, prices, b)
 
         next_value = self.value(city)
 
         td_error = reward + self.gamma * next_value - state_value
 
-        self.weights += self.alpha * td_error * state_features
\ No newline at end of file
+        self.weights += self.alpha * td_error * state_features
+
+        if prof is not None:
+            prof.add("td_update", t)
+
+
+class TransitionCollector(ADPStrategy):
+    """
+    Acts like ADPStrategy in training mode, but instead of a TD update
+    stores (features, reward, next_features) for a batch solver.
+    """
+
+    def __init__(self, alpha=0.00005, gamma=0.95, epsilon=0.1, rng=None):
+        super().__init__(alpha, gamma, epsilon, rng)
+        self.transitions = []
+
+    def train_step(self, city, measures, prices):
+
+        state_features = self.features(city)
+
+        action = self.choose_action(city, measures, prices)
+
+        if action is None:
+            return
+
+        b, m = action
+
+        energy_before = city.energy[b]
+        city.apply_measure(m, b)
+        energy_after = city.energy[b]
+
+        reward = (energy_before - energy_after) * _price(city, prices, b)
+
+        self.transitions.append((state_features, reward, self.features(city)))
+
+
+def _price(city, prices, building):
+
+    # Ціна групи будівель – ціна її типу
+    if isinstance(city, CompactCity):
+        return prices[city.building_type(building)]
+
+    return prices[building]
+
+
+# ---------- LSTD ----------
+def solve_lstd(features, rewards, next_features, gamma, ridge=0.0):
+    """
+    Closed-form LSTD(0) solution for a linear value function:
+    A w = b with A = Φᵀ(Φ − γΦ') and b = Φᵀr. Works for any number of
+    feature columns. A small ridge term helps on ill-conditioned sets.
+    """
+    features = np.asarray(features, dtype=float)
+    next_features = np.asarray(next_features, dtype=float)
+    rewards = np.asarray(rewards, dtype=float)
+
+    A = features.T @ (features - gamma * next_features)
+    b = features.T @ rewards
+
+    if ridge:
+        A = A + ridge * np.eye(A.shape[0])
+
+    return np.linalg.lstsq(A, b, rcond=None)[0]
+
+
+# ---------- WEIGHTS FILE ----------
+def save_weights(path, weights):
+    """
+    Saves the weights together with FEATURE_SCALE as a (2, 4) array,
+    so a file trained with other features cannot be loaded silently.
+    """
+    np.save(path, np.stack([np.asarray(weights, dtype=float),
+                            FEATURE_SCALE]))
+
+
+def load_weights(path):
+    """
+    Weights saved by save_weights, for the current FEATURE_SCALE.
+    A legacy (4,) file was trained with LEGACY_FEATURE_SCALE; its
+    weights are rescaled so every value estimate stays the same.
+    Any other feature scale raises ValueError.
+    """
+    stored = np.load(path)
+
+    if stored.shape == (4,):
+        # w·(x / old) = (w · new / old)·(x / new)
+        return stored * FEATURE_SCALE / LEGACY_FEATURE_SCALE
+
+    if stored.shape != (2, 4):
+        raise ValueError(f"{path}: not an ADP weights file "
+                         f"(shape {stored.shape})")
+
+    weights, scale = stored
+
+    if not np.array_equal(scale, FEATURE_SCALE):
+        raise ValueError(
+            f"{path} was trained with feature scale {scale}, "
+            f"the strategy uses {FEATURE_SCALE}; retrain it with train_adp.py"
+        )
+
+    return weights
\ No newline at end of file
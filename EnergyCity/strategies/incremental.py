@@ -0,0 +1,239 @@
+# strategies/incremental.py
+
+from bisect import bisect_left, insort
+from time import perf_counter
+
+import numpy as np
+
+from core import profiling
+from core.city import BUILDING_TYPES
+
+
+# Відносний допуск, у межах якого кандидати перераховуються точно
+TOLERANCE = 1e-9
+
+
+class ROISelector:
+    """
+    Incremental greedy-ROI selection over one CompactCity.
+
+    ROI of (group i, measure j) factors as
+        energy_i * price[type of i] * key_ij,
+        key_ij = effect_j * (1 - adoption_ij) / cost_j,
+    so a price move rescales a whole building type and never reorders
+    measures inside a group. Groups nobody acted on share one catalog
+    order by key and, per type, are kept sorted by energy. A group an
+    action touched gets its own sorted key list, updated from
+    city.changes one (group, measure) entry at a time.
+
+    best() returns the same flat index i * measures + j as the full
+    scan: near-ties within TOLERANCE are re-scored with the exact ROI
+    expression and the first maximum in flat order wins.
+    """
+
+    def __init__(self, city):
+
+        self.city = city
+
+        measures = city.measures
+        self.n = len(measures)
+        self.cost = measures.cost.tolist()
+        self.effect = measures.effect.tolist()
+
+        base_key = (measures.effect / measures.cost).tolist()
+        self.base_key = base_key
+
+        # (-key, j): за спаданням key, при рівності – менший j
+        self.shared = sorted(
+            (-base_key[j], j)
+            for j in range(self.n) if measures.max_adoption[j] > 0
+        )
+
+        energy = city.energy_values
+
+        self.untouched = []
+        for t in range(len(BUILDING_TYPES)):
+            members = np.flatnonzero(city.type_index == t)
+            order = members[np.lexsort((members, -energy[members]))]
+            self.untouched.append(order.tolist())
+
+        self.pointer = [0] * len(BUILDING_TYPES)
+
+        # Торкнуті групи: відсортований список (-key, j) і змінені ключі
+        self.own = {}
+        self.own_keys = {}
+
+        self.cursor = 0
+
+    # ---------- UPDATES ----------
+    def _sync(self):
+
+        city = self.city
+        changes = city.changes
+
+        while self.cursor < len(changes):
+
+            i, j = changes[self.cursor]
+            self.cursor += 1
+
+            if i not in self.own:
+                self.own[i] = list(self.shared)
+                self.own_keys[i] = {}
+
+            entries = self.own[i]
+            keys = self.own_keys[i]
+
+            old = (keys.get(j, -self.base_key[j]), j)
+            k = bisect_left(entries, old)
+
+            if k < len(entries) and entries[k] == old:
+                del entries[k]
+
+            adoption = city.adoption_values[i, j]
+
+            if adoption < city.measures.max_adoption[j]:
+                new = -(self.effect[j] * (1 - adoption) / self.cost[j])
+                keys[j] = new
+                insort(entries, (new, j))
+
+    def _untouched_top(self, t):
+
+        order = self.untouched[t]
+        p = self.pointer[t]
+
+        while p < len(order) and order[p] in self.own:
+            p += 1
+
+        self.pointer[t] = p
+
+        return order[p] if p < len(order) else None
+
+    # ---------- SELECTION ----------
+    def best(self, prices):
+
+        # Індекс і межі – "candidates", точний ROI претендентів – "scoring"
+        prof = profiling.active()
+        if prof is not None:
+            started = perf_counter()
+
+        self._sync()
+
+        city = self.city
+        budget = city.budget
+        energy = city.energy_values
+        cost = self.cost
+
+        price = [prices[t] for t in BUILDING_TYPES]
+
+        shared_key = None
+        for negkey, j in self.shared:
+            if cost[j] <= budget:
+                shared_key = -negkey
+                break
+
+        best_score = None
+
+        if shared_key is not None:
+            for t in range(len(BUILDING_TYPES)):
+                g = self._untouched_top(t)
+                if g is not None:
+                    score = energy[g] * shared_key * price[t]
+                    if best_score is None or score > best_score:
+                        best_score = score
+
+        for i, entries in self.own.items():
+            for negkey, j in entries:
+                if cost[j] <= budget:
+                    score = energy[i] * -negkey * price[city.type_index[i]]
+                    if best_score is None or score > best_score:
+                        best_score = score
+                    break
+
+        if best_score is None:
+            return None
+
+        threshold = best_score * (1 - TOLERANCE)
+
+        contenders = self._contenders(threshold, shared_key, price)
+
+        if prof is not None:
+            started = prof.add("candidates", started)
+
+        best = self._exact_best(contenders, price)
+
+        if prof is not None:
+            prof.add("scoring", started)
+
+        return best
+
+    def _contenders(self, threshold, shared_key, price):
+
+        city = self.city
+        budget = city.budget
+        energy = city.energy_values
+        cost = self.cost
+
+        found = []
+
+        if shared_key is not None:
+            for t in range(len(BUILDING_TYPES)):
+
+                order = self.untouched[t]
+
+                for p in range(self.pointer[t], len(order)):
+
+                    g = order[p]
+
+                    if g in self.own:
+                        continue
+
+                    scale = energy[g] * price[t]
+
+                    # Групи відсортовані за енергією – далі лише менші
+                    if scale * shared_key < threshold:
+                        break
+
+                    for negkey, j in self.shared:
+                        if scale * -negkey < threshold:
+                            break
+                        if cost[j] <= budget:
+                            found.append(g * self.n + j)
+
+        for i, entries in self.own.items():
+
+            scale = energy[i] * price[city.type_index[i]]
+
+            for negkey, j in entries:
+                if scale * -negkey < threshold:
+                    break
+                if cost[j] <= budget:
+                    found.append(i * self.n + j)
+
+        return sorted(found)
+
+    def _exact_best(self, flat, price):
+
+        city = self.city
+        measures = city.measures.measures
+
+        best = None
+        best_roi = 0.0
+
+        # Та сама формула й порядок операцій, що й у повному переборі
+        for i in flat:
+
+            b, j = divmod(i, self.n)
+            m = measures[j]
+
+            effective_effect = m.effect * (1 - city.adoption_values[b, j])
+
+            roi = (
+                city.energy_values[b] * effective_effect *
+                price[city.type_index[b]] / m.cost
+            )
+
+            if best is None or roi > best_roi:
+                best = i
+                best_roi = roi
+
+        return best
\ No newline at end of file
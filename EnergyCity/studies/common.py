@@ -0,0 +1,52 @@
+# studies/common.py
+
+import numpy as np
+
+from config.city_config import CityConfig
+from simulation.scenario_bank import open_bank
+from strategies.adaptive import AdaptiveStrategy
+from strategies.adp import ADPStrategy
+
+
+# Спільне для досліджень: профіль міста зі специфікації, пара
+# стратегій Adaptive / ADP і банк сценаріїв для рівня волатильності.
+
+DEFAULT_CITY = {
+    "apartments": 40000,
+    "houses": 5000,
+    "public": 300,
+    "volatility": 1.0
+}
+
+
+def city_config(city=None, **overrides):
+    """
+    CityConfig from a spec's "city" dict over the 40000/5000/300 default.
+    """
+    return CityConfig(**{**DEFAULT_CITY, **(city or {}), **overrides})
+
+
+def make_strategies(weights):
+    """
+    (AdaptiveStrategy, ADPStrategy) with the given ADP weights.
+    """
+    adp = ADPStrategy()
+    adp.weights = np.asarray(weights, dtype=float).copy()
+
+    return AdaptiveStrategy(), adp
+
+
+def bank_for(root, config, n_paths):
+    """
+    ScenarioBank under root for the config's volatility, or None if
+    there is no root, no bank or the bank is shorter than n_paths.
+    """
+    if root is None:
+        return None
+
+    bank = open_bank(root, config.volatility)
+
+    if bank is None or len(bank) < n_paths:
+        return None
+
+    return bank
\ No newline at end of file
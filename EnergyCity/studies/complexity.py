@@ -0,0 +1,135 @@
+# studies/complexity.py
+
+import time
+
+import numpy as np
+
+from config.city_config import CityConfig, random_district
+from core.profiling import profiling
+from simulation.monte_carlo import run_monte_carlo
+from studies.common import make_strategies
+
+
+# Масштабування часу виконання за розміром міста і кількістю груп
+# будівель плюс профіль фаз. Заміри часу не можна ділити з іншими
+# завданнями на пулі, тому дослідження виконується послідовно
+# (SERIAL); паралельність – лише всередині run_monte_carlo (workers).
+
+DEFAULTS = {
+    "scale_levels": [20000, 40000, 60000, 80000],
+    "group_levels": [10, 100, 1000, 5000],
+    "scale_simulations": 200,
+    "group_simulations": 100,
+    "profile_simulations": 100,
+    "workers": 1,
+    "seed": 0
+}
+
+SERIAL = True
+
+STRATEGIES = ("Adaptive", "ADP")
+
+
+def _scale_config(scale):
+    return CityConfig(apartments=scale, houses=int(scale * 0.125), public=300)
+
+
+def tasks(spec, weights):
+
+    scale = spec["scale_levels"]
+    groups = spec["group_levels"]
+
+    tasks = []
+
+    for level in scale:
+        for name in STRATEGIES:
+            tasks.append(("scale", level, name))
+
+    for level in groups:
+        for name in STRATEGIES:
+            tasks.append(("groups", level, name))
+
+    # Профіль фаз – на крайніх масштабах
+    for name in STRATEGIES:
+        for kind, level in [("scale", scale[0]), ("scale", scale[-1]),
+                            ("groups", groups[min(1, len(groups) - 1)]),
+                            ("groups", groups[-1])]:
+            tasks.append(("profile", (kind, level), name))
+
+    return [
+        (kind, level, name, weights, spec)
+        for kind, level, name in tasks
+    ]
+
+
+def run_task(kind, level, name, weights, spec):
+
+    strategy = make_strategies(weights)[STRATEGIES.index(name)]
+
+    if kind == "profile":
+
+        case, level = level
+
+        if case == "scale":
+            config, label = _scale_config(level), f"{level} apartments"
+        else:
+            # Той самий загальний фонд будівель, розбитий на n груп
+            config, label = random_district(level, seed=0), f"{level} groups"
+
+        with profiling() as prof:
+            run_monte_carlo(
+                strategy, config, simulations=spec["profile_simulations"],
+                workers=spec["workers"], seed=spec["seed"]
+            )
+
+        return {
+            "label": f"{type(strategy).__name__} / {label}",
+            "report": prof.report(simulations=spec["profile_simulations"])
+        }
+
+    if kind == "scale":
+        config = _scale_config(level)
+        simulations = spec["scale_simulations"]
+    else:
+        config = random_district(level, seed=0)
+        simulations = spec["group_simulations"]
+
+    start = time.time()
+    run_monte_carlo(
+        strategy, config, simulations=simulations,
+        workers=spec["workers"], seed=spec["seed"]
+    )
+
+    return time.time() - start
+
+
+def combine(spec, weights, partials):
+
+    n_scale = len(spec["scale_levels"]) * len(STRATEGIES)
+    n_groups = len(spec["group_levels"]) * len(STRATEGIES)
+
+    scale_times = np.reshape(partials[:n_scale], (-1, len(STRATEGIES)))
+    group_times = np.reshape(
+        partials[n_scale:n_scale + n_groups], (-1, len(STRATEGIES))
+    )
+
+    # Нахил у log-log координатах: 1 – лінійне зростання
+    levels = np.asarray(spec["group_levels"], dtype=float)
+    slope = float(np.polyfit(
+        np.log(levels[1:]), np.log(group_times[1:, 1]), 1
+    )[0]) if len(levels) > 2 else float("nan")
+
+    return {
+        "scale_levels": spec["scale_levels"],
+        "scale_times": {
+            name: scale_times[:, k] for k, name in enumerate(STRATEGIES)
+        },
+        "group_levels": spec["group_levels"],
+        "group_times": {
+            name: group_times[:, k] for k, name in enumerate(STRATEGIES)
+        },
+        "group_slope": slope,
+        "profiles": {
+            p["label"]: p["report"] for p in partials[n_scale + n_groups:]
+        }
+    }
\ No newline at end of file
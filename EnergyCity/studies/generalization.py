@@ -0,0 +1,206 @@
+# studies/generalization.py
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from config.city_config import CityConfig
+from simulation.batch_engine import run_parameter_batch
+from simulation.monte_carlo import run_monte_carlo
+from simulation.result_cache import ResultCache
+from strategies.adaptive import AdaptiveStrategy
+from strategies.adp import ADPStrategy
+from studies.common import bank_for, city_config
+
+
+DEFAULTS = {
+    "grid_size": 6,
+    "public": 300,
+    "simulations": 300,
+    "seed": 0,
+    "vectorized": True,
+    "bank": None,
+    "cache": True
+}
+
+SERIAL = False
+
+
+def grid_ranges(size=6):
+    apartments_range = np.linspace(20000, 80000, size).astype(int)
+    houses_range = np.linspace(2000, 12000, size).astype(int)
+    return apartments_range, houses_range
+
+
+def run_generalization(apartments_range, houses_range, weights, public=300,
+                       simulations=300, workers=1, seed=None,
+                       vectorized=True, bank=None, cache=False):
+    """
+    Evaluates the ADP advantage (mean energy Adaptive − ADP) on every
+    (houses, apartments) cell and yields (i, j, advantage) as soon as
+    its task finishes. Tasks run concurrently on a process pool; each
+    gets its own seed from SeedSequence(seed), so the values do not
+    depend on completion order. vectorized=True makes every grid row
+    one parameter batch (one task, common paths across the row);
+    otherwise every cell is a task of its own.
+
+    bank – ScenarioBank: every cell uses the same bank paths, so the
+    cells differ only in the city, not in the futures they see.
+    cache – take cell results from ResultCache; only the misses are
+    simulated. The entries sit under run_monte_carlo keys with the
+    cells' SeedSequence children as seeds, so reruns of the study with
+    the same seed (and layout) hit them, while the dashboard's and the
+    Pareto study's integer-seeded entries are separate.
+    """
+
+    tasks = _cell_tasks(apartments_range, houses_range, weights, public,
+                        simulations, seed, vectorized, bank, cache)
+
+    if workers <= 1:
+        for task in tasks:
+            yield from _cells_advantage(*task)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+
+        futures = [pool.submit(_cells_advantage, *task) for task in tasks]
+
+        for future in as_completed(futures):
+            yield from future.result()
+
+
+def _cell_tasks(apartments_range, houses_range, weights, public,
+                simulations, seed, vectorized, bank, cache=False):
+
+    cells = [
+        (i, j, int(a), int(h))
+        for i, h in enumerate(houses_range)
+        for j, a in enumerate(apartments_range)
+    ]
+
+    # Векторизовано – рядок сітки на завдання, інакше клітинка
+    if vectorized:
+        groups = [
+            [cell for cell in cells if cell[0] == i]
+            for i in range(len(houses_range))
+        ]
+    else:
+        groups = [[cell] for cell in cells]
+
+    seeds = np.random.SeedSequence(seed).spawn(len(groups))
+
+    # seed=None – свіжа ентропія, такі результати не кешуються
+    cache = cache and seed is not None
+
+    return [
+        (group, public, weights, simulations, seeds[k], vectorized, bank,
+         cache)
+        for k, group in enumerate(groups)
+    ]
+
+
+def _cells_advantage(cells, public, weights, simulations, seed_seq,
+                     vectorized, bank=None, cache=False):
+
+    configs = [
+        CityConfig(
+            apartments=apartments,
+            houses=houses,
+            public=public
+        )
+        for _, _, apartments, houses in cells
+    ]
+
+    adaptive = AdaptiveStrategy(epsilon=0.1)
+
+    adp = ADPStrategy()
+    adp.weights = np.asarray(weights, dtype=float)
+
+    seed_adapt, seed_adp = seed_seq.spawn(2)
+
+    results_adapt = _strategy_results(adaptive, configs, simulations,
+                                      seed_adapt, vectorized, bank, cache)
+    results_adp = _strategy_results(adp, configs, simulations, seed_adp,
+                                    vectorized, bank, cache)
+
+    return [
+        (i, j, np.mean(energies_adapt) - np.mean(energies_adp))
+        for (i, j, _, _), (energies_adapt, _), (energies_adp, _) in zip(
+            cells, results_adapt, results_adp
+        )
+    ]
+
+
+def _strategy_results(strategy, configs, simulations, seed, vectorized,
+                      bank, cache):
+    """
+    run_monte_carlo(strategy, config, simulations, seed=seed, bank=bank)
+    for every config. A parameter batch gives the same arrays, so cache
+    hits and misses share the run_monte_carlo cache key either way.
+    """
+    results = [None] * len(configs)
+
+    if cache:
+        store = ResultCache()
+        keys = [
+            store.key(run_monte_carlo.__name__, strategy, config,
+                      simulations, seed, bank)
+            for config in configs
+        ]
+        results = [store.get(key) for key in keys]
+
+    missing = [k for k, result in enumerate(results) if result is None]
+
+    if vectorized:
+        # Усі клітинки без кешу – один пакет зі спільними шляхами
+        computed = run_parameter_batch(
+            strategy, [configs[k] for k in missing], simulations,
+            seed=seed, banks=[bank] * len(missing)
+        )
+    else:
+        computed = [
+            run_monte_carlo(strategy, configs[k], simulations, seed=seed,
+                            bank=bank)
+            for k in missing
+        ]
+
+    for k, result in zip(missing, computed):
+
+        results[k] = result
+
+        if cache:
+            store.put(keys[k], result)
+
+    return results
+
+
+# ---------- STUDY RUNNER ----------
+def tasks(spec, weights):
+
+    apartments_range, houses_range = grid_ranges(spec["grid_size"])
+
+    bank = bank_for(spec["bank"], city_config(), spec["simulations"])
+
+    return _cell_tasks(apartments_range, houses_range, weights,
+                       spec["public"], spec["simulations"], spec["seed"],
+                       spec["vectorized"], bank, spec["cache"])
+
+
+run_task = _cells_advantage
+
+
+def combine(spec, weights, partials):
+
+    apartments_range, houses_range = grid_ranges(spec["grid_size"])
+
+    heatmap = np.full((len(houses_range), len(apartments_range)), np.nan)
+
+    for cells in partials:
+        for i, j, advantage in cells:
+            heatmap[i, j] = advantage
+
+    return {
+        "apartments": apartments_range,
+        "houses": houses_range,
+        "advantage": heatmap
+    }
\ No newline at end of file
@@ -0,0 +1,50 @@
+# studies/happiness.py
+
+import numpy as np
+
+from studies import pareto
+
+
+# Композитний індекс добробуту: ті самі прогони, що й у Pareto
+# (спільний кеш результатів), інша згортка.
+
+DEFAULTS = dict(pareto.DEFAULTS, weights_energy=0.5, weights_budget=0.4,
+                weights_risk=0.1)
+
+SERIAL = False
+
+tasks = pareto.tasks
+run_task = pareto.run_task
+
+
+def combine(spec, weights, partials):
+
+    energies_adapt, energies_adp = (p["energies"] for p in partials)
+    budgets_adapt, budgets_adp = (p["budgets"] for p in partials)
+
+    # ---- Normalization ----
+    max_energy = max(np.max(energies_adapt), np.max(energies_adp))
+    max_budget = max(np.max(budgets_adapt), np.max(budgets_adp))
+
+    # Risk component
+    risk_adapt = np.std(energies_adapt)
+    risk_adp = np.std(energies_adp)
+
+    max_risk = max(risk_adapt, risk_adp)
+
+    # ---- Utility Weights ----
+    w_energy = spec["weights_energy"]
+    w_budget = spec["weights_budget"]
+    w_risk = spec["weights_risk"]
+
+    def happiness(energies, budgets, risk):
+        return float(
+            w_energy * (1 - np.mean(energies / max_energy)) +
+            w_budget * np.mean(budgets / max_budget) -
+            w_risk * risk / max_risk
+        )
+
+    return {
+        "Adaptive": happiness(energies_adapt, budgets_adapt, risk_adapt),
+        "ADP": happiness(energies_adp, budgets_adp, risk_adp)
+    }
\ No newline at end of file
@@ -0,0 +1,110 @@
+# studies/pareto.py
+
+import time
+
+import numpy as np
+
+from analytics.pareto import dominance_fraction, strategy_frontiers
+from simulation.engine import run_single_simulation
+from simulation.monte_carlo import run_monte_carlo
+from simulation.result_cache import ResultCache, cached_call
+from studies.common import bank_for, city_config, make_strategies
+
+
+# Компроміс енергія / бюджет: по завданню на стратегію (Monte Carlo
+# на спільних шляхах), далі фронти, домінування і найгірший шлях ADP.
+
+DEFAULTS = {
+    "city": {},
+    "simulations": 500,
+    "seed": 0,
+    "bank": None,
+    "cache": True
+}
+
+SERIAL = False
+
+STRATEGIES = ("Adaptive", "ADP")
+
+
+def tasks(spec, weights):
+
+    config = city_config(spec["city"])
+    bank = bank_for(spec["bank"], config, spec["simulations"])
+
+    return [
+        (name, config, weights, spec["simulations"], spec["seed"], bank,
+         spec["cache"])
+        for name in STRATEGIES
+    ]
+
+
+def run_task(name, config, weights, simulations, seed, bank, cache):
+
+    strategy = make_strategies(weights)[STRATEGIES.index(name)]
+
+    # Дискова кеш-пам'ять спільна з дашбордом і безпечна між процесами
+    if cache:
+        energies, budgets = cached_call(
+            run_monte_carlo, strategy, config, simulations=simulations,
+            seed=seed, cache=ResultCache(), bank=bank
+        )
+    else:
+        energies, budgets = run_monte_carlo(
+            strategy, config, simulations, seed=seed, bank=bank
+        )
+
+    return {"energies": energies, "budgets": budgets}
+
+
+def combine(spec, weights, partials):
+
+    results = {
+        name: (p["energies"], p["budgets"])
+        for name, p in zip(STRATEGIES, partials)
+    }
+
+    frontiers, _ = strategy_frontiers(results)
+
+    energies_adapt, budgets_adapt = results["Adaptive"]
+    energies_adp, budgets_adp = results["ADP"]
+
+    # ===== Drill-down: worst-budget ADP path =====
+    # Шлях відтворюється окремо з (seed, номер шляху) – без перерахунку
+    # і без зберігання всіх траєкторій
+    config = city_config(spec["city"])
+    worst = int(np.argmin(budgets_adp))
+
+    history = []
+    start = time.time()
+    run_single_simulation(
+        make_strategies(weights)[1], config, seed=spec["seed"], path=worst,
+        history=history,
+        bank=bank_for(spec["bank"], config, spec["simulations"])
+    )
+    elapsed = time.time() - start
+
+    return {
+        "energies": {name: r[0] for name, r in results.items()},
+        "budgets": {name: r[1] for name, r in results.items()},
+        "frontiers": {
+            name: {"energies": e, "budgets": b}
+            for name, (e, b) in frontiers.items()
+        },
+        "dominance": dominance_fraction(
+            energies_adapt, budgets_adapt, energies_adp, budgets_adp
+        ),
+        "worst_path": {
+            "path": worst,
+            "seconds": elapsed,
+            "history": [
+                {
+                    "year": h["year"],
+                    "energy": h["energy"],
+                    "budget": h["budget"],
+                    "action": h["action"]
+                }
+                for h in history
+            ]
+        }
+    }
\ No newline at end of file
@@ -0,0 +1,252 @@
+# studies/runner.py
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from core.serialization import json_default
+from simulation.result_cache import weights_digest
+from strategies import adp
+from studies import complexity, generalization, happiness, pareto, volatility
+
+
+# Безголовий запуск досліджень дашборду. Специфікація – JSON-об'єкт
+# {"study": "...", "name": "...", <параметри>} або {"studies": [...]}.
+# Завдання всіх досліджень специфікації виконуються на одному пулі
+# процесів; результат кожного – results/<name>.json, який дашборд
+# лише читає і малює.
+#
+#     python -m studies.runner spec.json --workers 16
+#     python -m studies.runner --study volatility --set simulations=5000
+
+STUDIES = {
+    "volatility": volatility,
+    "generalization": generalization,
+    "pareto": pareto,
+    "happiness": happiness,
+    "complexity": complexity
+}
+
+RESULTS_DIR = "results"
+WEIGHTS_PATH = "adp_weights.npy"
+
+
+def resolve(spec):
+    """
+    Spec with the study defaults filled in; unknown keys raise ValueError.
+    """
+    if spec.get("study") not in STUDIES:
+        raise ValueError(f"Unknown study {spec.get('study')!r}; "
+                         f"expected one of {sorted(STUDIES)}")
+
+    module = STUDIES[spec["study"]]
+
+    params = {k: v for k, v in spec.items()
+              if k not in ("study", "name", "weights")}
+
+    unknown = set(params) - set(module.DEFAULTS)
+    if unknown:
+        raise ValueError(f"Unknown parameters for {spec['study']}: "
+                         f"{sorted(unknown)}")
+
+    return {
+        "study": spec["study"],
+        "name": spec.get("name", spec["study"]),
+        "weights": spec.get("weights", WEIGHTS_PATH),
+        **module.DEFAULTS,
+        **params
+    }
+
+
+def load_weights(spec):
+
+    weights = spec["weights"]
+
+    if isinstance(weights, str):
+        return adp.load_weights(weights)
+
+    return np.asarray(weights, dtype=float)
+
+
+# ---------- RUN ----------
+def run_studies(specs, workers=1, on_result=None):
+    """
+    Runs the studies and returns their result documents in spec order.
+    Tasks of all parallel studies share one process pool (in-process
+    when workers <= 1); SERIAL studies (timings) run afterwards in this
+    process. on_result(spec, done, total, partial) is called as each
+    task finishes; an exception raised from it cancels the tasks that
+    have not started yet and propagates.
+    """
+    specs = [resolve(spec) for spec in specs]
+    weights = [load_weights(spec) for spec in specs]
+
+    jobs = [
+        (s, k, task)
+        for s, spec in enumerate(specs)
+        for k, task in enumerate(STUDIES[spec["study"]].tasks(spec, weights[s]))
+    ]
+
+    partials = [[None] * sum(1 for j in jobs if j[0] == s)
+                for s in range(len(specs))]
+    done = [0] * len(specs)
+
+    # Час першого старту й останнього завершення завдань дослідження:
+    # на спільному пулі дослідження починаються в різний час
+    started = [None] * len(specs)
+    finished = [None] * len(specs)
+
+    def record(s, k, timed):
+
+        start, partial = timed
+
+        if started[s] is None or start < started[s]:
+            started[s] = start
+        finished[s] = time.time()
+
+        partials[s][k] = partial
+        done[s] += 1
+
+        if on_result is not None:
+            on_result(specs[s], done[s], len(partials[s]), partial)
+
+    parallel = [j for j in jobs if not STUDIES[specs[j[0]]["study"]].SERIAL]
+    serial = [j for j in jobs if STUDIES[specs[j[0]]["study"]].SERIAL]
+
+    if workers <= 1:
+        for s, k, task in parallel:
+            record(s, k, _run_task(specs[s]["study"], task))
+    elif parallel:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+
+            futures = {
+                pool.submit(_run_task, specs[s]["study"], task): (s, k)
+                for s, k, task in parallel
+            }
+
+            try:
+                for future in as_completed(futures):
+                    record(*futures[future], future.result())
+            except BaseException:
+                # Інакше вихід з with чекав би на всю чергу завдань
+                for future in futures:
+                    future.cancel()
+                raise
+
+    for s, k, task in serial:
+        record(s, k, _run_task(specs[s]["study"], task))
+
+    documents = []
+
+    for s, spec in enumerate(specs):
+
+        result = STUDIES[spec["study"]].combine(spec, weights[s], partials[s])
+
+        elapsed = 0.0
+        if started[s] is not None:
+            elapsed = finished[s] - started[s]
+
+        documents.append({
+            "study": spec["study"],
+            "name": spec["name"],
+            "spec": {k: v for k, v in spec.items() if k != "weights"},
+            "weights_digest": weights_digest(weights[s]),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "elapsed": elapsed,
+            "result": result
+        })
+
+    return documents
+
+
+def _run_task(study, task):
+
+    # Старт фіксується у воркері – не коли завдання потрапило в чергу
+    start = time.time()
+
+    return start, STUDIES[study].run_task(*task)
+
+
+def run_study(spec, workers=1, on_result=None):
+    return run_studies([spec], workers, on_result)[0]
+
+
+# ---------- RESULTS ON DISK ----------
+def save_result(document, directory=RESULTS_DIR):
+
+    os.makedirs(directory, exist_ok=True)
+
+    path = os.path.join(directory, document["name"] + ".json")
+    tmp = path + ".tmp"
+
+    # Атомарний запис: дашборд може читати файл у цей момент
+    with open(tmp, "w") as f:
+        json.dump(document, f, default=json_default)
+
+    os.replace(tmp, path)
+
+    return path
+
+
+def load_result(name, directory=RESULTS_DIR):
+    """
+    Result document saved under name, or None.
+    """
+    try:
+        with open(os.path.join(directory, name + ".json")) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _parse_value(text):
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Run dashboard studies")
+    parser.add_argument("spec", nargs="*",
+                        help="JSON spec files (a study object or "
+                             "{\"studies\": [...]})")
+    parser.add_argument("--study", choices=sorted(STUDIES), action="append",
+                        default=[], help="run a study with its defaults")
+    parser.add_argument("--set", nargs="+", default=[], metavar="KEY=VALUE",
+                        help="override parameters of --study studies "
+                             "(values are JSON)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--output", default=RESULTS_DIR)
+
+    args = parser.parse_args()
+
+    specs = []
+
+    for path in args.spec:
+        with open(path) as f:
+            loaded = json.load(f)
+        specs.extend(loaded["studies"] if "studies" in loaded else [loaded])
+
+    overrides = dict(item.split("=", 1) for item in args.set)
+
+    for study in args.study:
+        specs.append({
+            "study": study,
+            **{k: _parse_value(v) for k, v in overrides.items()}
+        })
+
+    if not specs:
+        parser.error("give a spec file or --study")
+
+    def progress(spec, done, total, partial):
+        print(f"{spec['name']}: {done}/{total}", flush=True)
+
+    for document in run_studies(specs, args.workers, progress):
+        path = save_result(document, args.output)
+        print(f"{document['name']}: {document['elapsed']:.1f}s -> {path}")
\ No newline at end of file
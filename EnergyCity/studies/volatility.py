@@ -0,0 +1,125 @@
+# studies/volatility.py
+
+import numpy as np
+
+from simulation.comparison import compare_paired_sweep
+from simulation.result_cache import ResultCache
+from studies.common import bank_for, city_config, make_strategies
+
+
+# Чутливість переваги ADP до волатильності ринку: усі рівні – одне
+# параметричне пакетне парне порівняння на спільних цінах. Рівні з
+# банком сценаріїв і без нього – окремі завдання (антитетичні шляхи
+# лише без банку). Порівняння рівня кешується в ResultCache; пакет
+# рахує лише рівні, яких у кеші немає.
+
+DEFAULTS = {
+    "levels": [0.5, 1.0, 2.0, 3.0],
+    "city": {},
+    "simulations": 500,
+    "seed": 0,
+    "bank": None,
+    "cache": True
+}
+
+SERIAL = False
+
+
+def tasks(spec, weights):
+
+    fresh, banked = [], []
+
+    for level in spec["levels"]:
+
+        config = city_config(spec["city"], volatility=level)
+        bank = bank_for(spec["bank"], config, spec["simulations"])
+
+        (fresh if bank is None else banked).append((level, config, bank))
+
+    return [
+        (group, weights, spec["simulations"], spec["seed"], spec["cache"])
+        for group in (fresh, banked) if group
+    ]
+
+
+def run_task(group, weights, simulations, seed, cache=False):
+
+    adaptive, adp = make_strategies(weights)
+
+    levels, configs, banks = zip(*group)
+
+    # Спільні ціни (CRN) + контрольна змінна; антитетичні шляхи –
+    # лише без банку (банк зберігає ціни, а не шоки)
+    antithetic = all(bank is None for bank in banks)
+
+    sweep = [None] * len(configs)
+
+    # seed=None – свіжа ентропія, такі порівняння не кешуються
+    if cache and seed is not None:
+        store = ResultCache()
+        keys = [
+            store.key("compare_paired", adp, config, simulations, seed, bank,
+                      antithetic=antithetic, control_variate=True)
+            for config, bank in zip(configs, banks)
+        ]
+        sweep = [store.get(key) for key in keys]
+
+    # Рівень рахується з власних цін того самого seed – підмножина
+    # рівнів дає ті самі порівняння, що й повний пакет
+    missing = [k for k, result in enumerate(sweep) if result is None]
+
+    if missing:
+
+        computed = compare_paired_sweep(
+            adaptive,
+            adp,
+            [configs[k] for k in missing],
+            simulations=simulations,
+            antithetic=antithetic,
+            control_variate=True,
+            seed=seed,
+            banks=None if antithetic else [banks[k] for k in missing]
+        )
+
+        for k, result in zip(missing, computed):
+
+            sweep[k] = result
+
+            if cache and seed is not None:
+                store.put(keys[k], result)
+
+    partials = []
+
+    for level, ((energies_adapt, _), (energies_adp, _), report) in zip(
+        levels, sweep
+    ):
+        advantage = report["mean_diff"]
+
+        partials.append({
+            "level": level,
+            "advantage": advantage,
+            "relative": advantage / np.mean(energies_adapt),
+            "std_adapt": float(np.std(energies_adapt)),
+            "std_adp": float(np.std(energies_adp)),
+            # 95% CI for mean difference
+            "ci_low": advantage - report["halfwidth"],
+            "ci_high": advantage + report["halfwidth"],
+            "variance_reduction": report["variance_reduction"]
+        })
+
+    return partials
+
+
+def combine(spec, weights, partials):
+    """
+    Per-level values as lists in spec["levels"] order.
+    """
+    rows = sorted(
+        (p for group in partials for p in group),
+        key=lambda p: spec["levels"].index(p["level"])
+    )
+
+    return {
+        key: [p[key] for p in rows]
+        for key in rows[0]
+    } if rows else {}
\ No newline at end of file
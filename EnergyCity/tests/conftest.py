@@ -0,0 +1,6 @@
+import os
+import sys
+
+
+# Модулі проєкту імпортуються від кореня EnergyCity (from core.city ...)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
\ No newline at end of file
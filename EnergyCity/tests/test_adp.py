@@ -0,0 +1,95 @@
+import random
+
+import numpy as np
+import pytest
+
+from config.city_config import CityConfig
+from core.city import City, CompactCity
+from core.measures import default_measure_table
+from strategies.adp import ADPStrategy
+
+
+PRICES = {"apartments": 5.0, "houses": 6.0, "public": 7.0}
+
+
+def loop_choice(strategy, city, measures, prices, rng):
+
+    # Попередній choose_action: перебір пар (building, measure)
+    possible_actions = [
+        (b, m)
+        for b in city.energy
+        for m in measures
+        if city.adoption[b].get(m.name, 0) < m.max_adoption
+        and city.budget >= m.cost
+    ]
+
+    if not possible_actions:
+        return None
+
+    if rng.random() < strategy.epsilon:
+        return rng.choice(possible_actions)
+
+    best_score = -1e9
+    best_choice = None
+
+    for b, m in possible_actions:
+
+        current = city.adoption[b].get(m.name, 0)
+        energy_before = city.energy[b]
+        energy_after = energy_before * (1 - m.effect * (1 - current))
+
+        price = prices[city.building_type(b)] \
+            if isinstance(city, CompactCity) else prices[b]
+        score = ((energy_before - energy_after) * price
+                 + strategy.gamma * strategy.value(city))
+
+        if score > best_score:
+            best_score = score
+            best_choice = (b, m)
+
+    return best_choice
+
+
+def dict_city(config, table):
+    return City(config.energy, 100), table.measures
+
+
+def compact_city(config, table):
+    return CompactCity(config.group_energy, 100, table,
+                       config.group_types), table
+
+
+@pytest.mark.parametrize("make_city", [dict_city, compact_city])
+@pytest.mark.parametrize("epsilon", [0.0, 0.5])
+def test_vectorized_choice_matches_the_loop(make_city, epsilon):
+
+    table = default_measure_table()
+    city, measures = make_city(CityConfig(), table)
+
+    strategy = ADPStrategy(epsilon=epsilon, rng=random.Random(5))
+    strategy.weights = np.array([-1.0, -0.5, -0.2, 0.3])
+    loop_rng = random.Random(5)
+
+    for _ in range(15):
+
+        city.budget += 400
+
+        action = strategy.choose_action(city, measures, PRICES)
+        expected = loop_choice(strategy, city, table.measures, PRICES,
+                               loop_rng)
+
+        # Той самий захід і той самий порядок розв'язання нічиїх
+        assert action[0] == expected[0]
+        assert action[1].name == expected[1].name
+
+        city.apply_measure(action[1], action[0])
+
+
+def test_no_action_without_budget():
+
+    table = default_measure_table()
+    city, measures = dict_city(CityConfig(), table)
+    city.budget = 0
+
+    assert ADPStrategy(epsilon=0.0).choose_action(city, measures,
+                                                  PRICES) is None
\ No newline at end of file
@@ -0,0 +1,33 @@
+import numpy as np
+
+from benchmarks import suite
+
+
+def report(**medians):
+    return {"results": {name: {"median": value}
+                        for name, value in medians.items()}}
+
+
+def test_compare_flags_changes_beyond_the_threshold():
+
+    rows = suite.compare(
+        report(same=1.0, slow=1.0, fast=1.0, zero=0.0, gone=1.0),
+        report(same=1.05, slow=1.2, fast=0.8, zero=1.0),
+        threshold=0.10
+    )
+
+    statuses = {name: status for name, _, _, _, status in rows}
+
+    # Випадки лише з однієї сторони не порівнюються
+    assert statuses == {"same": "ok", "slow": "slower", "fast": "faster",
+                        "zero": "slower"}
+    assert dict((name, ratio) for name, _, _, ratio, _ in rows)["zero"] \
+        == np.inf
+
+
+def test_next_price_case_repeats_the_same_work():
+
+    first = suite._next_prices()
+    np.random.normal(size=7)
+
+    assert suite._next_prices() == first
\ No newline at end of file
@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+from config.city_config import CityConfig
+from core import city as city_module
+from core.city import City, CompactCity
+from core.measures import default_measure_table
+from strategies.adaptive import AdaptiveStrategy
+
+
+# ---------- CompactCity vs City (user-013) ----------
+def test_compact_city_follows_dict_city():
+
+    config = CityConfig()
+    table = default_measure_table()
+    prices = {"apartments": 5.0, "houses": 6.0, "public": 7.0}
+
+    city = City(config.energy, 100)
+    compact = CompactCity(config.energy, 100, table)
+
+    strategy = AdaptiveStrategy(epsilon=0.0)
+
+    for _ in range(10):
+
+        city.budget = compact.budget = city.budget + 500
+
+        action = strategy.choose_action(city, table.measures, prices)
+        compact_action = strategy.choose_action(compact, table, prices)
+
+        assert action[0] == compact_action[0]
+        assert action[1].name == compact_action[1].name
+
+        city.apply_measure(action[1], action[0])
+        compact.apply_measure(compact_action[1], compact_action[0])
+
+        assert compact.energy == pytest.approx(city.energy, rel=1e-12)
+        assert compact.budget == pytest.approx(city.budget)
+
+
+def test_feasible_scan_matches_the_cost_index(monkeypatch):
+
+    config = CityConfig()
+    table = default_measure_table()
+    rng = np.random.default_rng(0)
+
+    scan = CompactCity(config.energy, 0, table)
+
+    # Без порогу SCAN_CELLS місто веде індекс open_by_cost
+    monkeypatch.setattr(city_module, "SCAN_CELLS", 0)
+    indexed = CompactCity(config.energy, 0, table)
+
+    assert scan.open_by_cost is None and indexed.open_by_cost is not None
+
+    for budget in rng.uniform(0, 40, 60):
+
+        scan.budget = indexed.budget = budget
+        flat = scan.feasible_flat()
+
+        np.testing.assert_array_equal(flat, indexed.feasible_flat())
+
+        if flat.size:
+            b, j = divmod(int(rng.choice(flat)), len(table))
+            scan.apply(b, j)
+            indexed.apply(b, j)
+
+
+def test_group_prices_follow_a_new_prices_dict():
+
+    config = CityConfig()
+    city = CompactCity(config.group_energy, 100, types=config.group_types)
+
+    first = city.group_prices({"apartments": 1.0, "houses": 2.0,
+                               "public": 3.0})
+    second = city.group_prices({"apartments": 4.0, "houses": 5.0,
+                                "public": 6.0})
+
+    np.testing.assert_array_equal(first, [1.0, 2.0, 3.0])
+    np.testing.assert_array_equal(second, [4.0, 5.0, 6.0])
\ No newline at end of file
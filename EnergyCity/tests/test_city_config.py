@@ -0,0 +1,23 @@
+import pytest
+
+from config.city_config import CityConfig, random_district
+
+
+def test_groups_align_with_their_types():
+
+    config = random_district(10, seed=3)
+
+    assert len(config.group_energy) == len(config.group_types)
+    assert sum(config.group_energy.values()) == pytest.approx(
+        sum(config.energy.values())
+    )
+
+
+def test_duplicate_group_names_are_rejected():
+
+    groups = [("north", "apartments", 250, 100),
+              ("north", "houses", 400, 50),
+              ("hall", "public", 3000, 2)]
+
+    with pytest.raises(ValueError, match="north"):
+        CityConfig(groups=groups)
\ No newline at end of file
@@ -0,0 +1,153 @@
+import numpy as np
+import pytest
+
+from config.city_config import CityConfig
+from core.price_model import MultiPriceModel
+from simulation.comparison import (_paired_report, _z, compare_paired,
+                                   compare_strategies, run_monte_carlo_until)
+from simulation.engine import YEARS
+from strategies.adaptive import AdaptiveStrategy
+from strategies.adp import ADPStrategy
+
+
+def price_paths(n):
+    return MultiPriceModel().sample_paths(
+        n, YEARS, np.random.default_rng(0), antithetic=True
+    )
+
+
+@pytest.mark.parametrize("n", [7, 9])
+def test_antithetic_units_pair_mirrored_paths(n):
+
+    paths = price_paths(n)
+    half = (n + 1) // 2
+
+    # Дзеркальний шлях i + half дає протилежну різницю – пари гасяться
+    diff = np.zeros(n)
+    diff[:half] = np.random.default_rng(1).normal(size=half)
+    diff[half:] = -diff[:n - half]
+
+    report = _paired_report(
+        diff, np.zeros(n), paths, MultiPriceModel(), antithetic=True,
+        control_variate=False, confidence=0.95
+    )
+
+    # Пари дають нуль; лишається лише внесок непарного середнього шляху
+    assert report["mean_diff"] == pytest.approx(diff[half - 1] / half)
+
+
+@pytest.mark.parametrize("n", [7, 8])
+def test_antithetic_mean_is_the_plain_mean_of_pairs(n):
+
+    paths = price_paths(n)
+    energies_a = np.random.default_rng(1).normal(size=n)
+    energies_b = np.zeros(n)
+
+    report = _paired_report(
+        energies_a, energies_b, paths, MultiPriceModel(), antithetic=True,
+        control_variate=False, confidence=0.95
+    )
+
+    half = (n + 1) // 2
+    pairs = n - half
+    units = np.concatenate([
+        0.5 * (energies_a[:pairs] + energies_a[half:]),
+        energies_a[pairs:half]
+    ])
+
+    assert report["mean_diff"] == pytest.approx(units.mean())
+    assert np.isfinite(report["halfwidth"])
+
+
+@pytest.mark.parametrize("n", [31, 32])
+def test_compare_paired_antithetic_is_consistent(n):
+
+    config = CityConfig()
+
+    a, b, report = compare_paired(
+        AdaptiveStrategy(epsilon=0.1), ADPStrategy(epsilon=0.1), config,
+        simulations=n, antithetic=True, control_variate=True, seed=3
+    )
+
+    plain = float(np.mean(a[0] - b[0]))
+
+    assert report["simulations"] == n
+    assert abs(report["mean_diff"] - plain) <= 3 * report["halfwidth"]
+
+
+# ---------- SEQUENTIAL STOPPING (user-011) ----------
+def test_monte_carlo_until_stops_at_the_target():
+
+    strategy = AdaptiveStrategy(epsilon=0.1)
+
+    _, _, loose = run_monte_carlo_until(
+        strategy, CityConfig(), target_halfwidth=np.inf, max_simulations=90,
+        batch_size=30, seed=0, vectorized=True
+    )
+    energies, budgets, tight = run_monte_carlo_until(
+        strategy, CityConfig(), target_halfwidth=0.0, max_simulations=90,
+        batch_size=30, seed=0, vectorized=True
+    )
+
+    assert loose["simulations"] == 30
+    assert loose["converged"]
+
+    # Недосяжна ціль – увесь бюджет шляхів, без збіжності
+    assert tight["simulations"] == len(energies) == len(budgets) == 90
+    assert not tight["converged"]
+    assert tight["halfwidth"] == pytest.approx(
+        _z(0.95) * energies.std(ddof=1) / np.sqrt(90)
+    )
+
+
+def test_monte_carlo_until_is_engine_independent():
+
+    runs = [
+        run_monte_carlo_until(
+            AdaptiveStrategy(epsilon=0.1), CityConfig(), 0.0,
+            max_simulations=40, batch_size=20, seed=3, vectorized=vectorized
+        )
+        for vectorized in (False, True)
+    ]
+
+    np.testing.assert_array_equal(runs[0][0], runs[1][0])
+    assert runs[0][2] == runs[1][2]
+
+
+def test_compare_strategies_reports_every_batch():
+
+    adp = ADPStrategy()
+    adp.weights = np.array([-1.0, -0.5, -0.2, 0.3])
+
+    batches = []
+
+    (energy_a, _), (energy_b, _), report = compare_strategies(
+        AdaptiveStrategy(epsilon=0.1), adp, CityConfig(), 0.0,
+        max_simulations=60, batch_size=20, seed=1, vectorized=True,
+        on_batch=lambda *args: batches.append(args)
+    )
+
+    assert [done for done, _, _ in batches] == [20, 40, 60]
+    assert report["simulations"] == 60
+    assert report["halfwidth"] == batches[-1][2]
+    assert report["mean_diff"] == pytest.approx(
+        energy_a.stats.mean - energy_b.stats.mean
+    )
+
+
+def test_compare_strategies_stops_when_on_batch_raises():
+
+    batches = []
+
+    def cancel(done, total, halfwidth):
+        batches.append(done)
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        compare_strategies(
+            AdaptiveStrategy(), AdaptiveStrategy(), CityConfig(), 0.0,
+            max_simulations=60, batch_size=20, seed=1, vectorized=True,
+            on_batch=cancel
+        )
+
+    assert batches == [20]
\ No newline at end of file
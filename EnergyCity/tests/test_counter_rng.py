@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+from core.counter_rng import CounterRNG, philox4x32
+
+
+# Known-answer vectors of Philox4x32-10 (Random123, kat_vectors)
+KAT = [
+    ([0x00000000] * 4, [0x00000000] * 2,
+     [0x6627e8d5, 0xe169c58d, 0xbc57ac4c, 0x9b00dbd8]),
+    ([0xffffffff] * 4, [0xffffffff] * 2,
+     [0x408f276d, 0x41c83b0e, 0xa20bc7c6, 0x6d5451fd]),
+    ([0x243f6a88, 0x85a308d3, 0x13198a2e, 0x03707344],
+     [0xa4093822, 0x299f31d0],
+     [0xd16cfe09, 0x94fdcceb, 0x5001e420, 0x24126ea1]),
+]
+
+
+@pytest.mark.parametrize("counter, key, expected", KAT)
+def test_philox_known_answers(counter, key, expected):
+    assert philox4x32(counter, key).tolist() == expected
+
+
+def test_philox_is_vectorized_over_counters():
+
+    counters = np.array([c for c, _, _ in KAT[:2]])
+    key = KAT[0][1]
+
+    out = philox4x32(counters, key)
+
+    assert out[0].tolist() == KAT[0][2]
+    assert out[1].tolist() == philox4x32(counters[1], key).tolist()
+
+
+def test_path_draws_do_not_depend_on_the_batch():
+
+    rng = CounterRNG(42)
+
+    whole = rng.price_shocks(np.arange(10), 5)
+    part = rng.price_shocks(np.arange(6, 9), 5)
+
+    np.testing.assert_array_equal(part, whole[6:9])
+
+
+def test_seed_forms_are_equivalent():
+
+    paths = np.arange(4)
+
+    by_int = CounterRNG(3).explore_draws(paths, 5)
+    by_sequence = CounterRNG(np.random.SeedSequence(3)).explore_draws(paths, 5)
+    by_rng = CounterRNG(CounterRNG(3)).explore_draws(paths, 5)
+
+    np.testing.assert_array_equal(by_int, by_sequence)
+    np.testing.assert_array_equal(by_int, by_rng)
+
+
+def test_uniforms_lie_in_the_unit_interval():
+
+    u = CounterRNG(1).explore_draws(np.arange(1000), 10)
+
+    assert u.min() >= 0.0
+    assert u.max() < 1.0
+
+
+def test_contiguous_draws_are_cached_read_only():
+
+    first = CounterRNG(11).price_shocks(np.arange(5, 25), 4)
+
+    assert CounterRNG(11).price_shocks(np.arange(5, 25), 4) is first
+    assert not first.flags.writeable
+
+    # Розкидані шляхи не кешуються, але дають ті самі значення
+    scattered = CounterRNG(11).price_shocks(np.array([7, 5, 9]), 4)
+    np.testing.assert_array_equal(scattered, first[[2, 0, 4]])
\ No newline at end of file
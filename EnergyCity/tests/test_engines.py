@@ -0,0 +1,120 @@
+import numpy as np
+import pytest
+
+from config.city_config import CityConfig
+from simulation.batch_engine import run_batch_simulation
+from simulation.engine import run_single_simulation
+from simulation.monte_carlo import run_monte_carlo
+from strategies.adaptive import AdaptiveStrategy
+from strategies.adp import ADPStrategy
+
+
+SEED = 7
+PATHS = 24
+
+
+def adaptive():
+    return AdaptiveStrategy(epsilon=0.1)
+
+
+def adp():
+    strategy = ADPStrategy(epsilon=0.1)
+    strategy.weights = np.array([-1.0, -0.5, -0.2, 0.3])
+    return strategy
+
+
+@pytest.fixture(params=[adaptive, adp], ids=["adaptive", "adp"])
+def strategy(request):
+    return request.param()
+
+
+# ---------- SCALAR vs BATCH (user-001) ----------
+def test_batch_matches_scalar_paths(strategy):
+
+    config = CityConfig()
+
+    energies, budgets = run_batch_simulation(strategy, config, PATHS, seed=SEED)
+
+    scalar = np.array([
+        run_single_simulation(strategy, config, seed=SEED, path=k)
+        for k in range(PATHS)
+    ])
+
+    np.testing.assert_array_equal(energies, scalar[:, 0])
+    np.testing.assert_array_equal(budgets, scalar[:, 1])
+
+
+def test_batch_first_path_offsets_the_stream(strategy):
+
+    config = CityConfig()
+
+    energies, _ = run_batch_simulation(strategy, config, PATHS, seed=SEED)
+    tail, _ = run_batch_simulation(
+        strategy, config, PATHS - 10, seed=SEED, first_path=10
+    )
+
+    np.testing.assert_array_equal(tail, energies[10:])
+
+
+def test_monte_carlo_matches_batch(strategy):
+
+    config = CityConfig()
+
+    energies, budgets = run_batch_simulation(strategy, config, PATHS, seed=SEED)
+    mc_energies, mc_budgets = run_monte_carlo(
+        strategy, config, PATHS, seed=SEED
+    )
+
+    np.testing.assert_array_equal(mc_energies, energies)
+    np.testing.assert_array_equal(mc_budgets, budgets)
+
+
+@pytest.mark.parametrize("epsilon", [0.0, 0.5])
+def test_engines_keep_the_strategy_settings(epsilon):
+
+    config = CityConfig()
+
+    adp_strategy = ADPStrategy(gamma=0.5, epsilon=epsilon)
+    adp_strategy.weights = adp().weights
+
+    for strategy in (AdaptiveStrategy(epsilon=epsilon), adp_strategy):
+
+        energies, budgets = run_batch_simulation(
+            strategy, config, PATHS, seed=SEED
+        )
+        mc_energies, mc_budgets = run_monte_carlo(
+            strategy, config, PATHS, seed=SEED
+        )
+        scalar = np.array([
+            run_single_simulation(strategy, config, seed=SEED, path=k)
+            for k in range(PATHS)
+        ])
+
+        np.testing.assert_array_equal(energies, scalar[:, 0])
+        np.testing.assert_array_equal(mc_energies, energies)
+        np.testing.assert_array_equal(mc_budgets, budgets)
+
+
+# ---------- WORKERS (user-003) ----------
+def test_monte_carlo_does_not_depend_on_workers(strategy):
+
+    config = CityConfig()
+
+    serial = run_monte_carlo(strategy, config, PATHS, workers=1, seed=SEED)
+
+    # Шарди й глобальний стан np.random не впливають на результат
+    np.random.seed(123)
+    sharded = run_monte_carlo(strategy, config, PATHS, workers=3, seed=SEED)
+
+    np.testing.assert_array_equal(sharded[0], serial[0])
+    np.testing.assert_array_equal(sharded[1], serial[1])
+
+
+def test_monte_carlo_seeds_give_different_streams(strategy):
+
+    config = CityConfig()
+
+    energies, _ = run_monte_carlo(strategy, config, PATHS, seed=SEED)
+    other, _ = run_monte_carlo(strategy, config, PATHS, seed=SEED + 1)
+
+    assert not np.array_equal(energies, other)
\ No newline at end of file
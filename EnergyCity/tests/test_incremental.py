@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from config.city_config import random_district
+from core.city import CompactCity
+from core.measures import default_measure_table
+from simulation.engine import run_single_simulation
+from strategies.adaptive import AdaptiveStrategy
+from strategies.incremental import ROISelector
+
+
+@pytest.mark.parametrize("groups", [3, 40, 150])
+def test_selector_matches_full_scan_on_simulations(groups):
+
+    config = random_district(groups, seed=groups)
+
+    for path in range(3):
+
+        incremental = run_single_simulation(
+            AdaptiveStrategy(epsilon=0.0, incremental=True),
+            config, seed=11, path=path
+        )
+        full_scan = run_single_simulation(
+            AdaptiveStrategy(epsilon=0.0, incremental=False),
+            config, seed=11, path=path
+        )
+
+        assert incremental == full_scan
+
+
+def test_selector_best_equals_argmax_of_roi():
+
+    config = random_district(60, seed=5)
+    table = default_measure_table()
+    rng = np.random.default_rng(0)
+
+    city = CompactCity(config.group_energy, 100, table, config.group_types)
+    selector = ROISelector(city)
+
+    for _ in range(40):
+
+        city.budget += 400
+        prices = dict(zip(
+            ("apartments", "houses", "public"), rng.uniform(3, 9, 3)
+        ))
+
+        flat = city.feasible_flat()
+        rows, cols = np.divmod(flat, len(table))
+
+        # Той самий порядок операцій, що й повний перебір AdaptiveStrategy
+        effective_effect = (
+            table.effect[cols] * (1 - city.adoption_values[rows, cols])
+        )
+        roi = (
+            city.energy_values[rows] * effective_effect *
+            city.group_prices(prices)[rows] / table.cost[cols]
+        )
+
+        best = selector.best(prices)
+
+        assert best == int(flat[np.argmax(roi)])
+
+        b, j = divmod(best, len(table))
+        city.apply_measure(table[j], city.buildings[b])
\ No newline at end of file
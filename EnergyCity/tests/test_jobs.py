@@ -0,0 +1,103 @@
+import threading
+import time
+
+from app.jobs import CANCELLED, DONE, QUEUED, Job, JobExecutor
+
+
+def wait_finished(jobs, timeout=10):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if all(j.status in (DONE, CANCELLED) for j in jobs):
+            return
+        time.sleep(0.01)
+    raise AssertionError([j.status for j in jobs])
+
+
+def test_shutdown_cancels_jobs_that_never_started():
+
+    executor = JobExecutor(max_workers=1)
+    release = threading.Event()
+
+    running = executor.submit("u", "k", "blocker", lambda job: release.wait())
+    queued = [executor.submit("u", "k", str(i), lambda job: 1) for i in range(3)]
+
+    while running.status == QUEUED:
+        time.sleep(0.01)
+
+    executor.shutdown()
+    release.set()
+
+    assert all(job.status == CANCELLED for job in queued)
+    assert all(job.finished is not None for job in queued)
+
+
+def test_exclusive_job_runs_alone():
+
+    executor = JobExecutor(max_workers=3)
+
+    active = []
+    overlaps = []
+    lock = threading.Lock()
+
+    def work(job, name):
+        with lock:
+            active.append(name)
+            overlaps.append(list(active))
+        time.sleep(0.05)
+        with lock:
+            active.remove(name)
+        return name
+
+    jobs = [executor.submit("u", "k", "a", work, "a"),
+            executor.submit("u", "k", "b", work, "b"),
+            executor.submit("u", "k", "x", work, "x", exclusive=True),
+            executor.submit("u", "k", "c", work, "c")]
+
+    wait_finished(jobs)
+    executor.shutdown()
+
+    assert [j.result for j in jobs] == ["a", "b", "x", "c"]
+    assert ["x"] in overlaps
+    assert all(len(seen) == 1 for seen in overlaps if "x" in seen)
+
+
+def test_cancelled_job_waiting_for_its_turn_never_starts():
+
+    executor = JobExecutor(max_workers=2)
+    release = threading.Event()
+
+    blocker = executor.submit("u", "k", "blocker", lambda job: release.wait())
+    exclusive = executor.submit("u", "k", "x", lambda job: 1, exclusive=True)
+
+    while blocker.status == QUEUED:
+        time.sleep(0.01)
+
+    exclusive.cancel()
+    wait_finished([exclusive])
+    release.set()
+    wait_finished([blocker])
+    executor.shutdown()
+
+    assert exclusive.status == CANCELLED
+    assert exclusive.started is None
+
+
+def test_eviction_tolerates_a_job_finishing_concurrently():
+
+    executor = JobExecutor(max_workers=1, keep=1)
+
+    # Завдання, що саме завершується в іншому потоці: status уже
+    # виставлено, finished – ще ні
+    old = Job("u", "k", "old")
+    old.finish(DONE)
+    racing = Job("u", "k", "racing")
+    racing.status = DONE
+    executor._jobs.update({old.id: old, racing.id: racing})
+
+    job = executor.submit("u", "k", "new", lambda job: 1)
+    wait_finished([job])
+    executor.shutdown()
+
+    # Найстаріше завершене витіснено, а finished=None не ламає сортування
+    assert executor.get(old.id) is None
+    assert executor.get(racing.id) is racing
\ No newline at end of file
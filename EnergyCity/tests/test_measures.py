@@ -0,0 +1,63 @@
+import json
+
+import numpy as np
+
+from core.measures import (Measure, MeasureTable, default_measure_table,
+                           default_measures, load_measure_table,
+                           load_measures)
+
+
+def write_catalogs(tmp_path, measures):
+
+    csv_path = tmp_path / "measures.csv"
+    csv_path.write_text(
+        "name,cost,effect,max_adoption\n" + "".join(
+            f"{m.name},{m.cost},{m.effect},{m.max_adoption}\n"
+            for m in measures
+        ),
+        encoding="utf-8"
+    )
+
+    json_path = tmp_path / "measures.JSON"
+    json_path.write_text(
+        json.dumps([m.__dict__ for m in measures]), encoding="utf-8"
+    )
+
+    return str(csv_path), str(json_path)
+
+
+def test_csv_and_json_catalogs_load_the_same_measures(tmp_path):
+
+    measures = default_measures() + [Measure("Теплонасос", 40, 0.25, 0.5)]
+    csv_path, json_path = write_catalogs(tmp_path, measures)
+
+    from_csv = load_measures(csv_path)
+
+    assert from_csv == measures
+    assert load_measures(json_path) == measures
+    assert all(isinstance(m.cost, float) for m in from_csv)
+
+
+def test_loaded_table_indexes_by_cost(tmp_path):
+
+    csv_path, _ = write_catalogs(tmp_path, default_measures())
+
+    table = load_measure_table(csv_path)
+
+    assert table.names == [m.name for m in default_measures()]
+    # Найдешевші спершу; рівно ті, що вкладаються в бюджет
+    assert [table[j].name for j in table.affordable(15)] == [
+        "SmartHome", "SmartMeter", "LED"
+    ]
+    np.testing.assert_array_equal(table.cost[table.by_cost],
+                                  np.sort(table.cost))
+    assert table.n_affordable(5) == 0
+
+
+def test_default_table_is_built_once():
+
+    table = default_measure_table()
+
+    assert default_measure_table() is table
+    assert isinstance(table, MeasureTable)
+    assert table.names == [m.name for m in default_measures()]
\ No newline at end of file
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from config.city_config import CityConfig
+from simulation.batch_engine import run_batch_simulation, run_parameter_batch
+from strategies.adaptive import AdaptiveStrategy
+from strategies.adp import ADPStrategy
+
+
+SEED = 7
+PATHS = 24
+
+
+def adaptive():
+    return AdaptiveStrategy(epsilon=0.1)
+
+
+def adp():
+    strategy = ADPStrategy(epsilon=0.1)
+    strategy.weights = np.array([-1.0, -0.5, -0.2, 0.3])
+    return strategy
+
+
+@pytest.fixture(params=[adaptive, adp], ids=["adaptive", "adp"])
+def strategy(request):
+    return request.param()
+
+
+# ---------- PARAMETER BATCH (user-025) ----------
+def test_parameter_batch_matches_per_config_runs(strategy):
+
+    configs = [
+        CityConfig(volatility=0.5),
+        CityConfig(apartments=20000, houses=8000, volatility=1.0),
+        CityConfig(public=600, volatility=2.0)
+    ]
+
+    results = run_parameter_batch(strategy, configs, PATHS, seed=SEED)
+
+    assert len(results) == len(configs)
+
+    for config, (energies, budgets) in zip(configs, results):
+
+        single_energies, single_budgets = run_batch_simulation(
+            strategy, config, PATHS, seed=SEED
+        )
+
+        np.testing.assert_array_equal(energies, single_energies)
+        np.testing.assert_array_equal(budgets, single_budgets)
+
+
+def test_parameter_batch_rejects_mixed_groups():
+
+    configs = [
+        CityConfig(),
+        CityConfig(groups=[("a", "apartments", 250, 10),
+                           ("h", "houses", 400, 10)])
+    ]
+
+    with pytest.raises(ValueError):
+        run_parameter_batch(adaptive(), configs, 4, seed=SEED)
\ No newline at end of file
@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+from analytics.pareto import (
+    dominance_fraction, dominated_mask, pareto_frontier, strategy_frontiers
+)
+
+
+def brute_frontier(energies, budgets):
+    n = len(energies)
+    return {
+        i for i in range(n)
+        if not any(
+            energies[k] <= energies[i] and budgets[k] >= budgets[i] and
+            (energies[k] < energies[i] or budgets[k] > budgets[i])
+            for k in range(n)
+        )
+    }
+
+
+def brute_dominated(energies_a, budgets_a, energies_b, budgets_b):
+    return np.array([
+        any(eb <= ea and bb >= ba for eb, bb in zip(energies_b, budgets_b))
+        for ea, ba in zip(energies_a, budgets_a)
+    ])
+
+
+def samples(seed, n, grid=False):
+    rng = np.random.default_rng(seed)
+    if grid:
+        # Дрібна сітка дає багато рівних енергій, бюджетів і дублікатів
+        return rng.integers(0, 8, n).astype(float), rng.integers(0, 8, n).astype(float)
+    return rng.normal(size=n), rng.normal(size=n)
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("grid", [False, True])
+def test_frontier_matches_brute_force(seed, grid):
+
+    energies, budgets = samples(seed, 200, grid)
+
+    idx = pareto_frontier(energies, budgets)
+
+    assert set(idx.tolist()) == brute_frontier(energies, budgets)
+    assert np.all(np.diff(energies[idx]) >= 0)
+
+
+def test_frontier_of_empty_input():
+    assert pareto_frontier([], []).size == 0
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("grid", [False, True])
+def test_dominance_matches_brute_force(seed, grid):
+
+    energies_a, budgets_a = samples(seed, 150, grid)
+    energies_b, budgets_b = samples(seed + 100, 120, grid)
+
+    expected = brute_dominated(energies_a, budgets_a, energies_b, budgets_b)
+
+    np.testing.assert_array_equal(
+        dominated_mask(energies_a, budgets_a, energies_b, budgets_b), expected
+    )
+    assert dominance_fraction(
+        energies_a, budgets_a, energies_b, budgets_b
+    ) == pytest.approx(expected.mean())
+
+
+def test_combined_frontier_matches_brute_force():
+
+    results = {name: samples(seed, 80, True) for seed, name in enumerate("abc")}
+
+    _, (energies, budgets, names) = strategy_frontiers(results)
+
+    all_energies = np.concatenate([e for e, _ in results.values()])
+    all_budgets = np.concatenate([b for _, b in results.values()])
+
+    expected = sorted(
+        (all_energies[i], all_budgets[i])
+        for i in brute_frontier(all_energies, all_budgets)
+    )
+
+    assert sorted(zip(energies, budgets)) == expected
+    assert set(names) <= set(results)
\ No newline at end of file
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from core.price_model import MultiPriceModel
+
+
+def stepped_paths(volatility, shocks, monkeypatch):
+
+    # next_price, якому np.random.normal віддає ті самі шоки по черзі
+    stream = iter(shocks.reshape(-1))
+    monkeypatch.setattr(np.random, "normal", lambda: next(stream))
+
+    paths = []
+
+    for _ in range(shocks.shape[0]):
+        model = MultiPriceModel(volatility_scale=volatility)
+        paths.append([list(model.next_price().values())
+                      for _ in range(shocks.shape[1])])
+
+    return np.array(paths)
+
+
+@pytest.mark.parametrize("volatility", [1.0, 2.5])
+def test_sample_paths_follow_next_price(volatility, monkeypatch):
+
+    model = MultiPriceModel(volatility_scale=volatility)
+
+    paths = model.sample_paths(6, 5, np.random.default_rng(3))
+    shocks = np.random.default_rng(3).standard_normal((6, 5, 4))
+
+    assert paths.shape == (6, 5, 3)
+    # Модель не змінюється – стартові ціни ті самі
+    assert model.prices == MultiPriceModel().prices
+
+    np.testing.assert_allclose(
+        paths, stepped_paths(volatility, shocks, monkeypatch), rtol=1e-12
+    )
+
+
+def test_sample_paths_are_reproducible_for_a_seed():
+
+    model = MultiPriceModel()
+
+    first = model.sample_paths(50, 10, np.random.default_rng(7))
+    again = model.sample_paths(50, 10, np.random.default_rng(7))
+    other = model.sample_paths(50, 10, np.random.default_rng(8))
+
+    np.testing.assert_array_equal(first, again)
+    assert not np.array_equal(first, other)
\ No newline at end of file
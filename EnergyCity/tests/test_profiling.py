@@ -0,0 +1,53 @@
+import threading
+
+from config.city_config import CityConfig
+from core import profiling
+from simulation.batch_engine import run_batch_simulation
+from strategies.adaptive import AdaptiveStrategy
+
+
+def profiled_calls():
+
+    with profiling.profiling() as prof:
+        run_batch_simulation(AdaptiveStrategy(epsilon=0.1), CityConfig(), 50,
+                             seed=1)
+
+    return prof.calls
+
+
+def test_profiler_is_reset_after_the_block():
+
+    with profiling.profiling() as prof:
+        assert profiling.active() is prof
+
+    assert profiling.active() is None
+
+
+def test_concurrent_threads_do_not_share_the_profiler():
+
+    expected = profiled_calls()
+
+    start = threading.Barrier(4)
+    results = []
+
+    def profiled():
+        start.wait()
+        results.append(profiled_calls())
+
+    def plain():
+        start.wait()
+        for _ in range(5):
+            run_batch_simulation(AdaptiveStrategy(epsilon=0.1), CityConfig(),
+                                 50, seed=2)
+        results.append(profiling.active())
+
+    threads = [threading.Thread(target=f)
+               for f in (profiled, profiled, plain, plain)]
+
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert results.count(None) == 2
+    assert [r for r in results if r is not None] == [expected, expected]
\ No newline at end of file
@@ -0,0 +1,180 @@
+import os
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from config.city_config import CityConfig
+from simulation.monte_carlo import run_monte_carlo
+from simulation.result_cache import EvaluationService, ResultCache, cached_call
+from strategies.adaptive import AdaptiveStrategy
+from strategies.adp import ADPStrategy
+
+
+def test_seeded_calls_are_cached(tmp_path):
+
+    cache = ResultCache(str(tmp_path))
+    service = EvaluationService()
+    strategy = AdaptiveStrategy(epsilon=0.1)
+
+    first = cached_call(run_monte_carlo, strategy, CityConfig(), 20, seed=4,
+                        cache=cache, service=service)
+    again = cached_call(run_monte_carlo, strategy, CityConfig(), 20, seed=4,
+                        cache=ResultCache(str(tmp_path)),
+                        service=EvaluationService())
+
+    np.testing.assert_array_equal(first[0], again[0])
+    assert len(list(tmp_path.iterdir())) == 1
+
+
+def test_key_depends_on_strategy_settings(tmp_path):
+
+    cache = ResultCache(str(tmp_path))
+    config = CityConfig()
+
+    def key(strategy):
+        return cache.key("run_monte_carlo", strategy, config, 20, seed=4)
+
+    assert key(AdaptiveStrategy(epsilon=0.1)) != key(
+        AdaptiveStrategy(epsilon=0.5))
+    assert key(ADPStrategy(gamma=0.95)) != key(ADPStrategy(gamma=0.5))
+    assert key(ADPStrategy(epsilon=0.1)) != key(ADPStrategy(epsilon=0.0))
+
+
+def test_entropy_seeded_calls_bypass_the_cache(tmp_path):
+
+    cache = ResultCache(str(tmp_path))
+    service = EvaluationService()
+
+    cached_call(run_monte_carlo, AdaptiveStrategy(epsilon=0.1), CityConfig(),
+                20, seed=None, cache=cache, service=service)
+
+    assert list(tmp_path.iterdir()) == []
+    assert service.stats()["computed"] == 0
+
+class Cancelled(Exception):
+    pass
+
+
+def gated_run(gate, calls):
+    """
+    Streaming-like fn: reports two batches, waiting on gate between them.
+    """
+    def run_gated(strategy, config, simulations, workers, seed, bank,
+                  on_batch=None):
+        calls.append(seed)
+        on_batch(simulations // 2, simulations, ("half",))
+        gate.wait(10)
+        on_batch(simulations, simulations, ("all",))
+        return simulations
+
+    return run_gated
+
+
+def test_waiter_mirrors_leader_progress_and_can_cancel(tmp_path):
+
+    cache = ResultCache(str(tmp_path))
+    service = EvaluationService()
+    gate = threading.Event()
+    calls = []
+    fn = gated_run(gate, calls)
+
+    leader_seen = []
+    waiter_seen = []
+
+    def leader():
+        cached_call(fn, AdaptiveStrategy(), CityConfig(), 10, seed=1,
+                    cache=cache, service=service,
+                    on_batch=lambda *a: leader_seen.append(a))
+
+    def cancelling(done, total, partial):
+        waiter_seen.append((done, total, partial))
+        if partial is not None:
+            raise Cancelled()
+
+    thread = threading.Thread(target=leader)
+    thread.start()
+
+    while not leader_seen:
+        time.sleep(0.01)
+
+    with pytest.raises(Cancelled):
+        cached_call(fn, AdaptiveStrategy(), CityConfig(), 10, seed=1,
+                    cache=cache, service=service, on_batch=cancelling)
+
+    # Очікувач бачив прогрес лідера, а його скасування лідера не зупинило
+    assert waiter_seen[-1] == (5, 10, ("half",))
+
+    gate.set()
+    thread.join()
+
+    assert leader_seen[-1] == (10, 10, ("all",))
+    assert calls == [1]
+    assert service.stats()["computed"] == 1
+
+
+def test_memory_entries_are_per_cache_directory(tmp_path):
+
+    service = EvaluationService()
+    calls = []
+    gate = threading.Event()
+    gate.set()
+
+    for name in ("a", "b", "a"):
+        cached_call(gated_run(gate, calls), AdaptiveStrategy(), CityConfig(),
+                    10, seed=1, cache=ResultCache(str(tmp_path / name)),
+                    service=service, on_batch=lambda *a: None)
+
+    assert len(calls) == 2
+    assert service.stats()["hits"] == 1
+
+
+# ---------- MAINTENANCE ----------
+def test_eviction_scans_once_and_drops_oldest_in_a_batch(tmp_path):
+
+    value = np.zeros(100)
+    cache = ResultCache(str(tmp_path), max_bytes=10 ** 9)
+
+    scans = []
+    entries = cache._entries
+    cache._entries = lambda: scans.append(1) or entries()
+
+    for i in range(20):
+        cache.put(f"k{i}", value)
+        # Рівні mtime не дають порядку LRU – задаємо явно
+        os.utime(cache._path(f"k{i}"), (i, i))
+
+    assert len(scans) == 1
+    assert len(cache) == 20
+
+    size = os.path.getsize(cache._path("k0"))
+    cache.max_bytes = 20 * size
+
+    cache.put("k20", value)
+
+    # Понад max_bytes – чистимо пачкою до LOW_WATER, найстаріші першими
+    assert len(scans) == 2
+    assert len(cache) == 16
+    assert cache.get("k4") is None and cache.get("k5") is not None
+    assert sum(f.stat().st_size for f in tmp_path.iterdir()) <= 16 * size
+
+
+def test_invalidate_drops_only_stale_adp_entries(tmp_path):
+
+    cache = ResultCache(str(tmp_path))
+    config = CityConfig()
+
+    old, new = ADPStrategy(), ADPStrategy()
+    old.weights = np.ones(4)
+    new.weights = np.full(4, 2.0)
+
+    keys = [cache.key("run_monte_carlo", s, config, 10, seed=1)
+            for s in (old, new, AdaptiveStrategy())]
+
+    for key in keys:
+        cache.put(key, np.zeros(3))
+
+    assert cache.invalidate(new.weights) == 1
+    assert [cache.get(k) is None for k in keys] == [True, False, False]
+    assert len(cache) == 2
\ No newline at end of file
@@ -0,0 +1,67 @@
+import json
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from studies import runner
+
+
+def test_resolve_fills_the_study_defaults():
+
+    spec = runner.resolve({"study": "volatility", "simulations": 50})
+
+    assert spec["name"] == "volatility"
+    assert spec["weights"] == runner.WEIGHTS_PATH
+    assert spec["simulations"] == 50
+    assert spec["levels"] == runner.STUDIES["volatility"].DEFAULTS["levels"]
+
+
+def test_resolve_rejects_unknown_studies_and_parameters():
+
+    with pytest.raises(ValueError):
+        runner.resolve({"study": "nope"})
+
+    with pytest.raises(ValueError):
+        runner.resolve({"study": "volatility", "simulation": 50})
+
+
+def test_save_result_round_trips_through_load_result(tmp_path):
+
+    document = {"name": "run", "result": {"values": [1.0, 2.0]}}
+
+    path = runner.save_result(document, str(tmp_path))
+
+    assert runner.load_result("run", str(tmp_path)) == document
+    assert runner.load_result("missing", str(tmp_path)) is None
+    # Тимчасовий файл атомарного запису не лишається
+    assert [p.name for p in tmp_path.iterdir()] == ["run.json"]
+
+    with open(path) as f:
+        assert json.load(f)["name"] == "run"
+
+
+def sleeping_study(pause):
+
+    return SimpleNamespace(
+        DEFAULTS={"tasks": 1},
+        SERIAL=False,
+        tasks=lambda spec, weights: [(pause,)] * spec["tasks"],
+        run_task=lambda seconds: time.sleep(seconds),
+        combine=lambda spec, weights, partials: None
+    )
+
+
+def test_elapsed_starts_with_the_study_own_tasks(monkeypatch):
+
+    monkeypatch.setitem(runner.STUDIES, "slow", sleeping_study(0.1))
+    monkeypatch.setitem(runner.STUDIES, "quick", sleeping_study(0.02))
+
+    slow, quick = runner.run_studies([
+        {"study": "slow", "tasks": 3, "weights": [0.0] * 4},
+        {"study": "quick", "weights": [0.0] * 4}
+    ])
+
+    # quick стартує після трьох завдань slow, але їх не рахує
+    assert slow["elapsed"] >= 0.3
+    assert quick["elapsed"] < 0.15
\ No newline at end of file
@@ -0,0 +1,62 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from config.city_config import CityConfig
+from core.counter_rng import CounterRNG
+from core.price_model import MultiPriceModel
+from simulation.batch_engine import run_batch_simulation
+from simulation.engine import YEARS
+from simulation.scenario_bank import build_bank, open_bank
+from strategies.adaptive import AdaptiveStrategy
+
+
+PATHS = 20
+
+
+def test_bank_rows_are_the_counter_paths(tmp_path):
+
+    assert open_bank(str(tmp_path), 2.0) is None
+
+    # Кілька чанків – ті самі рядки, що й одним викликом
+    bank = build_bank(str(tmp_path), 2.0, PATHS, seed=3, chunk=7)
+
+    expected = MultiPriceModel(volatility_scale=2.0).sample_paths(
+        PATHS, YEARS, CounterRNG(3)
+    )
+
+    np.testing.assert_array_equal(bank.prices, expected)
+    assert not bank.prices.flags.writeable
+    assert open_bank(str(tmp_path), 2.0).digest == bank.digest
+
+
+def test_price_paths_check_volatility_and_range(tmp_path):
+
+    bank = build_bank(str(tmp_path), 1.0, PATHS, seed=3)
+
+    np.testing.assert_array_equal(
+        bank.price_paths(CityConfig(), 5, 9), bank.prices[5:9]
+    )
+
+    with pytest.raises(ValueError):
+        bank.price_paths(CityConfig(volatility=2.0), 0, 5)
+
+    with pytest.raises(ValueError):
+        bank.price_paths(CityConfig(), PATHS - 2, PATHS + 1)
+
+
+def test_engines_with_a_bank_match_the_seed_stream(tmp_path):
+
+    bank = pickle.loads(pickle.dumps(
+        build_bank(str(tmp_path), 1.0, PATHS, seed=3)
+    ))
+
+    strategy = AdaptiveStrategy(epsilon=0.1)
+
+    from_bank = run_batch_simulation(strategy, CityConfig(), PATHS, seed=3,
+                                     bank=bank)
+    from_seed = run_batch_simulation(strategy, CityConfig(), PATHS, seed=3)
+
+    np.testing.assert_array_equal(from_bank[0], from_seed[0])
+    np.testing.assert_array_equal(from_bank[1], from_seed[1])
\ No newline at end of file
@@ -0,0 +1,103 @@
+import numpy as np
+import pytest
+
+from analytics.streaming import (
+    FixedHistogram, QuantileSketch, RunningStats, StreamingSummary
+)
+from config.city_config import CityConfig
+from simulation.monte_carlo import run_monte_carlo_streaming
+from strategies.adaptive import AdaptiveStrategy
+
+
+def test_running_stats_merge_matches_numpy():
+
+    values = np.random.default_rng(0).normal(size=1000)
+
+    stats = RunningStats()
+    for chunk in np.array_split(values, 7):
+        stats.merge(RunningStats().update(chunk))
+
+    assert stats.count == values.size
+    assert stats.mean == pytest.approx(values.mean())
+    assert stats.variance(ddof=1) == pytest.approx(values.var(ddof=1))
+    assert (stats.min, stats.max) == (values.min(), values.max())
+
+
+def test_histogram_counts_every_value():
+
+    values = np.random.default_rng(1).uniform(-1, 11, 5000)
+
+    hist = FixedHistogram(0, 10, 50).update(values)
+
+    assert hist.counts.sum() + hist.underflow + hist.overflow == values.size
+    np.testing.assert_array_equal(
+        hist.counts, np.histogram(values, bins=hist.edges)[0]
+    )
+
+
+def test_sketch_rank_error_is_small():
+
+    values = np.random.default_rng(2).normal(size=50000)
+
+    sketch = QuantileSketch(k=256)
+    for chunk in np.array_split(values, 10):
+        sketch.merge(QuantileSketch(k=256).update(chunk))
+
+    # Похибка KLL – за рангом, а не за значенням
+    for q in (0.05, 0.5, 0.95):
+        rank = np.mean(values <= sketch.quantile(q))
+        assert rank == pytest.approx(q, abs=0.01)
+
+
+def test_summary_merge_keeps_both_histograms():
+
+    a = StreamingSummary((0, 10), bins=10).update([1, 2])
+    b = StreamingSummary((0, 10), bins=10).update([3])
+
+    a.merge(b)
+
+    assert a.stats.count == 3
+    assert a.histogram.counts.sum() == 3
+
+
+def test_summary_merge_with_one_sided_histogram():
+
+    # Порожня сторона без гістограми нічого не втрачає
+    with_hist = StreamingSummary((0, 10), bins=10).update([1, 2])
+    with_hist.merge(StreamingSummary())
+    assert with_hist.histogram.counts.sum() == 2
+
+    # Порожнє зведення переймає гістограму іншого
+    empty = StreamingSummary().merge(
+        StreamingSummary((0, 10), bins=10).update([3])
+    )
+    assert empty.histogram.counts.sum() == 1
+
+    with pytest.raises(ValueError):
+        StreamingSummary((0, 10)).update([1]).merge(
+            StreamingSummary().update([2])
+        )
+
+    with pytest.raises(ValueError):
+        StreamingSummary().update([1]).merge(
+            StreamingSummary((0, 10)).update([2])
+        )
+
+
+# ---------- ENGINE INDEPENDENCE ----------
+def test_streaming_is_engine_independent():
+
+    config = CityConfig()
+
+    vectorized, _ = run_monte_carlo_streaming(
+        AdaptiveStrategy(epsilon=0.1), config, 24, batch_size=10, seed=7, vectorized=True
+    )
+    scalar, _ = run_monte_carlo_streaming(
+        AdaptiveStrategy(epsilon=0.1), config, 24, batch_size=7, seed=7, vectorized=False
+    )
+
+    assert vectorized.stats.count == scalar.stats.count == 24
+    assert vectorized.stats.mean == pytest.approx(scalar.stats.mean, rel=1e-12)
+    np.testing.assert_array_equal(
+        vectorized.histogram.counts, scalar.histogram.counts
+    )
\ No newline at end of file
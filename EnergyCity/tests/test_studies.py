@@ -0,0 +1,90 @@
+import numpy as np
+
+from studies import generalization
+from studies import volatility as volatility_study
+
+
+def heatmap(**options):
+
+    spec = dict(generalization.DEFAULTS, grid_size=3, simulations=20,
+                **options)
+    weights = np.zeros(4)
+
+    partials = [
+        generalization.run_task(*task)
+        for task in generalization.tasks(spec, weights)
+    ]
+
+    return generalization.combine(spec, weights, partials)["advantage"]
+
+
+def test_generalization_cache_returns_the_simulated_values(tmp_path,
+                                                           monkeypatch):
+
+    monkeypatch.chdir(tmp_path)
+
+    plain = heatmap(cache=False)
+    assert not (tmp_path / ".mc_cache").exists()
+
+    filled = heatmap(cache=True)
+    entries = sorted((tmp_path / ".mc_cache").iterdir())
+
+    # 9 клітинок × 2 стратегії
+    assert len(entries) == 18
+
+    # Повторний прогін нічого не симулює
+    def no_simulation(strategy, configs, *args, **kwargs):
+        assert not configs
+        return []
+
+    monkeypatch.setattr(generalization, "run_parameter_batch", no_simulation)
+
+    cached = heatmap(cache=True)
+
+    np.testing.assert_array_equal(filled, plain)
+    np.testing.assert_array_equal(cached, plain)
+    assert sorted((tmp_path / ".mc_cache").iterdir()) == entries
+
+
+def test_generalization_without_seed_is_not_cached(tmp_path, monkeypatch):
+
+    monkeypatch.chdir(tmp_path)
+
+    heatmap(cache=True, seed=None)
+
+    assert not any((tmp_path / ".mc_cache").glob("*.pkl"))
+
+def volatility(levels, **options):
+
+    spec = dict(volatility_study.DEFAULTS, levels=levels, simulations=21,
+                **options)
+    weights = np.zeros(4)
+
+    partials = [
+        volatility_study.run_task(*task)
+        for task in volatility_study.tasks(spec, weights)
+    ]
+
+    return volatility_study.combine(spec, weights, partials)
+
+
+def test_volatility_cache_returns_the_compared_values(tmp_path, monkeypatch):
+
+    monkeypatch.chdir(tmp_path)
+
+    plain = volatility([0.5, 1.0, 2.0], cache=False)
+
+    # Рівень 1.0 у кеші – пакет досчитує лише решту
+    volatility([1.0], cache=True)
+    filled = volatility([0.5, 1.0, 2.0], cache=True)
+
+    def no_comparison(*args, **kwargs):
+        raise AssertionError("all levels should come from the cache")
+
+    monkeypatch.setattr(volatility_study, "compare_paired_sweep",
+                        no_comparison)
+
+    cached = volatility([0.5, 1.0, 2.0], cache=True)
+
+    assert filled == plain
+    assert cached == plain
\ No newline at end of file
@@ -0,0 +1,106 @@
+import numpy as np
+import pytest
+
+from strategies.adp import (FEATURE_SCALE, LEGACY_FEATURE_SCALE, ADPStrategy,
+                            load_weights, save_weights, solve_lstd)
+from train_adp import _save_weights, train, train_lstd
+
+
+def test_td_training_is_stable_and_engine_independent(tmp_path, monkeypatch):
+
+    monkeypatch.chdir(tmp_path)
+
+    scalar, history = train(episodes=600, envs=1, weights_path="w1.npy",
+                            verbose=False)
+    batched, _ = train(episodes=600, envs=64, weights_path="w64.npy",
+                       verbose=False)
+
+    assert np.all(np.isfinite(scalar))
+    assert history.shape == (600,)
+    # Сума TD-кроків батчу ≈ ті самі кроки послідовно
+    np.testing.assert_allclose(batched, scalar, rtol=0.05)
+    np.testing.assert_array_equal(load_weights("w1.npy"), scalar)
+
+    # train() нічого не малює – у теці лише ваги
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["w1.npy", "w64.npy"]
+
+
+def test_training_without_weights_path_writes_nothing(tmp_path, monkeypatch):
+
+    monkeypatch.chdir(tmp_path)
+
+    train(episodes=50, envs=10, weights_path=None, verbose=False)
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_diverged_weights_are_not_saved(tmp_path):
+
+    path = tmp_path / "weights.npy"
+
+    with pytest.raises(FloatingPointError):
+        _save_weights(str(path), np.array([1.0, np.nan, 0.0, 0.0]))
+
+    assert not path.exists()
+
+
+def test_weights_file_keeps_the_feature_scale(tmp_path):
+
+    path = str(tmp_path / "weights.npy")
+    weights = np.array([1.0, -2.0, 3.0, 4.0])
+
+    save_weights(path, weights)
+
+    np.testing.assert_array_equal(np.load(path)[1], FEATURE_SCALE)
+    np.testing.assert_array_equal(load_weights(path), weights)
+
+    # Файл з іншим масштабом ознак не завантажується мовчки
+    np.save(path, np.stack([weights, FEATURE_SCALE * 2]))
+
+    with pytest.raises(ValueError):
+        load_weights(path)
+
+
+def test_legacy_weights_keep_their_value_estimates(tmp_path):
+
+    path = str(tmp_path / "legacy.npy")
+    legacy = np.array([-3.0, 5.0, 0.5, 2.0])
+    np.save(path, legacy)
+
+    adp = ADPStrategy()
+    adp.weights = load_weights(path)
+
+    state = np.array([40000.0, 5000.0, 300.0, 250.0])
+    np.testing.assert_allclose(adp.weights @ (state / FEATURE_SCALE),
+                               legacy @ (state / LEGACY_FEATURE_SCALE))
+
+
+@pytest.mark.parametrize("columns", [4, 6])
+def test_lstd_recovers_consistent_weights(columns):
+
+    rng = np.random.default_rng(0)
+    true = rng.normal(size=columns)
+
+    features = rng.normal(size=(200, columns))
+    next_features = rng.normal(size=(200, columns))
+    # Нагороди, для яких true – точний розв'язок рівняння Беллмана
+    rewards = features @ true - 0.9 * next_features @ true
+
+    np.testing.assert_allclose(
+        solve_lstd(features, rewards, next_features, 0.9), true, atol=1e-10
+    )
+
+    ridged = solve_lstd(features, rewards, next_features, 0.9, ridge=1e3)
+    assert np.linalg.norm(ridged) < np.linalg.norm(true)
+
+
+def test_lstd_training_saves_finite_weights(tmp_path, capsys):
+
+    path = str(tmp_path / "lstd.npy")
+
+    weights = train_lstd(episodes=20, rounds=2, weights_path=path)
+
+    assert weights.shape == (4,)
+    assert np.all(np.isfinite(weights))
+    np.testing.assert_array_equal(load_weights(path), weights)
+    assert "Round 1" in capsys.readouterr().out
\ No newline at end of file
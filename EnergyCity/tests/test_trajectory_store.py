@@ -0,0 +1,84 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from config.city_config import CityConfig
+from simulation.batch_engine import run_batch_simulation
+from simulation.engine import YEARS, run_single_simulation
+from simulation.monte_carlo import run_monte_carlo
+from simulation.trajectory_store import TrajectoryStore, create_store
+from strategies.adaptive import AdaptiveStrategy
+
+
+SEED = 4
+PATHS = 6
+
+
+def test_scalar_store_matches_the_history(tmp_path):
+
+    config = CityConfig()
+    strategy = AdaptiveStrategy(epsilon=0.1)
+    store = create_store(str(tmp_path), strategy, config, PATHS, YEARS,
+                         seed=SEED, first_path=10)
+
+    history = []
+    run_single_simulation(strategy, config, seed=SEED, path=12,
+                          history=history, store=store)
+
+    stored = TrajectoryStore.open(str(tmp_path)).path(12)
+
+    assert [h["action"] for h in stored] == [h["action"] for h in history]
+
+    for year, expected in zip(stored, history):
+        assert year["energy"] == pytest.approx(expected["energy"])
+        assert year["budget"] == expected["budget"]
+        assert year["prices"] == pytest.approx(expected["prices"])
+
+    # Рядки, яких ніхто не писав, лишаються порожніми
+    assert np.all(store["action_group"][0] == -1)
+    assert np.all(np.isnan(store["budget"][0]))
+
+
+def test_engines_fill_the_same_store(tmp_path):
+
+    config = CityConfig()
+    strategy = AdaptiveStrategy(epsilon=0.1)
+
+    stores = {
+        name: create_store(str(tmp_path / name), strategy, config, PATHS,
+                           YEARS, seed=SEED)
+        for name in ("scalar", "batch", "sharded")
+    }
+
+    for k in range(PATHS):
+        run_single_simulation(strategy, config, seed=SEED, path=k,
+                              store=stores["scalar"])
+
+    run_batch_simulation(strategy, config, PATHS, seed=SEED,
+                         store=stores["batch"])
+    run_monte_carlo(strategy, config, PATHS, workers=2, seed=SEED,
+                    store=stores["sharded"])
+
+    for store in stores.values():
+        store.flush()
+
+    for name in ("batch", "sharded"):
+        reopened = TrajectoryStore.open(str(tmp_path / name))
+        for column in ("budget", "prices", "action_group", "action_measure"):
+            np.testing.assert_array_equal(reopened[column],
+                                          stores["scalar"][column])
+        np.testing.assert_allclose(reopened["energy"],
+                                   stores["scalar"]["energy"], rtol=1e-12)
+
+
+def test_store_pickles_as_its_directory(tmp_path):
+
+    store = create_store(str(tmp_path), AdaptiveStrategy(), CityConfig(),
+                         PATHS, YEARS, seed=SEED)
+
+    copy = pickle.loads(pickle.dumps(store))
+
+    assert copy.directory == store.directory
+    assert copy.meta == store.meta
+    assert len(copy) == PATHS
\ No newline at end of file
@@ -1,34 +1,101 @@
 # train_adp.py
 
+import argparse
+import time
+
 import numpy as np
 import matplotlib.pyplot as plt
 
-from strategies.adp import ADPStrategy
+from strategies.adp import (ADPStrategy, TransitionCollector, save_weights,
+                            solve_lstd)
 from simulation.engine import run_single_simulation
+from simulation.batch_engine import run_batch_simulation
 from config.city_config import CityConfig
+from simulation.scenario_bank import open_bank
 
 
-def train(episodes=5000):
-
-    strategy = ADPStrategy(alpha=0.00005, gamma=0.95, epsilon=0.2)
+def train(episodes=5000, envs=1, config=None,
+          weights_path="adp_weights.npy", bank=None, verbose=True):
+    """
+    envs    – кількість середовищ, що крокують синхронно; > 1 вмикає
+              векторизоване навчання: TD-кроки всіх переходів року
+              сумуються (alpha на перехід той самий, що й при envs=1)
+    config  – профіль міста (за замовчуванням 40000/5000/300)
+    weights_path – куди зберегти ваги; None – не зберігати
+    bank    – ScenarioBank: епізод k бере ціни з рядка k банку
+    verbose – друкувати прогрес і пропускну здатність
 
-    rewards_history = []
+    Повертає (ваги, бюджети епізодів) – криву навчання малює
+    plot_convergence.
+    """
 
-    for ep in range(episodes):
+    strategy = ADPStrategy(alpha=0.00005, gamma=0.95, epsilon=0.2)
 
+    if config is None:
         config = CityConfig(
             apartments=40000,
             houses=5000,
             public=300
         )
 
-        energy, budget = run_single_simulation(strategy, config, training=True)
+    rewards_history = []
+
+    start = time.time()
+
+    if envs > 1:
+
+        for ep in range(0, episodes, envs):
+
+            n = min(envs, episodes - ep)
+
+            energy, budget = run_batch_simulation(
+                strategy, config, n, training=True,
+                first_path=ep, bank=bank
+            )
+
+            rewards_history.extend(budget)
+
+            if verbose and ep // 500 != (ep + n) // 500:
+                print(f"Episode {ep + n}")
+
+    else:
+
+        for ep in range(episodes):
+
+            energy, budget = run_single_simulation(
+                strategy, config, training=True, path=ep, bank=bank
+            )
 
-        # Використовуємо бюджет як проксі для policy value
-        rewards_history.append(budget)
+            # Використовуємо бюджет як проксі для policy value
+            rewards_history.append(budget)
 
-        if ep % 500 == 0:
-            print(f"Episode {ep}")
+            if verbose and ep % 500 == 0:
+                print(f"Episode {ep}")
+
+    elapsed = time.time() - start
+
+    if verbose:
+        print(f"Throughput: {episodes / elapsed:.1f} episodes/sec")
+
+    # ---------------------------
+    # ЗБЕРЕЖЕННЯ ВАГ
+    # ---------------------------
+
+    if weights_path is not None:
+        _save_weights(weights_path, strategy.weights)
+
+    if verbose:
+        print("Training complete.")
+
+    return strategy.weights, np.array(rewards_history)
+
+
+def plot_convergence(rewards_history, path="adp_training_convergence.png",
+                     show=True):
+    """
+    Smoothed learning curve of train(): saved to path and, with
+    show=True, displayed.
+    """
 
     # ---------------------------
     # ЗГЛАДЖЕНА КРИВА НАВЧАННЯ
@@ -47,7 +114,7 @@ def train(episodes=5000):
     # Переведемо в мільйони для красивішої осі
     moving_avg = moving_avg / 1_000_000
 
-    plt.figure(figsize=(8, 5))
+    fig = plt.figure(figsize=(8, 5))
     plt.plot(moving_avg)
     plt.title("Convergence of ADP Policy")
     plt.xlabel("Training Episode")
@@ -55,17 +122,129 @@ def train(episodes=5000):
     plt.grid(alpha=0.3)
 
     plt.tight_layout()
-    plt.savefig("adp_training_convergence.png")
-    plt.show()
+    plt.savefig(path)
 
-    # ---------------------------
-    # ЗБЕРЕЖЕННЯ ВАГ
-    # ---------------------------
+    if show:
+        plt.show()
+
+    plt.close(fig)
 
-    np.save("adp_weights.npy", strategy.weights)
+
+def train_lstd(episodes=1000, rounds=3, config=None,
+               weights_path="adp_weights.npy", bank=None):
+    """
+    Пакетне навчання: збираємо переходи з rollout-ів
+    run_single_simulation і розв'язуємо LSTD в закритій формі.
+    Кожен наступний раунд збирає дані вже з новими вагами
+    (fitted value iteration).
+    bank – ScenarioBank: кожен раунд проходить ті самі шляхи 0..episodes-1.
+    """
+
+    if config is None:
+        config = CityConfig(
+            apartments=40000,
+            houses=5000,
+            public=300
+        )
+
+    weights = np.zeros(4)
+
+    start = time.time()
+
+    for r in range(rounds):
+
+        collector = TransitionCollector(gamma=0.95, epsilon=0.2)
+        collector.weights = weights.copy()
+
+        for ep in range(episodes):
+            run_single_simulation(
+                collector, config, training=True, path=ep, bank=bank
+            )
+
+        features, rewards, next_features = zip(*collector.transitions)
+
+        weights = solve_lstd(
+            np.array(features),
+            np.array(rewards),
+            np.array(next_features),
+            collector.gamma
+        )
+
+        print(f"Round {r}: {len(rewards)} transitions, weights {weights}")
+
+    elapsed = time.time() - start
+
+    print(f"Throughput: {episodes * rounds / elapsed:.1f} episodes/sec")
+
+    _save_weights(weights_path, weights)
 
     print("Training complete.")
 
+    return weights
+
+
+def _save_weights(weights_path, weights):
+
+    # Розбіжне навчання не перезаписує робочі ваги NaN / inf
+    if not np.all(np.isfinite(weights)):
+        raise FloatingPointError(
+            f"ADP training diverged (weights {weights}); "
+            f"{weights_path} was not written"
+        )
+
+    save_weights(weights_path, weights)
+
 
 if __name__ == "__main__":
-    train()
\ No newline at end of file
+
+    parser = argparse.ArgumentParser(description="Train ADP policy")
+    parser.add_argument("--method", choices=["td", "lstd"], default="td")
+    parser.add_argument("--episodes", type=int, default=5000)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--envs", type=int, default=1)
+    parser.add_argument("--apartments", type=int, default=40000)
+    parser.add_argument("--houses", type=int, default=5000)
+    parser.add_argument("--public", type=int, default=300)
+    parser.add_argument("--volatility", type=float, default=1.0)
+    parser.add_argument("--output", default="adp_weights.npy")
+    parser.add_argument("--no-plot", action="store_true")
+    parser.add_argument("--bank", default=None,
+                        help="scenario bank directory "
+                             "(python -m simulation.scenario_bank)")
+
+    args = parser.parse_args()
+
+    config = CityConfig(
+        apartments=args.apartments,
+        houses=args.houses,
+        public=args.public,
+        volatility=args.volatility
+    )
+
+    bank = None
+
+    if args.bank is not None:
+        bank = open_bank(args.bank, args.volatility)
+        if bank is None:
+            parser.error(f"no bank for volatility {args.volatility:g} "
+                         f"in {args.bank}")
+
+    if args.method == "lstd":
+        train_lstd(
+            episodes=args.episodes,
+            rounds=args.rounds,
+            config=config,
+            weights_path=args.output,
+            bank=bank
+        )
+    else:
+        _, history = train(
+            episodes=args.episodes,
+            envs=args.envs,
+            config=config,
+            weights_path=args.output,
+            bank=bank
+        )
+
+        if not args.no_plot:
+            plot_convergence(history)
\ No newline at end of file
@@ -1,14 +1,28 @@
 # web_app.py
 
+import json
+import os
+import uuid
+
 import streamlit as st
 import numpy as np
 import matplotlib.pyplot as plt
 from scipy import stats
 
+from app.jobs import (CANCELLED, DONE, FAILED, FINISHED, QUEUED,
+                      JobExecutor)
 from strategies.adaptive import AdaptiveStrategy
-from strategies.adp import ADPStrategy
-from simulation.monte_carlo import run_monte_carlo
+from strategies.adp import ADPStrategy, load_weights
+from simulation.monte_carlo import run_monte_carlo_streaming
+from simulation.result_cache import (ResultCache, cached_call,
+                                     evaluation_service)
+from simulation.scenario_bank import BANK_DIR, open_bank
+from studies.generalization import grid_ranges
+from studies.runner import (STUDIES, WEIGHTS_PATH, load_result, run_study,
+                            save_result)
+from simulation.comparison import compare_strategies
 from config.city_config import CityConfig
+from core.profiling import PHASES
 
 
 st.set_page_config(page_title="Energy City Optimization", layout="wide")
@@ -53,53 +67,247 @@ simulations = st.sidebar.slider(
     step=100
 )
 
+workers = st.sidebar.number_input(
+    "Worker Processes",
+    min_value=1,
+    max_value=os.cpu_count() or 1,
+    value=1,
+    step=1
+)
+
+# 0 – фіксована кількість симуляцій; > 0 – зупинка за точністю,
+# слайдер симуляцій стає максимальним бюджетом шляхів
+target_halfwidth = st.sidebar.number_input(
+    "Target CI Half-Width (energy, 0 = off)",
+    min_value=0.0,
+    value=0.0,
+    step=5000.0
+)
+
+# Кореневий seed лічильникових потоків: шлях k будь-якого прогону
+# відтворюється окремо як (seed, k)
+seed = st.sidebar.number_input(
+    "Random Seed",
+    min_value=0,
+    value=0,
+    step=1
+)
+
+# Банк сценаріїв (python -m simulation.scenario_bank): якщо для рівня
+# волатильності він побудований, усі дослідження беруть з нього ті самі
+# шляхи цін замість свіжих
+bank_root = st.sidebar.text_input("Scenario Bank Directory", BANK_DIR)
+
+
+def bank_for(config, n_paths):
+    bank = open_bank(bank_root, config.volatility)
+    if bank is None or len(bank) < n_paths:
+        return None
+    return bank
+
+
 config = CityConfig(
     apartments=apartments,
     houses=houses,
     public=public
 )
+
+bank = bank_for(config, simulations)
+
+if bank is not None:
+    st.sidebar.caption(f"Scenario bank: {len(bank)} paths")
+else:
+    st.sidebar.caption("Scenario bank: not built, fresh price paths")
+
+# Кеш результатів Monte Carlo між перезапусками скрипта
+cache = ResultCache()
+
+try:
+    cache.invalidate(load_weights("adp_weights.npy"))
+except (OSError, ValueError):
+    pass
 # =========================
-# RUN
+# JOBS
 # =========================
+# Прогони йдуть фоновими завданнями: один виконавець на сервер, черга
+# спільна для всіх сесій, а сторінка лише показує прогрес і готові
+# результати, які переживають перезапуски скрипта
 
-if st.button("Run Simulation"):
+@st.cache_resource
+def job_executor():
+    return JobExecutor(max_workers=2)
 
-    st.write("Running simulations...")
 
-    # ===== Adaptive =====
-    adaptive = AdaptiveStrategy(epsilon=0.1)
+executor = job_executor()
 
-    energies_adapt, budgets_adapt = run_monte_carlo(
-        adaptive,
-        config,
-        simulations=simulations
+# Завдання сесії – за її власним ідентифікатором
+owner = st.session_state.setdefault("job_owner", uuid.uuid4().hex)
+
+st.sidebar.header("Jobs")
+
+for job in executor.jobs(owner)[:5]:
+    st.sidebar.caption(
+        f"{job.kind} · {job.label} · {job.status} "
+        f"{job.progress:.0%} · {job.elapsed:.0f}s"
     )
 
-    # ===== ADP =====
+# Однакові прогони різних кнопок і користувачів рахуються один раз
+shared = evaluation_service().stats()
+
+st.sidebar.caption(
+    f"Shared Monte Carlo results: {shared['computed']} computed, "
+    f"{shared['coalesced']} joined in flight, {shared['hits']} from memory"
+)
+
+
+def job_status(kind, draw_partial=None):
+    """
+    Shows the newest job of kind: progress, partial result and a Cancel
+    button while it runs (polled without rerunning the page), the error
+    if it failed. Returns the newest finished job of kind or None.
+    """
+    job = executor.latest(owner, kind)
+
+    if job is not None and job.status not in FINISHED:
+
+        @st.fragment(run_every=1.0)
+        def poll():
+
+            # Готово – перемальовуємо всю сторінку з результатом
+            if job.status in FINISHED:
+                st.rerun()
+
+            if job.status == QUEUED:
+                st.progress(0.0, text=f"{job.label}: queued "
+                                      f"({executor.queued_ahead(job)} ahead)")
+            else:
+                st.progress(job.progress, text=f"{job.label}: "
+                                               f"{job.done}/{job.total}, "
+                                               f"{job.elapsed:.0f}s")
+
+                if draw_partial is not None and job.partial is not None:
+                    draw_partial(job.partial)
+
+            if st.button("Cancel", key=f"cancel-{job.id}"):
+                job.cancel()
+
+        poll()
+
+    elif job is not None and job.status == FAILED:
+        st.error(f"{job.label} failed")
+        with st.expander("Traceback"):
+            st.code(job.error)
+
+    elif job is not None and job.status == CANCELLED:
+        st.warning(f"{job.label} cancelled at {job.done}/{job.total}")
+
+    return executor.latest(owner, kind, (DONE,))
+
+
+# =========================
+# RUN
+# =========================
+
+def simulation_job(job, adaptive, adp, config, simulations, target_halfwidth,
+                   workers, seed, bank):
+
+    if target_halfwidth > 0:
+
+        # ===== Adaptive vs ADP до досягнення точності =====
+        return compare_strategies(
+            adaptive,
+            adp,
+            config,
+            target_halfwidth,
+            max_simulations=simulations,
+            workers=workers,
+            seed=seed,
+            bank=bank,
+            on_batch=lambda done, total, halfwidth: job.report(
+                done, total, f"CI half-width {halfwidth:.1f}"
+            )
+        )
+
+    # Потокові акумулятори замість повних масивів результатів;
+    # ~10 батчів на стратегію – крок прогресу і скасування
+    batch_size = max(100, simulations // 10)
+
+    results = []
+
+    for k, (name, strategy) in enumerate(
+        [("Adaptive", adaptive), ("ADP", adp)]
+    ):
+
+        def on_batch(done, total, summaries):
+
+            # summaries=None – чекаємо на такий самий прогін іншої вкладки
+            if summaries is None:
+                partial = f"{name} waiting for an identical run"
+            else:
+                partial = (f"{name} running mean energy "
+                           f"{summaries[0].stats.mean:.1f}")
+
+            job.report(k * total + done, 2 * total, partial)
+
+        results.append(cached_call(
+            run_monte_carlo_streaming,
+            strategy,
+            config,
+            simulations=simulations,
+            workers=workers,
+            seed=seed,
+            cache=cache,
+            bank=bank,
+            batch_size=batch_size,
+            on_batch=on_batch
+        ))
+
+    return results[0], results[1], None
+
+
+if st.button("Run Simulation"):
+
+    adaptive = AdaptiveStrategy(epsilon=0.1)
     adp = ADPStrategy()
 
     try:
-        adp.weights = np.load("adp_weights.npy")
-    except:
+        adp.weights = load_weights("adp_weights.npy")
+    except OSError:
         st.warning("ADP weights not found. Using untrained ADP.")
+    except ValueError as error:
+        st.warning(f"{error}. Using untrained ADP.")
 
-    energies_adp, budgets_adp = run_monte_carlo(
-        adp,
-        config,
-        simulations=simulations
+    executor.submit(
+        owner, "simulation", f"{simulations} paths", simulation_job,
+        adaptive, adp, config, simulations, target_halfwidth, workers, seed,
+        bank
     )
 
+simulation = job_status("simulation", st.caption)
+
+if simulation is not None:
+
+    (energy_adapt, budget_adapt), (energy_adp, budget_adp), report = \
+        simulation.result
+
+    if report is not None:
+        st.info(
+            f"Used {report['simulations']} of {simulation.total} paths per strategy; "
+            f"CI half-width {report['halfwidth']:.1f} "
+            f"({'target reached' if report['converged'] else 'target not reached'})"
+        )
+
     st.header("📊 Strategy Comparison")
 
     col1, col2 = st.columns(2)
 
     with col1:
-        st.metric("Adaptive Mean Energy", round(np.mean(energies_adapt), 3))
-        st.metric("Adaptive Std", round(np.std(energies_adapt), 3))
+        st.metric("Adaptive Mean Energy", round(energy_adapt.stats.mean, 3))
+        st.metric("Adaptive Std", round(energy_adapt.stats.std(), 3))
 
     with col2:
-        st.metric("ADP Mean Energy", round(np.mean(energies_adp), 3))
-        st.metric("ADP Std", round(np.std(energies_adp), 3))
+        st.metric("ADP Mean Energy", round(energy_adp.stats.mean, 3))
+        st.metric("ADP Std", round(energy_adp.stats.std(), 3))
 
     # =========================
     # HISTOGRAM
@@ -109,8 +317,20 @@ if st.button("Run Simulation"):
 
     fig, ax = plt.subplots()
 
-    ax.hist(energies_adapt, bins=30, alpha=0.6, label="Adaptive")
-    ax.hist(energies_adp, bins=30, alpha=0.6, label="ADP")
+    # Обидві гістограми мають однакові біни – показуємо спільний
+    # зайнятий діапазон
+    hist_adapt = energy_adapt.histogram
+    hist_adp = energy_adp.histogram
+
+    first = min(hist_adapt.nonempty()[0], hist_adp.nonempty()[0])
+    last = max(hist_adapt.nonempty()[1], hist_adp.nonempty()[1])
+
+    edges = hist_adapt.edges[first:last + 1]
+
+    ax.stairs(hist_adapt.counts[first:last], edges,
+              fill=True, alpha=0.6, label="Adaptive")
+    ax.stairs(hist_adp.counts[first:last], edges,
+              fill=True, alpha=0.6, label="ADP")
 
     ax.set_title("Final Energy Distribution")
     ax.legend()
@@ -121,8 +341,8 @@ if st.button("Run Simulation"):
     # RISK ADJUSTED
     # =========================
 
-    sharpe_adapt = np.mean(budgets_adapt) / np.std(budgets_adapt)
-    sharpe_adp = np.mean(budgets_adp) / np.std(budgets_adp)
+    sharpe_adapt = budget_adapt.stats.mean / budget_adapt.stats.std()
+    sharpe_adp = budget_adp.stats.mean / budget_adp.stats.std()
 
     st.header("📈 Risk-Adjusted Performance")
 
@@ -140,16 +360,20 @@ if st.button("Run Simulation"):
 
     st.header("🔬 Statistical Significance")
 
-    t_stat, p_value = stats.ttest_ind(
-        energies_adapt,
-        energies_adp,
+    t_stat, p_value = stats.ttest_ind_from_stats(
+        energy_adapt.stats.mean,
+        energy_adapt.stats.std(ddof=1),
+        energy_adapt.stats.count,
+        energy_adp.stats.mean,
+        energy_adp.stats.std(ddof=1),
+        energy_adp.stats.count,
         equal_var=False
     )
 
-    mean_diff = np.mean(energies_adapt) - np.mean(energies_adp)
+    mean_diff = energy_adapt.stats.mean - energy_adp.stats.mean
 
     pooled_std = np.sqrt(
-        (np.std(energies_adapt)**2 + np.std(energies_adp)**2) / 2
+        (energy_adapt.stats.std()**2 + energy_adp.stats.std()**2) / 2
     )
 
     cohens_d = mean_diff / pooled_std
@@ -157,9 +381,9 @@ if st.button("Run Simulation"):
     # 95% CI
     ci_low, ci_high = stats.t.interval(
         0.95,
-        len(energies_adapt) - 1,
+        energy_adapt.stats.count - 1,
         loc=mean_diff,
-        scale=stats.sem(energies_adapt)
+        scale=energy_adapt.stats.sem()
     )
 
     col5, col6, col7 = st.columns(3)
@@ -176,61 +400,73 @@ if st.button("Run Simulation"):
     st.write("95% Confidence Interval of Mean Difference:",
              (round(ci_low, 3), round(ci_high, 3)))
 
-st.header("🌍 Multi-City Generalization Study")
+# =====================================
+# STUDIES
+# =====================================
+# Дослідження рахує studies.runner (python -m studies.runner spec.json);
+# дашборд лише читає і малює results/<name>.json, тож результат
+# прогону з командного рядка видно тут без перерахунку. Кнопки
+# ставлять той самий runner для однієї специфікації у чергу завдань.
 
-if st.button("Run Generalization Study"):
+def study_job(job, spec, workers, fold=None):
+    """
+    Runs one study spec and saves results/<name>.json. fold turns each
+    finished task into the partial result shown while the job runs.
+    """
+    def on_result(spec, done, total, partial):
+        job.report(done, total, partial if fold is None else fold(partial))
 
-    st.write("Running multi-city evaluation...")
+    document = run_study(spec, workers, on_result)
 
-    apartments_range = np.linspace(20000, 80000, 6).astype(int)
-    houses_range = np.linspace(2000, 12000, 6).astype(int)
+    return save_result(document)
 
-    heatmap = np.zeros((len(houses_range), len(apartments_range)))
 
-    # Завантажуємо ADP
-    adp = ADPStrategy()
-    try:
-        adp.weights = np.load("adp_weights.npy")
-    except:
+def submit_study(label, spec, fold=None):
+
+    if not os.path.exists(WEIGHTS_PATH):
         st.error("Train ADP first!")
-        st.stop()
+        return
 
-    for i, h in enumerate(houses_range):
-        for j, a in enumerate(apartments_range):
+    # Заміри часу (SERIAL-дослідження) не ділять CPU з іншими завданнями
+    executor.submit(owner, spec["study"], label, study_job, spec, workers,
+                    fold, exclusive=STUDIES[spec["study"]].SERIAL)
 
-            config = CityConfig(
-                apartments=a,
-                houses=h,
-                public=300
-            )
 
-            adaptive = AdaptiveStrategy(epsilon=0.1)
+def saved_caption(document):
 
-            energies_adapt, _ = run_monte_carlo(
-                adaptive,
-                config,
-                simulations=300
-            )
+    params = ", ".join(
+        f"{k}={v}" for k, v in document["spec"].items()
+        if k not in ("study", "name")
+    )
+
+    st.caption(f"{document['name']}.json · {document['created']} · "
+               f"{document['elapsed']:.1f}s · {params}")
 
-            energies_adp, _ = run_monte_carlo(
-                adp,
-                config,
-                simulations=300
-            )
 
-            heatmap[i, j] = np.mean(energies_adapt) - np.mean(energies_adp)
+st.header("🌍 Multi-City Generalization Study")
+
+grid_size = st.select_slider(
+    "Grid Resolution",
+    options=[6, 10, 15, 20, 25],
+    value=6
+)
 
-    # ===== Heatmap Plot =====
+
+# ===== Heatmap Plot =====
+def draw_heatmap(apartments_range, houses_range, heatmap):
 
     fig, ax = plt.subplots()
 
     c = ax.imshow(heatmap, origin="lower", aspect="auto")
 
-    ax.set_xticks(range(len(apartments_range)))
-    ax.set_xticklabels(apartments_range)
+    # Не більше ~8 підписів на вісь для дрібних сіток
+    step = max(1, len(apartments_range) // 8)
+
+    ax.set_xticks(range(0, len(apartments_range), step))
+    ax.set_xticklabels(apartments_range[::step])
 
-    ax.set_yticks(range(len(houses_range)))
-    ax.set_yticklabels(houses_range)
+    ax.set_yticks(range(0, len(houses_range), step))
+    ax.set_yticklabels(houses_range[::step])
 
     ax.set_xlabel("Apartments")
     ax.set_ylabel("Houses")
@@ -239,80 +475,80 @@ if st.button("Run Generalization Study"):
     fig.colorbar(c)
 
     st.pyplot(fig)
+    plt.close(fig)
 
-# =====================================
-# VOLATILITY SENSITIVITY (RESEARCH MODE)
-# =====================================
 
-st.header("📉 Volatility Sensitivity Analysis (Research Mode)")
+if st.button("Run Generalization Study"):
 
-if st.button("Run Volatility Study"):
+    apartments_range, houses_range = grid_ranges(grid_size)
 
-    st.write("Running robustness evaluation...")
+    # NaN – клітинки, що ще рахуються
+    heatmap = np.full((len(houses_range), len(apartments_range)), np.nan)
 
-    volatility_levels = [0.5, 1.0, 2.0, 3.0]
+    # Клітинки приходять групами (рядок сітки) у порядку завершення
+    def fill_cells(partial):
 
-    advantages = []
-    relative_advantages = []
-    std_adp = []
-    std_adapt = []
-    ci_low = []
-    ci_high = []
+        for i, j, advantage in partial:
+            heatmap[i, j] = advantage
 
-    for v in volatility_levels:
+        return apartments_range, houses_range, heatmap
 
-        config = CityConfig(
-            apartments=40000,
-            houses=5000,
-            public=300,
-            volatility=v
-        )
+    submit_study(
+        f"{grid_size}x{grid_size} grid",
+        {
+            "study": "generalization",
+            "grid_size": grid_size,
+            "seed": seed,
+            "bank": bank_root
+        },
+        fill_cells
+    )
 
-        adaptive = AdaptiveStrategy()
-        adp = ADPStrategy()
+job_status("generalization", lambda partial: draw_heatmap(*partial))
 
-        try:
-            adp.weights = np.load("adp_weights.npy")
-        except:
-            st.error("Train ADP first!")
-            st.stop()
+generalization = load_result("generalization")
 
-        energies_adapt, _ = run_monte_carlo(
-            adaptive,
-            config,
-            simulations=500
-        )
+if generalization is not None:
 
-        energies_adp, _ = run_monte_carlo(
-            adp,
-            config,
-            simulations=500
-        )
+    result = generalization["result"]
 
-        mean_adapt = np.mean(energies_adapt)
-        mean_adp = np.mean(energies_adp)
+    draw_heatmap(
+        result["apartments"],
+        result["houses"],
+        np.asarray(result["advantage"], dtype=float)
+    )
 
-        advantage = mean_adapt - mean_adp
-        relative = advantage / mean_adapt
+    saved_caption(generalization)
 
-        advantages.append(advantage)
-        relative_advantages.append(relative)
+# =====================================
+# VOLATILITY SENSITIVITY (RESEARCH MODE)
+# =====================================
 
-        std_adp.append(np.std(energies_adp))
-        std_adapt.append(np.std(energies_adapt))
+st.header("📉 Volatility Sensitivity Analysis (Research Mode)")
 
-        # 95% CI for mean difference
-        diff = energies_adapt - energies_adp
-        ci = 1.96 * np.std(diff) / np.sqrt(len(diff))
+if st.button("Run Volatility Study"):
 
-        ci_low.append(advantage - ci)
-        ci_high.append(advantage + ci)
+    submit_study("robustness evaluation", {
+        "study": "volatility",
+        "seed": seed,
+        "bank": bank_root
+    })
+
+job_status("volatility")
+
+volatility_study = load_result("volatility")
+
+if volatility_study is not None:
+
+    result = volatility_study["result"]
+    volatility_levels = result["level"]
 
     # ===== Absolute Advantage Plot =====
     fig1, ax1 = plt.subplots()
 
-    ax1.plot(volatility_levels, advantages)
-    ax1.fill_between(volatility_levels, ci_low, ci_high, alpha=0.2)
+    ax1.plot(volatility_levels, result["advantage"])
+    ax1.fill_between(volatility_levels, result["ci_low"], result["ci_high"],
+                     alpha=0.2)
 
     ax1.set_xlabel("Volatility Scale")
     ax1.set_ylabel("Absolute Energy Advantage (ADP)")
@@ -323,7 +559,7 @@ if st.button("Run Volatility Study"):
     # ===== Relative Advantage Plot =====
     fig2, ax2 = plt.subplots()
 
-    ax2.plot(volatility_levels, relative_advantages)
+    ax2.plot(volatility_levels, result["relative"])
 
     ax2.set_xlabel("Volatility Scale")
     ax2.set_ylabel("Relative Improvement (%)")
@@ -334,8 +570,8 @@ if st.button("Run Volatility Study"):
     # ===== Variance Comparison =====
     fig3, ax3 = plt.subplots()
 
-    ax3.plot(volatility_levels, std_adapt, label="Adaptive Std")
-    ax3.plot(volatility_levels, std_adp, label="ADP Std")
+    ax3.plot(volatility_levels, result["std_adapt"], label="Adaptive Std")
+    ax3.plot(volatility_levels, result["std_adp"], label="ADP Std")
 
     ax3.set_xlabel("Volatility Scale")
     ax3.set_ylabel("Energy Std")
@@ -344,53 +580,43 @@ if st.button("Run Volatility Study"):
 
     st.pyplot(fig3)
 
+    st.write(
+        "Variance reduction vs independent runs:",
+        ", ".join(
+            f"{v}: {r:.1f}x"
+            for v, r in zip(volatility_levels, result["variance_reduction"])
+        )
+    )
+
+    saved_caption(volatility_study)
+
 
 # =====================================
 # COMPUTATIONAL COMPLEXITY ANALYSIS
 # =====================================
 
-import time
-
 st.header("⏱ Computational Complexity Analysis")
 
 if st.button("Run Complexity Study"):
 
-    st.write("Measuring runtime scaling...")
-
-    scale_levels = [20000, 40000, 60000, 80000]
+    # Заміри часу йдуть послідовно; workers – усередині Monte Carlo
+    submit_study("runtime scaling", {
+        "study": "complexity",
+        "seed": seed,
+        "workers": workers
+    })
 
-    adaptive_times = []
-    adp_times = []
+job_status("complexity")
 
-    for scale in scale_levels:
+complexity_study = load_result("complexity")
 
-        config = CityConfig(
-            apartments=scale,
-            houses=int(scale * 0.125),
-            public=300,
-            volatility=1.0
-        )
+if complexity_study is not None:
 
-        adaptive = AdaptiveStrategy()
-        adp = ADPStrategy()
+    result = complexity_study["result"]
 
-        try:
-            adp.weights = np.load("adp_weights.npy")
-        except:
-            st.error("Train ADP first!")
-            st.stop()
-
-        # Adaptive timing
-        start = time.time()
-        run_monte_carlo(adaptive, config, simulations=200)
-        adaptive_time = time.time() - start
-        adaptive_times.append(adaptive_time)
-
-        # ADP timing
-        start = time.time()
-        run_monte_carlo(adp, config, simulations=200)
-        adp_time = time.time() - start
-        adp_times.append(adp_time)
+    scale_levels = result["scale_levels"]
+    adaptive_times = result["scale_times"]["Adaptive"]
+    adp_times = result["scale_times"]["ADP"]
 
     # ===== Runtime Plot =====
     fig1, ax1 = plt.subplots()
@@ -425,6 +651,69 @@ if st.button("Run Complexity Study"):
     st.write("Average ADP runtime:", round(np.mean(adp_times), 3), "sec")
     st.write("Average ADP overhead ratio:", round(np.mean(ratio), 3))
 
+    # ===== Scaling in Building Groups =====
+    group_levels = result["group_levels"]
+
+    fig3, ax3 = plt.subplots()
+
+    ax3.plot(group_levels, result["group_times"]["Adaptive"], marker="o",
+             label="Adaptive")
+    ax3.plot(group_levels, result["group_times"]["ADP"], marker="o",
+             label="ADP")
+
+    ax3.set_xscale("log")
+    ax3.set_yscale("log")
+    ax3.set_xlabel("Number of Building Groups")
+    ax3.set_ylabel(f"Runtime (seconds, "
+                   f"{complexity_study['spec']['group_simulations']} simulations)")
+    ax3.set_title("Runtime Scaling with Building Groups")
+    ax3.legend()
+
+    st.pyplot(fig3)
+
+    st.write("ADP runtime growth exponent in groups:",
+             round(result["group_slope"], 2))
+
+    # ===== Per-Phase Profile =====
+    # Де саме витрачається час на кожному масштабі міста
+    st.subheader("Per-Phase Profile")
+
+    profile_reports = result["profiles"]
+
+    fig4, ax4 = plt.subplots(figsize=(8, 4))
+
+    labels = list(profile_reports)
+    bottom = np.zeros(len(labels))
+
+    for phase in PHASES:
+
+        shares = np.array([
+            profile_reports[label]["phases"][phase]["share"]
+            for label in labels
+        ])
+
+        ax4.barh(labels, shares, left=bottom, label=phase)
+        bottom += shares
+
+    ax4.set_xlabel("Share of Profiled Time")
+    ax4.set_title("Time per Simulation Phase")
+    ax4.legend(fontsize="small", loc="lower right")
+
+    fig4.tight_layout()
+    st.pyplot(fig4)
+
+    st.download_button(
+        "Download Profile (JSON)",
+        json.dumps(profile_reports, indent=2),
+        file_name="phase_profile.json",
+        mime="application/json"
+    )
+
+    with st.expander("Profile Report"):
+        st.json(profile_reports)
+
+    saved_caption(complexity_study)
+
 # =====================================
 # PARETO FRONTIER ANALYSIS
 # =====================================
@@ -433,52 +722,35 @@ st.header("🎯 Pareto Frontier Analysis (Energy vs Budget)")
 
 if st.button("Run Pareto Analysis"):
 
-    st.write("Evaluating multi-objective trade-off...")
+    submit_study("multi-objective trade-off", {
+        "study": "pareto",
+        "seed": seed,
+        "bank": bank_root
+    })
 
-    config = CityConfig(
-        apartments=40000,
-        houses=5000,
-        public=300,
-        volatility=1.0
-    )
+job_status("pareto")
 
-    adaptive = AdaptiveStrategy()
-    adp = ADPStrategy()
-
-    try:
-        adp.weights = np.load("adp_weights.npy")
-    except:
-        st.error("Train ADP first!")
-        st.stop()
+pareto_study = load_result("pareto")
 
-    energies_adapt, budgets_adapt = run_monte_carlo(
-        adaptive,
-        config,
-        simulations=500
-    )
+if pareto_study is not None:
 
-    energies_adp, budgets_adp = run_monte_carlo(
-        adp,
-        config,
-        simulations=500
-    )
+    result = pareto_study["result"]
 
     # ===== Scatter Plot =====
     fig, ax = plt.subplots()
 
-    ax.scatter(
-        energies_adapt,
-        budgets_adapt,
-        alpha=0.4,
-        label="Adaptive"
-    )
+    for name in ("Adaptive", "ADP"):
+        ax.scatter(
+            result["energies"][name],
+            result["budgets"][name],
+            alpha=0.4,
+            label=name
+        )
 
-    ax.scatter(
-        energies_adp,
-        budgets_adp,
-        alpha=0.4,
-        label="ADP"
-    )
+    # ===== Pareto Frontiers =====
+    for name, front in result["frontiers"].items():
+        ax.plot(front["energies"], front["budgets"], drawstyle="steps-post",
+                label=f"{name} frontier")
 
     ax.set_xlabel("Final Energy")
     ax.set_ylabel("Final Budget")
@@ -488,19 +760,28 @@ if st.button("Run Pareto Analysis"):
     st.pyplot(fig)
 
     # ===== Simple Pareto Dominance Check =====
-    adp_better = 0
+    st.subheader("Pareto Dominance Summary")
+    st.write("Fraction of cases where ADP dominates Adaptive:",
+             round(result["dominance"], 3))
 
-    for ea, ba in zip(energies_adapt, budgets_adapt):
-        for eb, bb in zip(energies_adp, budgets_adp):
-            if (eb <= ea and bb >= ba):
-                adp_better += 1
-                break
+    # ===== Drill-down: worst-budget ADP path =====
+    worst = result["worst_path"]
 
-    dominance_ratio = adp_better / len(energies_adapt)
+    st.subheader(f"Worst-Budget ADP Path #{worst['path']}")
+    st.caption(f"Regenerated from (seed={pareto_study['spec']['seed']}, "
+               f"path={worst['path']}) in {worst['seconds'] * 1000:.1f} ms")
 
-    st.subheader("Pareto Dominance Summary")
-    st.write("Fraction of cases where ADP dominates Adaptive:",
-             round(dominance_ratio, 3))
+    st.dataframe([
+        {
+            "year": h["year"],
+            "energy": round(h["energy"]),
+            "budget": round(h["budget"], 1),
+            "action": "-" if h["action"] is None else " / ".join(h["action"])
+        }
+        for h in worst["history"]
+    ])
+
+    saved_caption(pareto_study)
 
 # =====================================
 # SOCIETAL HAPPINESS MODEL
@@ -510,76 +791,21 @@ st.header("😊 Societal Happiness Index")
 
 if st.button("Run Happiness Evaluation"):
 
-    config = CityConfig(
-        apartments=40000,
-        houses=5000,
-        public=300,
-        volatility=1.0
-    )
-
-    adaptive = AdaptiveStrategy()
-    adp = ADPStrategy()
-
-    try:
-        adp.weights = np.load("adp_weights.npy")
-    except:
-        st.error("Train ADP first!")
-        st.stop()
-
-    energies_adapt, budgets_adapt = run_monte_carlo(
-        adaptive,
-        config,
-        simulations=500
-    )
-
-    energies_adp, budgets_adp = run_monte_carlo(
-        adp,
-        config,
-        simulations=500
-    )
-
-    # ---- Normalization ----
-    max_energy = max(
-        np.max(energies_adapt),
-        np.max(energies_adp)
-    )
-
-    max_budget = max(
-        np.max(budgets_adapt),
-        np.max(budgets_adp)
-    )
+    # Ті самі прогони, що й у Pareto, – з кешу результатів
+    submit_study("happiness index", {
+        "study": "happiness",
+        "seed": seed,
+        "bank": bank_root
+    })
 
-    energy_norm_adapt = energies_adapt / max_energy
-    energy_norm_adp = energies_adp / max_energy
+job_status("happiness")
 
-    budget_norm_adapt = budgets_adapt / max_budget
-    budget_norm_adp = budgets_adp / max_budget
+happiness_study = load_result("happiness")
 
-    # Risk component
-    risk_adapt = np.std(energies_adapt)
-    risk_adp = np.std(energies_adp)
+if happiness_study is not None:
 
-    max_risk = max(risk_adapt, risk_adp)
-
-    risk_norm_adapt = risk_adapt / max_risk
-    risk_norm_adp = risk_adp / max_risk
-
-    # ---- Utility Weights ----
-    w_energy = 0.5
-    w_budget = 0.4
-    w_risk = 0.1
-
-    happiness_adapt = (
-        w_energy * (1 - np.mean(energy_norm_adapt)) +
-        w_budget * np.mean(budget_norm_adapt) -
-        w_risk * risk_norm_adapt
-    )
-
-    happiness_adp = (
-        w_energy * (1 - np.mean(energy_norm_adp)) +
-        w_budget * np.mean(budget_norm_adp) -
-        w_risk * risk_norm_adp
-    )
+    happiness_adapt = happiness_study["result"]["Adaptive"]
+    happiness_adp = happiness_study["result"]["ADP"]
 
     st.subheader("Happiness Scores")
 
@@ -595,4 +821,6 @@ if st.button("Run Happiness Evaluation"):
     ax.set_ylabel("Societal Happiness Index")
     ax.set_title("Composite Urban Utility")
 
-    st.pyplot(fig)
\ No newline at end of file
+    st.pyplot(fig)
+
+    saved_caption(happiness_study)
\ No newline at end of file